@@ -0,0 +1,40 @@
+"""booking_pending_expires_at_index
+
+Revision ID: 1440d51e603a
+Revises: 5cada174dd59
+Create Date: 2026-10-18 10:02:47.118634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1440d51e603a'
+down_revision: Union[str, Sequence[str], None] = '5cada174dd59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built CONCURRENTLY so booking writes keep flowing while the large table is indexed.
+    # It cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_booking_pending_expires_at',
+            'booking',
+            ['expires_at'],
+            unique=False,
+            postgresql_where=sa.text("status = 'PENDING'"),
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_booking_pending_expires_at', table_name='booking', postgresql_concurrently=True)
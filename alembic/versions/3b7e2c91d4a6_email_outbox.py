@@ -0,0 +1,51 @@
+"""email_outbox
+
+Revision ID: 3b7e2c91d4a6
+Revises: fec4ee7956ba
+Create Date: 2026-10-18 12:04:31.552108
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e2c91d4a6'
+down_revision: Union[str, Sequence[str], None] = 'fec4ee7956ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('emailoutbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recipient', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('subject', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('template_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('template_body', sa.JSON(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'SENT', 'FAILED', name='emailstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_emailoutbox_pending_next_attempt_at',
+        'emailoutbox',
+        ['next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_emailoutbox_pending_next_attempt_at', table_name='emailoutbox', postgresql_where=sa.text("status = 'PENDING'"))
+    op.drop_table('emailoutbox')
+    sa.Enum(name='emailstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,55 @@
+"""bookingitem_active_cell_unique_index
+
+Revision ID: 5cada174dd59
+Revises: 677f882dc5c5
+Create Date: 2026-10-18 09:12:31.504218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5cada174dd59'
+down_revision: Union[str, Sequence[str], None] = '677f882dc5c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bookingitem', sa.Column('booking_date', sa.Date(), nullable=True))
+    op.add_column('bookingitem', sa.Column('active', sa.Boolean(), nullable=False, server_default=sa.true()))
+
+    # Expired holds are cancelled so that only PAID and live PENDING items stay active
+    op.execute(
+        "UPDATE booking SET status = 'CANCELLED' "
+        "WHERE status = 'PENDING' AND expires_at <= (now() AT TIME ZONE 'utc')"
+    )
+    op.execute(
+        "UPDATE bookingitem SET booking_date = booking.booking_date, "
+        "active = (booking.status <> 'CANCELLED') "
+        "FROM booking WHERE booking.id = bookingitem.booking_id"
+    )
+
+    op.alter_column('bookingitem', 'booking_date', nullable=False)
+    op.alter_column('bookingitem', 'active', server_default=None)
+
+    # Fails if the existing data already contains double-booked cells; resolve those first
+    op.create_index(
+        'uq_bookingitem_active_cell',
+        'bookingitem',
+        ['booking_date', 'lane_id', 'price_slot_id'],
+        unique=True,
+        postgresql_where=sa.text('active')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_bookingitem_active_cell', table_name='bookingitem', postgresql_where=sa.text('active'))
+    op.drop_column('bookingitem', 'active')
+    op.drop_column('bookingitem', 'booking_date')
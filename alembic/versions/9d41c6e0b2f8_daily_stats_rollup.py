@@ -0,0 +1,42 @@
+"""daily_stats_rollup
+
+Revision ID: 9d41c6e0b2f8
+Revises: 3b7e2c91d4a6
+Create Date: 2026-10-18 13:18:52.207744
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41c6e0b2f8'
+down_revision: Union[str, Sequence[str], None] = '3b7e2c91d4a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('dailystats',
+    sa.Column('stat_date', sa.Date(), nullable=False),
+    sa.Column('lane_id', sa.Integer(), nullable=False),
+    sa.Column('schedule_id', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('paid_bookings', sa.Integer(), nullable=False),
+    sa.Column('pending_bookings', sa.Integer(), nullable=False),
+    sa.Column('cancelled_bookings', sa.Integer(), nullable=False),
+    sa.Column('occupied_slots', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['lane_id'], ['lane.id'], ),
+    sa.ForeignKeyConstraint(['schedule_id'], ['schedule.id'], ),
+    sa.PrimaryKeyConstraint('stat_date', 'lane_id', 'schedule_id')
+    )
+    # Existing history is loaded with `python backfill_stats.py` after upgrading
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dailystats')
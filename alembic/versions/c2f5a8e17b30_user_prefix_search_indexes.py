@@ -0,0 +1,44 @@
+"""user_prefix_search_indexes
+
+Revision ID: c2f5a8e17b30
+Revises: 9d41c6e0b2f8
+Create Date: 2026-10-18 14:02:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f5a8e17b30'
+down_revision: Union[str, Sequence[str], None] = '9d41c6e0b2f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, column) of the lower(column) indexes used by the admin user search
+INDEXES = [
+    ('ix_user_email_lower_pattern', 'email'),
+    ('ix_user_full_name_lower_pattern', 'full_name'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # text_pattern_ops makes the indexes usable for LIKE 'prefix%' under any collation
+    opclass = ' text_pattern_ops' if op.get_bind().dialect.name == 'postgresql' else ''
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES:
+            op.create_index(
+                name, 'user', [sa.text(f'lower({column}){opclass}')],
+                unique=False, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='user', postgresql_concurrently=True)
@@ -0,0 +1,36 @@
+"""daily_booking_stats
+
+Revision ID: e7a3d1c94b52
+Revises: c2f5a8e17b30
+Create Date: 2026-10-18 16:41:09.384120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3d1c94b52'
+down_revision: Union[str, Sequence[str], None] = 'c2f5a8e17b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('dailybookingstats',
+    sa.Column('stat_date', sa.Date(), nullable=False),
+    sa.Column('paid_bookings', sa.Integer(), nullable=False),
+    sa.Column('pending_bookings', sa.Integer(), nullable=False),
+    sa.Column('cancelled_bookings', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('stat_date')
+    )
+    # Existing history is loaded with `python backfill_stats.py` after upgrading
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dailybookingstats')
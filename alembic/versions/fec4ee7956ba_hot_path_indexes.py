@@ -0,0 +1,44 @@
+"""hot_path_indexes
+
+Revision ID: fec4ee7956ba
+Revises: 1440d51e603a
+Create Date: 2026-10-18 11:25:09.873412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fec4ee7956ba'
+down_revision: Union[str, Sequence[str], None] = '1440d51e603a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns) of the indexes backing the repository queries
+INDEXES = [
+    ('ix_bookingitem_booking_id', 'bookingitem', ['booking_id']),
+    ('ix_bookingitem_price_slot_id_lane_id', 'bookingitem', ['price_slot_id', 'lane_id']),
+    ('ix_booking_booking_date_status', 'booking', ['booking_date', 'status']),
+    ('ix_priceslot_schedule_id_start_time', 'priceslot', ['schedule_id', 'start_time']),
+    ('ix_dayconfig_schedule_id', 'dayconfig', ['schedule_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps booking writes flowing while the large tables are indexed.
+    # It cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
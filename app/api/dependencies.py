@@ -1,10 +1,11 @@
+from datetime import datetime, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import ALGORITHM
+from app.core.security import ALGORITHM, token_cache
 from app.core.config import get_settings
 from app.repositories.user_repository import user_repository
 from app.models.enums import UserRole
@@ -17,7 +18,15 @@ async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
-    """Retrieves the current authenticated user via JWT token."""
+    """
+    Retrieves the current authenticated user via JWT token.
+    Verified tokens are cached with the user's identity, so repeated requests
+    with the same token skip the database lookup.
+    """
+    identity = token_cache.get(token)
+    if identity is not None:
+        return User(**identity)
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -36,6 +45,11 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
 
+    token_cache.set(
+        token,
+        {"id": user.id, "email": user.email, "full_name": user.full_name, "role": user.role},
+        ttl=payload["exp"] - datetime.now(timezone.utc).timestamp() if "exp" in payload else None
+    )
     return user
 
 
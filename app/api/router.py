@@ -1,8 +1,10 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, bookings, admin
+from app.api.v1.endpoints import auth, bookings, admin, health, infrastructure
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(bookings.router, prefix="/bookings", tags=["Bookings"])
-api_router.include_router(admin.router, prefix="/admin", tags=["Administration"])
\ No newline at end of file
+api_router.include_router(admin.router, prefix="/admin", tags=["Administration"])
+api_router.include_router(infrastructure.router, prefix="/infrastructure", tags=["Infrastructure"])
+api_router.include_router(health.router, prefix="/health", tags=["Health"])
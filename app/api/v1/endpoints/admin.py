@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
+from datetime import date
 
 from app.core.database import get_db
-from app.api.dependencies import get_current_active_cashier, get_current_active_owner
+from app.api.dependencies import get_current_active_cashier, get_current_active_manager, get_current_active_owner
 from app.services.booking_service import booking_service
 from app.services.user_service import user_service
+from app.services.stats_service import stats_service
+from app.services.report_service import report_service
+from app.services.export_service import ExportFormat, export_service
+from app.models.enums import BookingStatus
 from app.schemas.user import UserRead, UserUpdate
 from app.repositories.user_repository import user_repository
 from app.core.logging_config import get_logger
+from app.core.security import invalidate_user_tokens
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -28,13 +35,26 @@ async def confirm_booking(
 
 @router.get("/users", response_model=List[UserRead])
 async def list_users(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    after: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=500),
+    q: Optional[str] = Query(None, min_length=1, max_length=254),
+    with_total: bool = False,
     db: AsyncSession = Depends(get_db),
     owner = Depends(get_current_active_owner)
 ):
-    """List all registered users (Pagination supported)"""
-    return await user_repository.get_multi(db, skip=skip, limit=limit)
+    """
+    List registered users in ID order (keyset pagination).
+    Pass the X-Next-Cursor response header as `after` to fetch the next page; it is
+    absent on the last page. `q` filters by email or full name prefix (case-insensitive)
+    and `with_total=true` adds an approximate X-Total-Count-Estimate header.
+    """
+    users, next_after, total = await user_service.list_users(db, after, limit, q, with_total)
+    if next_after is not None:
+        response.headers["X-Next-Cursor"] = str(next_after)
+    if total is not None:
+        response.headers["X-Total-Count-Estimate"] = str(total)
+    return users
 
 @router.get("/users/{user_id}", response_model=UserRead)
 async def get_user_detail(
@@ -59,23 +79,59 @@ async def update_user_role(
     Update user information, including roles.
     Used by owners to promote users to 'cashier' or 'owner'.
     """
-    logger.info(f"Owner {owner.id} is updating user {user_id}")
+    logger.info("Owner %s is updating user %s", owner.id, user_id)
     db_user = await user_repository.get(db, user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return await user_repository.update(db, db_obj=db_user, obj_in=user_in)
+    db_user = await user_repository.update(db, db_obj=db_user, obj_in=user_in)
+    invalidate_user_tokens(user_id)
+    return db_user
 
 # --- REPORTS ---
 
 @router.get("/stats")
 async def get_stats(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
     db: AsyncSession = Depends(get_db),
     owner = Depends(get_current_active_owner)
 ):
-    """Sales and occupancy reports (Owner only)"""
-    # TODO: Implement analytics service
-    return {
-        "summary": "Report system status: Initialized",
-        "notice": "Analytical data will be available once the booking history grows."
-    }
\ No newline at end of file
+    """
+    Sales and occupancy reports (Owner only): totals, per-day and per-lane
+    figures for [start, end], read from the daily rollup. Defaults to the last 30 days.
+    """
+    return await stats_service.get_stats(db, start, end)
+
+@router.get("/reports/heatmap")
+async def get_occupancy_heatmap(
+    start: date,
+    end: date,
+    db: AsyncSession = Depends(get_db),
+    manager = Depends(get_current_active_manager)
+):
+    """Lane × time-of-day × weekday occupancy matrices for [start, end] (Managers and Owners)"""
+    return await report_service.get_occupancy_heatmap(db, start, end)
+
+@router.get("/exports/bookings")
+async def export_bookings(
+    start: date,
+    end: date,
+    status: Optional[List[BookingStatus]] = Query(None),
+    format: ExportFormat = "csv",
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_db),
+    owner = Depends(get_current_active_owner)
+):
+    """
+    Streams every booking item of [start, end] (optionally filtered by status)
+    with its booking, user email and lane number, as CSV or NDJSON, optionally gzipped.
+    """
+    export_service.check_range(start, end)
+    filename = f"bookings_{start}_{end}.{format}" + (".gz" if gzip else "")
+    media_type = "application/gzip" if gzip else ("text/csv" if format == "csv" else "application/x-ndjson")
+    return StreamingResponse(
+        export_service.stream_bookings(db, start, end, status, format, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
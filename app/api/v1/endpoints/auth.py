@@ -1,32 +1,38 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.rate_limit import auth_rate_limiter, client_ip
 from app.services.user_service import user_service
 from app.schemas.user import UserCreate, UserRead, Token, ForgotPasswordRequest, PasswordResetConfirm
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
+async def register(user_in: UserCreate, request: Request, db: AsyncSession = Depends(get_db)):
+    await auth_rate_limiter.check("register", client_ip(request), user_in.email)
     return await user_service.register_user(db, user_in)
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     db: AsyncSession = Depends(get_db), 
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
     # OAuth2PasswordRequestForm uses 'username' for the email
+    await auth_rate_limiter.check("login", client_ip(request), form_data.username)
     return await user_service.authenticate(db, form_data.username, form_data.password)
 
 @router.post("/forgot-password")
 async def forgot_password(
     data: ForgotPasswordRequest,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Step 1: User provides email, we send an email with a reset link (token).
     """
+    await auth_rate_limiter.check("forgot-password", client_ip(request), data.email)
     await user_service.request_password_reset(db, data.email)
     return {"message": "If the account exists, a password reset email has been sent."}
 
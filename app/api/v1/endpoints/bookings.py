@@ -1,22 +1,109 @@
-from fastapi import APIRouter, Depends, status
+import json
+import orjson
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
+from app.core.config import get_settings
 from app.core.database import get_db
 from app.api.dependencies import get_current_user
 from app.services.booking_service import booking_service
-from app.services.infrastructure_service import infrastructure_service
-from app.schemas.booking import BookingCreate, BookingRead
+from app.services.infrastructure_service import AvailabilityFormat, infrastructure_service
+from app.services.live_service import live_service
+from app.schemas.booking import BookingCreate, BookingRead, GroupBookingCreate
 from app.models.user import User
 
+settings = get_settings()
 router = APIRouter()
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 requires for this header)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
 @router.get("/availability")
 async def get_grid(
     booking_date: date, 
+    request: Request,
+    format: AvailabilityFormat = "full",
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Returns the availability grid of all lanes and slots for a given date.
+
+    `format=full` (default) is a list of lanes, each with its slots (AvailabilityGrid).
+    `format=compact` sends the slots once and, per lane, an `available` string
+    with one character per slot ("1" available, "0" taken).
+
+    Bodies are gzip-compressed when large enough and accepted by the client.
+    The response carries an ETag; a request whose If-None-Match matches the
+    current grid gets a 304 (answered from the cache when the grid is cached).
+    """
+    cached = await infrastructure_service.get_tagged_grid_availability(db, booking_date)
+    encoded = cached.encode(format, _accepts_gzip(request.headers.get("accept-encoding")))
+    headers = {
+        "ETag": encoded.etag,
+        "Cache-Control": (
+            f"public, max-age={settings.AVAILABILITY_MAX_AGE_SECONDS}, "
+            f"stale-while-revalidate={settings.AVAILABILITY_STALE_WHILE_REVALIDATE_SECONDS}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), encoded.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoded.gzipped:
+        headers["Content-Encoding"] = "gzip"
+    return Response(encoded.body, media_type="application/json", headers=headers)
+
+@router.get("/availability/range")
+async def get_grid_range(
+    start: date,
+    end: date,
     db: AsyncSession = Depends(get_db)
 ):
-    """Returns the availability grid of all lanes and slots for a given date"""
-    return await infrastructure_service.get_grid_availability(db, booking_date)
+    """
+    Streams the availability grids of every date in [start, end] as NDJSON,
+    one line per date: {"date": ..., "grid": [...]}
+    """
+    grids = await infrastructure_service.get_grid_availability_range(db, start, end)
+
+    async def stream():
+        for day, grid in grids:
+            yield json.dumps({"date": day.isoformat(), "grid": grid}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.get("/availability/live")
+async def get_grid_live(booking_date: date):
+    """
+    Server-sent events with the availability of a date. A `grid` event carries
+    the full grid (as in /availability); each following `diff` event lists the
+    cells whose availability changed: {"cells": [{lane_id, slot_id, available}]}.
+    A new `grid` event replaces the whole state after schedule changes or when
+    the client was too slow to keep up.
+    """
+    async def events():
+        async for message in live_service.stream(booking_date):
+            if message is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {message['type']}\ndata: {orjson.dumps(message).decode()}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Proxies must pass events through as they are written
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.post("/reserve", response_model=BookingRead, status_code=status.HTTP_201_CREATED)
 async def create_booking(
@@ -25,4 +112,13 @@ async def create_booking(
     current_user: User = Depends(get_current_user)
 ):
     """Creates a pending reservation (10-minute block)"""
-    return await booking_service.create_reservation(db, current_user.id, payload)
\ No newline at end of file
+    return await booking_service.create_reservation(db, current_user.id, payload)
+
+@router.post("/reserve/group", response_model=BookingRead, status_code=status.HTTP_201_CREATED)
+async def create_group_booking(
+    payload: GroupBookingCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Creates a pending reservation of the same slots on several lanes (10-minute block)"""
+    return await booking_service.create_group_reservation(db, current_user.id, payload)
@@ -0,0 +1,32 @@
+import time
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, pool_status
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+router = APIRouter()
+
+@router.get("")
+async def health(response: Response, db: AsyncSession = Depends(get_db)):
+    """
+    Liveness and database check.
+    Reports the database ping latency and connection pool usage
+    (checked out, overflow, waiting checkouts and wait times).
+    """
+    database = {"status": "ok"}
+    started = time.perf_counter()
+    try:
+        await db.execute(text("SELECT 1"))
+        database["ping_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    except Exception as e:
+        logger.error("Health check database ping failed: %s", e)
+        database = {"status": "unavailable", "error": type(e).__name__}
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return {
+        "status": database["status"],
+        "database": database,
+        "pool": pool_status()
+    }
@@ -1,7 +1,17 @@
+from typing import List
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.dependencies import get_db, get_current_active_owner
 from app.models import User
+from app.schemas.infrastructure import (
+    PriceAdjustment,
+    PriceAdjustmentResult,
+    PriceSlotRead,
+    PriceSlotWrite,
+    ScheduleDaysRead,
+    ScheduleDaysUpdate,
+)
+from app.services.schedule_service import schedule_service
 
 router = APIRouter()
 
@@ -12,4 +22,34 @@ async def update_slot_price(
     db: AsyncSession = Depends(get_db),
     current_owner: User = Depends(get_current_active_owner) 
 ):
-    return {"message": "Precio actualizado correctamente"}      
\ No newline at end of file
+    """Changes the price of a single slot"""
+    return await schedule_service.update_slot_price(db, slot_id, new_price)
+
+@router.post("/slots/adjust-prices", response_model=PriceAdjustmentResult)
+async def adjust_prices(
+    payload: PriceAdjustment,
+    db: AsyncSession = Depends(get_db),
+    current_owner: User = Depends(get_current_active_owner)
+):
+    """Raises or lowers every slot price (optionally of one schedule) by a percentage"""
+    return await schedule_service.adjust_prices(db, payload)
+
+@router.put("/schedules/{schedule_id}/slots", response_model=List[PriceSlotRead])
+async def replace_schedule_slots(
+    schedule_id: int,
+    payload: List[PriceSlotWrite],
+    db: AsyncSession = Depends(get_db),
+    current_owner: User = Depends(get_current_active_owner)
+):
+    """Replaces the schedule's whole set of price slots in one transaction"""
+    return await schedule_service.replace_slots(db, schedule_id, payload)
+
+@router.put("/schedules/{schedule_id}/days", response_model=ScheduleDaysRead)
+async def assign_schedule_days(
+    schedule_id: int,
+    payload: ScheduleDaysUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_owner: User = Depends(get_current_active_owner)
+):
+    """Makes the schedule apply on the given weekdays (0=Monday ... 6=Sunday)"""
+    return await schedule_service.assign_days(db, schedule_id, payload.days)
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Response
+from app.core.database import pool_status
+from app.core.logging_config import dropped_records
+from app.core.metrics import CallbackGauge, registry
+from app.core.security import password_executor, token_cache
+from app.services.infrastructure_service import infrastructure_service
+from app.services.live_service import live_service
+from app.services.report_service import report_service
+
+router = APIRouter()
+
+CACHES = {
+    "availability": infrastructure_service.availability_cache.grids,
+    "auth_token": token_cache,
+    "heatmap": report_service.heatmap_cache,
+}
+
+def _cache_stat(stat: str):
+    return lambda: {name: cache.stats()[stat] for name, cache in CACHES.items()}
+
+def _pool_stat(stat: str):
+    # Only the pools used with PostgreSQL report these (not SQLite's)
+    return lambda: {(): pool_status()[stat]} if stat in pool_status() else {}
+
+for name, help, collect, kind in [
+    ("cache_hits_total", "Lookups answered by the cache.", _cache_stat("hits"), "counter"),
+    ("cache_misses_total", "Lookups that missed the cache.", _cache_stat("misses"), "counter"),
+    ("cache_entries", "Entries currently cached.", _cache_stat("size"), "gauge"),
+]:
+    registry.register(CallbackGauge(name, help, ["cache"], collect, type=kind))
+
+for name, help, stat, kind in [
+    ("db_pool_size", "Persistent connections of the pool.", "size", "gauge"),
+    ("db_pool_checked_out", "Connections currently in use.", "checked_out", "gauge"),
+    ("db_pool_overflow", "Overflow connections currently open.", "overflow", "gauge"),
+    ("db_pool_waiting", "Checkouts waiting for a connection.", "waiting", "gauge"),
+    ("db_pool_checkouts_total", "Connections handed out by the pool.", "checkouts", "counter"),
+    ("db_pool_timeouts_total", "Checkouts that timed out waiting for a connection.", "timeouts", "counter"),
+]:
+    registry.register(CallbackGauge(name, help, [], _pool_stat(stat), type=kind))
+
+registry.register(CallbackGauge(
+    "password_hash_pending", "bcrypt jobs queued or running.", [],
+    lambda: {(): password_executor.pending}
+))
+registry.register(CallbackGauge(
+    "password_hash_rejected_total", "bcrypt jobs rejected because the pool was saturated.", [],
+    lambda: {(): password_executor.rejected}, type="counter"
+))
+registry.register(CallbackGauge(
+    "log_records_dropped_total", "Log records dropped because the log queue was full.", [],
+    lambda: {(): dropped_records()}, type="counter"
+))
+registry.register(CallbackGauge(
+    "live_availability_subscribers", "Clients subscribed to live availability.", [],
+    lambda: {(): len(live_service.hub)}
+))
+
+@router.get("/metrics")
+async def metrics():
+    """Metrics of this worker process in the Prometheus text format."""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
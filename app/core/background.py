@@ -0,0 +1,48 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs an async job every `interval` seconds on the event loop, for the
+    lifetime of the application. Errors are logged and the loop keeps going.
+    """
+
+    def __init__(self, name: str, interval: float, job: Callable[[], Awaitable[object]]):
+        self.name = name
+        self.interval = interval
+        self.job = job
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+            logger.info("Background task '%s' started (every %ss)", self.name, self.interval)
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Background task '%s' stopped", self.name)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.job()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Background task '%s' failed", self.name)
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+ValueType = TypeVar("ValueType")
+
+
+class TTLCache(Generic[ValueType]):
+    """
+    Bounded in-process LRU cache with a per-entry time-to-live.
+    Least recently used entries are evicted once `maxsize` is reached.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, ValueType]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[ValueType]:
+        """Returns the cached value, or None if it is missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        deadline, value = entry
+        if deadline <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: ValueType, ttl: Optional[float] = None):
+        """Stores a value. `ttl` overrides the default lifetime for this entry."""
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (time.monotonic() + lifetime, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[ValueType]:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def discard_where(self, predicate: Callable[[ValueType], bool]) -> int:
+        """Removes every entry whose value matches `predicate`. Returns how many were removed."""
+        keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
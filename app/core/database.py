@@ -1,13 +1,48 @@
+import time
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import SQLModel
 from app.core.config import get_settings
 
 settings = get_settings()
 
 
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool that records how long checkouts take to get a connection.
+    Time spent here is time a request waited for the pool (or for a new
+    overflow connection to open), which is invisible in the query timings.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+        elapsed = time.perf_counter() - started
+        self.checkouts += 1
+        self.total_wait += elapsed
+        self.max_wait = max(self.max_wait, elapsed)
+        return connection
+
+
 engine_kwargs = {
-    "echo": True,
+    "echo": settings.DB_ECHO,
     "future": True
 }
 
@@ -21,6 +56,16 @@ if "postgresql+asyncpg" in settings.DATABASE_URL:
 else:
     db_url = settings.DATABASE_URL
 
+if not db_url.startswith("sqlite"):
+    engine_kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    )
+
 engine = create_async_engine(db_url, **engine_kwargs)
 
 AsyncSessionLocal = sessionmaker(
@@ -29,6 +74,29 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+def pool_status() -> dict:
+    """Current connection pool usage, for health checks and metrics."""
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            timeout_seconds=pool.timeout()
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(
+            waiting=pool.waiting,
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            avg_wait_ms=round(pool.total_wait / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            max_wait_ms=round(pool.max_wait * 1000, 3)
+        )
+    return status
+
 async def get_db() -> AsyncSession:
     """Dependency for database session."""
     async with AsyncSessionLocal() as session:
@@ -39,4 +107,4 @@ async def get_db() -> AsyncSession:
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
@@ -0,0 +1,37 @@
+from collections import defaultdict
+from typing import Any, Callable
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Published after a committed change to price slots or schedule days
+SCHEDULE_CHANGED = "schedule_changed"
+# Published after a committed booking change on a date (booking_date=...)
+AVAILABILITY_CHANGED = "availability_changed"
+
+
+class EventBus:
+    """
+    Minimal in-process publish/subscribe. Handlers run synchronously, in
+    subscription order, when an event is published; a failing handler is
+    logged and does not stop the others.
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, list[Callable[..., Any]]] = defaultdict(list)
+
+    def subscribe(self, event: str, handler: Callable[..., Any]):
+        self._handlers[event].append(handler)
+
+    def unsubscribe(self, event: str, handler: Callable[..., Any]):
+        if handler in self._handlers[event]:
+            self._handlers[event].remove(handler)
+
+    def publish(self, event: str, **payload: Any):
+        for handler in list(self._handlers[event]):
+            try:
+                handler(**payload)
+            except Exception:
+                logger.exception("Handler %s for event '%s' failed", getattr(handler, "__name__", handler), event)
+
+event_bus = EventBus()
@@ -0,0 +1,37 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a BoundedExecutor already has `max_pending` jobs queued or running."""
+
+
+class BoundedExecutor:
+    """
+    Thread pool for CPU-bound work called from async code, with a hard limit
+    on queued + running jobs. Once the limit is reached new jobs are rejected
+    immediately instead of piling up behind the ones already waiting.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ExecutorSaturated(f"{self.name} executor is saturated ({self.pending} pending jobs)")
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,80 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Hashable, Optional
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Delivered instead of the dropped messages when a subscriber falls behind
+RESYNC = object()
+
+
+class Subscription:
+    """
+    One consumer of a hub topic, with its own bounded queue. A subscriber that
+    lets the queue fill up does not slow the publisher or the other subscribers:
+    its backlog is dropped and replaced by a single RESYNC marker, after which
+    it should reload the full state.
+    """
+
+    def __init__(self, hub: "Hub", topic: Hashable, maxsize: int):
+        self.hub = hub
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, message: Any):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            logger.info("Subscriber to %s fell behind; %s messages dropped so far", self.topic, self.dropped)
+
+    async def get(self, timeout: Optional[float] = None) -> Any:
+        """Next message, RESYNC, or None if `timeout` seconds pass without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.hub.unsubscribe(self)
+
+
+class Hub:
+    """In-process fan-out of messages to the subscribers of a topic."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[Hashable, set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, topic: Hashable) -> Subscription:
+        subscription = Subscription(self, topic, self.queue_size)
+        self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.topic]
+
+    def publish(self, topic: Hashable, message: Any) -> int:
+        """Queues the message for every subscriber of the topic without waiting. Returns how many there are."""
+        subscribers = self._subscribers.get(topic, ())
+        for subscription in list(subscribers):
+            subscription.put(message)
+        return len(subscribers)
+
+    def has_subscribers(self, topic: Hashable) -> bool:
+        return topic in self._subscribers
+
+    def topics(self) -> list[Hashable]:
+        return list(self._subscribers)
+
+    def __len__(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
@@ -1,24 +1,173 @@
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
-from typing import Any
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+from app.core.config import get_settings
 
 # Custom log format that looks professional
-LOG_FORMAT = "%(levelname)s:     %(asctime)s - %(name)s - %(message)s"
+LOG_FORMAT = "%(levelname)s:     %(asctime)s - %(name)s - [%(request_id)s] %(message)s"
+
+# Loggers on the request path whose INFO and DEBUG output is rate limited
+SAMPLED_LOGGERS = ("app.services.booking_service", "app.services.user_service")
+
+# Set per request by RequestIdMiddleware and attached to every log record
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["DeferredQueueHandler"] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Copies the current request ID onto the record while still in the request's context."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Token bucket per logger: lets through `rate` records per second with bursts
+    of up to `burst`. WARNING and above always pass. The next record that gets
+    through carries the number of records dropped before it (`sampled_out`).
+    """
+
+    def __init__(self, rate: float, burst: int):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.dropped = 0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                self.dropped += 1
+                return False
+            self.tokens -= 1
+            if self.dropped:
+                record.sampled_out = self.dropped
+                self.dropped = 0
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues records for the listener thread, which formats and writes them off
+    the request path. Only the %-style arguments are merged into the message
+    here, so it shows them as they were when the call was made. When the queue
+    is full, records are dropped and counted in `dropped` instead of blocking.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        if getattr(record, "sampled_out", 0):
+            entry["sampled_out"] = record.sampled_out
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = "-"
+        message = super().format(record)
+        if getattr(record, "sampled_out", 0):
+            message += f" ({record.sampled_out} similar messages suppressed)"
+        return message
+
 
 def setup_logging():
-    """Sets up the logging configuration for the application."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format=LOG_FORMAT,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
+    """
+    Sets up the logging configuration for the application.
+
+    Records go through an in-memory queue and are formatted and written to
+    stdout by a background thread, so a slow stdout never blocks requests.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    settings = get_settings()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if settings.LOG_JSON else TextFormatter(LOG_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(settings.LOG_QUEUE_SIZE)
+    _queue_handler = DeferredQueueHandler(log_queue)
+    _queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [_queue_handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    for name in SAMPLED_LOGGERS:
+        logging.getLogger(name).addFilter(
+            SamplingFilter(rate=settings.LOG_SAMPLE_RATE_PER_SECOND, burst=settings.LOG_SAMPLE_BURST)
+        )
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
     # You can also configure specific loggers here
     # Example: sqlalchemy.engine level to WARNING to avoid too much noise in production
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
+def stop_logging():
+    """Flushes the queued records and stops the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def dropped_records() -> int:
+    """Records dropped because the queue to the background writer was full."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
 def get_logger(name: str) -> logging.Logger:
     """Returns a logger instance with the given name."""
     return logging.getLogger(name)
@@ -0,0 +1,191 @@
+import functools
+import inspect
+import math
+import time
+from contextvars import ContextVar
+from typing import Callable, Iterable, Optional, Sequence
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels[name] for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}", *self.samples()]
+        return "\n".join(lines)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        # Per label set: [count per bucket (not cumulative)..., sum]
+        self.values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self.values.get(key)
+        if series is None:
+            series = self.values[key] = [0] * len(self.buckets) + [0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-1] += value
+
+    def samples(self):
+        for key, series in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-1])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+
+
+class CallbackGauge(Metric):
+    """Gauge (or counter, with type="counter") read from `collect` at scrape time: {label values: value}."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], collect: Callable[[], dict], type: str = "gauge"):
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+        self.type = type
+
+    def samples(self):
+        for key, value in self.collect().items():
+            key = key if isinstance(key, tuple) else (key,)
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """In-process metrics of this worker, rendered in the Prometheus text format (0.0.4)."""
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time to complete an HTTP request, by route template.",
+    ["method", "route", "status"]
+))
+http_request_db_queries = registry.register(Histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request.",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS
+))
+http_request_db_duration = registry.register(Histogram(
+    "http_request_db_duration_seconds", "Time spent executing SQL per HTTP request.",
+    ["method", "route"]
+))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "Execution time of SQL statements, by statement type.",
+    ["statement"]
+))
+repository_duration = registry.register(Histogram(
+    "repository_call_duration_seconds", "Duration of repository calls, including their SQL round trips.",
+    ["repository", "method"]
+))
+
+
+class QueryStats:
+    """SQL statements and time attributed to the current request."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+# Set by MetricsMiddleware for the duration of each request
+query_stats_var: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    keyword = statement.split(None, 1)[0].upper() if statement.strip() else ""
+    db_query_duration.observe(elapsed, statement=keyword)
+    # SQLAlchemy runs this inside the awaiting task's context, so the request's stats are visible
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # after_cursor_execute does not run for failed statements
+    if context.connection is not None and context.connection.info.get("query_started"):
+        context.connection.info["query_started"].pop()
+
+
+def instrumented(cls):
+    """
+    Class decorator for repositories: every public coroutine method, inherited
+    ones included, records its duration in repository_call_duration_seconds.
+    """
+    for name, method in inspect.getmembers(cls, inspect.iscoroutinefunction):
+        if name.startswith("_"):
+            continue
+        setattr(cls, name, _timed(cls.__name__, name, method))
+    return cls
+
+
+def _timed(repository: str, name: str, method):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            repository_duration.observe(time.perf_counter() - started, repository=repository, method=name)
+    return wrapper
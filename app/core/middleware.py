@@ -0,0 +1,86 @@
+import time
+import uuid
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.logging_config import request_id_var
+from app.core.metrics import (
+    QueryStats,
+    http_request_db_duration,
+    http_request_db_queries,
+    http_request_duration,
+    query_stats_var,
+)
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class RequestIdMiddleware:
+    """
+    Assigns every request an ID (the incoming X-Request-ID header, or a new one),
+    exposes it to log records through `request_id_var` and echoes it back in
+    the response headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (REQUEST_ID_HEADER.encode(), request_id.encode("latin-1"))]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Records each request's latency, and the SQL statements and time spent on
+    them while serving it, labelled by route template ("/bookings/{booking_id}",
+    not the actual path, to keep the number of series bounded).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = QueryStats()
+        token = query_stats_var.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            query_stats_var.reset(token)
+            # Set by the router once the request matched a route
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            http_request_duration.observe(elapsed, method=method, route=route, status=str(status_code))
+            http_request_db_queries.observe(stats.count, method=method, route=route)
+            http_request_db_duration.observe(stats.seconds, method=method, route=route)
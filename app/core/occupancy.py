@@ -0,0 +1,77 @@
+from typing import Iterable, Optional, Sequence
+
+
+class OccupancyMap:
+    """
+    Compact lane × slot occupancy for a single date.
+
+    Each lane is a row stored as a Python int used as a bitset: bit `i` is set
+    when the i-th slot of `slot_ids` is taken. Whole-row checks, counts and
+    AND/OR with blocked masks are single integer operations instead of one
+    set lookup per cell.
+    """
+
+    def __init__(self, slot_ids: Sequence[int]):
+        self.slot_ids = list(slot_ids)
+        self._bits = {slot_id: i for i, slot_id in enumerate(self.slot_ids)}
+        self.full_mask = (1 << len(self.slot_ids)) - 1
+        self.rows: dict[int, int] = {}
+
+    @classmethod
+    def from_cells(cls, slot_ids: Sequence[int], cells: Iterable[tuple[int, int]]) -> "OccupancyMap":
+        """Builds the map from (lane_id, slot_id) pairs. Slots outside `slot_ids` are ignored."""
+        occupancy = cls(slot_ids)
+        for lane_id, slot_id in cells:
+            occupancy.mark(lane_id, slot_id)
+        return occupancy
+
+    def mark(self, lane_id: int, slot_id: int):
+        bit = self._bits.get(slot_id)
+        if bit is not None:
+            self.rows[lane_id] = self.rows.get(lane_id, 0) | (1 << bit)
+
+    def mask(self, slot_ids: Iterable[int]) -> int:
+        """Returns the bitmask covering the given slots."""
+        mask = 0
+        for slot_id in slot_ids:
+            mask |= 1 << self._bits[slot_id]
+        return mask
+
+    def row(self, lane_id: int) -> int:
+        return self.rows.get(lane_id, 0)
+
+    def is_free(self, lane_id: int, mask: Optional[int] = None) -> bool:
+        """True if none of the slots in `mask` (default: all slots) are taken on the lane."""
+        return self.row(lane_id) & (self.full_mask if mask is None else mask) == 0
+
+    def is_available(self, lane_id: int, slot_id: int) -> bool:
+        return not (self.row(lane_id) >> self._bits[slot_id]) & 1
+
+    def occupied_slot_ids(self, lane_id: int, mask: Optional[int] = None) -> list[int]:
+        taken = self.row(lane_id) & (self.full_mask if mask is None else mask)
+        return [slot_id for i, slot_id in enumerate(self.slot_ids) if (taken >> i) & 1]
+
+    def free_count(self, lane_ids: Iterable[int]) -> int:
+        """Number of free cells across the given lanes."""
+        return sum(len(self.slot_ids) - self.row(lane_id).bit_count() for lane_id in lane_ids)
+
+    def block(self, mask: int, lane_ids: Optional[Iterable[int]] = None):
+        """ORs a blocked mask into the given lanes (default: every lane already in the map)."""
+        for lane_id in (self.rows.keys() if lane_ids is None else lane_ids):
+            self.rows[lane_id] = self.row(lane_id) | (mask & self.full_mask)
+
+    def _combine(self, other: "OccupancyMap", op) -> "OccupancyMap":
+        if self.slot_ids != other.slot_ids:
+            raise ValueError("Occupancy maps must share the same slot layout")
+        combined = OccupancyMap(self.slot_ids)
+        for lane_id in self.rows.keys() | other.rows.keys():
+            row = op(self.row(lane_id), other.row(lane_id))
+            if row:
+                combined.rows[lane_id] = row
+        return combined
+
+    def __or__(self, other: "OccupancyMap") -> "OccupancyMap":
+        return self._combine(other, int.__or__)
+
+    def __and__(self, other: "OccupancyMap") -> "OccupancyMap":
+        return self._combine(other, int.__and__)
@@ -0,0 +1,94 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from fastapi import HTTPException, Request, status
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage of token buckets. The in-memory backend counts per process; a
+    backend over a shared store (e.g. Redis with an atomic script) makes
+    several workers share the same limits.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """
+        Takes one token from the bucket `key`, which refills at `rate` tokens per
+        second up to `burst`. Returns 0 if a token was taken, otherwise the seconds
+        until one will be available.
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Buckets in a dict, least recently used evicted beyond `max_keys` (an evicted bucket starts full)."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (float(burst), now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        self._buckets.clear()
+
+
+def client_ip(request: Request) -> str:
+    """
+    The client's address as seen by the server. Behind a reverse proxy, run
+    uvicorn with --proxy-headers so this is the address from X-Forwarded-For.
+    """
+    return request.client.host if request.client else "unknown"
+
+
+class AuthRateLimiter:
+    """
+    Token buckets for the unauthenticated auth endpoints, one per client IP and
+    one per account email for each action. Checked before any database lookup
+    or password hashing, so rejected attempts cost almost nothing.
+    """
+
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+
+    async def check(self, action: str, ip: str, email: str | None = None):
+        """Raises 429 with a Retry-After header if the IP or the email is over its limit."""
+        buckets = [(f"{action}:ip:{ip}", settings.AUTH_RATE_LIMIT_IP_PER_MINUTE, settings.AUTH_RATE_LIMIT_IP_BURST)]
+        if email:
+            buckets.append((
+                f"{action}:email:{email.strip().lower()}",
+                settings.AUTH_RATE_LIMIT_EMAIL_PER_MINUTE,
+                settings.AUTH_RATE_LIMIT_EMAIL_BURST
+            ))
+
+        for key, per_minute, burst in buckets:
+            wait = await self.backend.take(key, per_minute / 60, burst)
+            if wait:
+                logger.warning("Rate limit exceeded for %s", key)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many attempts, please try again later.",
+                    headers={"Retry-After": str(math.ceil(wait))}
+                )
+
+auth_rate_limiter = AuthRateLimiter(InMemoryRateLimitBackend(max_keys=settings.AUTH_RATE_LIMIT_MAX_KEYS))
@@ -1,14 +1,24 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import get_settings
+from app.core.executor import BoundedExecutor, ExecutorSaturated
 
 settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
+# Verified token -> snapshot of the user's identity and role ({"id", "email", "full_name", "role"}).
+# Entries never outlive the token itself and are dropped when the user changes.
+token_cache: TTLCache[dict] = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token."""
     to_encode = data.copy()
@@ -34,4 +44,33 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Hash password."""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+# bcrypt takes ~200 ms of CPU per call; running it inline would block the event loop
+password_executor = BoundedExecutor(
+    "bcrypt",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+async def _run_password_job(func, *args):
+    try:
+        return await password_executor.run(func, *args)
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The server is busy, please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash on the bcrypt thread pool."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash password on the bcrypt thread pool."""
+    return await _run_password_job(get_password_hash, password)
+
+def invalidate_user_tokens(user_id: int) -> int:
+    """Drops every cached token of a user. Call after changing the user's data or password."""
+    return token_cache.discard_where(lambda identity: identity["id"] == user_id)
@@ -0,0 +1,80 @@
+import asyncio
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from typing import AsyncIterator, Optional
+import aiosmtplib
+
+
+class SMTPPool:
+    """
+    Keeps up to `size` authenticated SMTP connections open and reuses them
+    across messages, so a batch of emails pays for one handshake (TCP, TLS,
+    AUTH) per connection instead of one per email.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        size: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: bool = False,
+        use_tls: bool = False,
+        timeout: float = 30
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle: list[aiosmtplib.SMTP] = []
+        self.connects = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            use_tls=self.use_tls,
+            timeout=self.timeout
+        )
+        await client.connect()
+        self.connects += 1
+        return client
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """Borrows an open connection; it is dropped instead of returned if the caller fails."""
+        async with self._slots:
+            client = self._idle.pop() if self._idle else None
+            if client is None or not client.is_connected:
+                client = await self._connect()
+            try:
+                yield client
+            except BaseException:
+                client.close()
+                raise
+            self._idle.append(client)
+
+    async def send(self, message: EmailMessage):
+        try:
+            async with self.connection() as client:
+                await client.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            # The server may have closed an idle connection; retry once on a fresh one
+            async with self.connection() as client:
+                await client.send_message(message)
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for client in idle:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
@@ -0,0 +1,45 @@
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, Sequence, Tuple, Union
+from jinja2 import Environment, FileSystemLoader, Template
+
+
+class TemplateRenderer:
+    """
+    Compiles every template in `folder` once, up front, and renders from the
+    compiled objects. Templates are not re-read or re-checked on disk afterwards,
+    so changing one requires a restart.
+    """
+
+    def __init__(self, folder: Union[str, Path]):
+        self.environment = Environment(loader=FileSystemLoader(folder), auto_reload=False, cache_size=-1)
+        self.templates: Dict[str, Template] = {
+            name: self.environment.get_template(name)
+            for name in self.environment.list_templates()
+        }
+
+    def render(self, template_name: str, context: Dict[str, Any]) -> str:
+        return self.templates[template_name].render(**context)
+
+    def _render_all(self, items: Sequence[Tuple[str, Dict[str, Any]]], return_exceptions: bool) -> list:
+        rendered = []
+        for template_name, context in items:
+            try:
+                rendered.append(self.render(template_name, context))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                rendered.append(e)
+        return rendered
+
+    async def render_many(
+        self,
+        items: Sequence[Tuple[str, Dict[str, Any]]],
+        return_exceptions: bool = False
+    ) -> list:
+        """
+        Renders (template_name, context) pairs in a worker thread, so a large batch
+        does not stall the event loop. With `return_exceptions`, a failing item
+        yields its exception in place of the HTML, like asyncio.gather.
+        """
+        return await asyncio.to_thread(self._render_all, items, return_exceptions)
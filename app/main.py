@@ -1,13 +1,34 @@
 # app/main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.router import api_router
-from app.core.logging_config import setup_logging
+from app.api.v1.endpoints import metrics
+from app.core.config import get_settings
+from app.core.logging_config import setup_logging, stop_logging
+from app.core.middleware import MetricsMiddleware, RequestIdMiddleware
+from app.services.booking_sweeper import booking_sweeper
+from app.services.email_service import email_service
+from app.services.email_worker import email_worker
 
 # Initialize logging
 setup_logging()
+settings = get_settings()
 
-app = FastAPI(title="Bowling SaaS API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Starts and stops the background tasks with the application."""
+    if settings.BOOKING_SWEEPER_ENABLED:
+        booking_sweeper.start()
+    if settings.EMAIL_OUTBOX_ENABLED:
+        email_worker.start()
+    yield
+    await booking_sweeper.stop()
+    await email_worker.stop()
+    await email_service.smtp_pool.close()
+    stop_logging()
+
+app = FastAPI(title="Bowling SaaS API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,6 +36,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination headers read by the owner UI
+    expose_headers=["X-Next-Cursor", "X-Total-Count-Estimate"],
 )
 
-app.include_router(api_router, prefix="/api/v1")
\ No newline at end of file
+app.add_middleware(RequestIdMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+app.include_router(api_router, prefix="/api/v1")
+if settings.METRICS_ENABLED:
+    # Scraped by Prometheus; restrict access to it at the reverse proxy
+    app.include_router(metrics.router, include_in_schema=False)
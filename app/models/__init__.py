@@ -1,4 +1,6 @@
-from .enums import UserRole, LaneType, BookingStatus
+from .enums import UserRole, LaneType, BookingStatus, EmailStatus
 from .user import User
 from .infrastructure import Lane, Schedule, DayConfig, PriceSlot
-from .booking import Booking, BookingItem
\ No newline at end of file
+from .booking import Booking, BookingItem
+from .email import EmailOutbox
+from .stats import DailyStats, DailyBookingStats
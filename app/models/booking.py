@@ -1,5 +1,6 @@
 from datetime import datetime, date
 from typing import List, Optional, TYPE_CHECKING
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field, Relationship
 from app.models.enums import BookingStatus
 
@@ -8,16 +9,46 @@ if TYPE_CHECKING:
     from app.models.infrastructure import Lane, PriceSlot
 
 class BookingItem(SQLModel, table=True):
+    __table_args__ = (
+        # A lane × slot × date cell can be held by only one active item.
+        # Items are deactivated when their booking is cancelled or its hold expires.
+        Index(
+            "uq_bookingitem_active_cell",
+            "booking_date", "lane_id", "price_slot_id",
+            unique=True,
+            postgresql_where=text("active"),
+            # SQLite renders boolean filters as "active = 1"; the predicate must match verbatim
+            sqlite_where=text("active = 1")
+        ),
+        # Reverse lookups from a price slot or lane (e.g. before changing a schedule)
+        Index("ix_bookingitem_price_slot_id_lane_id", "price_slot_id", "lane_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    booking_id: int = Field(foreign_key="booking.id")
+    booking_id: int = Field(foreign_key="booking.id", index=True)
     lane_id: int = Field(foreign_key="lane.id")
     price_slot_id: int = Field(foreign_key="priceslot.id")
+    # Denormalized from Booking so the unique index can cover the whole cell
+    booking_date: date
+    active: bool = Field(default=True)
     
     booking: "Booking" = Relationship(back_populates="items")
     lane: "Lane" = Relationship(back_populates="items")
     price_slot: "PriceSlot" = Relationship(back_populates="items")
 
 class Booking(SQLModel, table=True):
+    __table_args__ = (
+        # Small index over live holds only, used by the expired-hold sweeper
+        Index(
+            "ix_booking_pending_expires_at",
+            "expires_at",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'")
+        ),
+        # Date-range reports and exports filtered by status
+        Index("ix_booking_booking_date_status", "booking_date", "status"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     booking_date: date
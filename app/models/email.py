@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import JSON, Column, Index, text
+from sqlmodel import SQLModel, Field
+from app.models.enums import EmailStatus
+
+class EmailOutbox(SQLModel, table=True):
+    """
+    An email waiting to be delivered. Rows are written in the same transaction
+    as the change that triggers them and delivered by the outbox worker.
+    """
+    __table_args__ = (
+        # Small index over undelivered emails only, polled by the outbox worker
+        Index(
+            "ix_emailoutbox_pending_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'")
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    recipient: str
+    subject: str
+    template_name: str
+    template_body: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    status: EmailStatus = Field(default=EmailStatus.PENDING)
+    attempts: int = Field(default=0)
+    # When the email is next due; also pushed forward while a worker is sending it
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
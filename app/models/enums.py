@@ -14,4 +14,9 @@ class LaneType(str, Enum):
 class BookingStatus(str, Enum):
     PENDING = "PENDING"
     PAID = "PAID"
-    CANCELLED = "CANCELLED"
\ No newline at end of file
+    CANCELLED = "CANCELLED"
+
+class EmailStatus(str, Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
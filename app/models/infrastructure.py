@@ -1,5 +1,6 @@
 from datetime import time
 from typing import List, Optional, TYPE_CHECKING
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from app.models.enums import LaneType
 
@@ -20,10 +21,15 @@ class Schedule(SQLModel, table=True):
 
 class DayConfig(SQLModel, table=True):
     day_of_week: int = Field(primary_key=True) # 0-6
-    schedule_id: int = Field(foreign_key="schedule.id")
+    schedule_id: int = Field(foreign_key="schedule.id", index=True)
     schedule: Schedule = Relationship(back_populates="days")
 
 class PriceSlot(SQLModel, table=True):
+    # Slots are always read per schedule, ordered by start time
+    __table_args__ = (
+        Index("ix_priceslot_schedule_id_start_time", "schedule_id", "start_time"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     start_time: time
     end_time: time
@@ -0,0 +1,28 @@
+from datetime import date
+from sqlmodel import SQLModel, Field
+
+class DailyStats(SQLModel, table=True):
+    """
+    Daily sales and occupancy rollup per lane and schedule, maintained
+    incrementally as bookings change status (see StatsRepository).
+    A group booking counts once on each of its lanes; per-day and overall
+    booking counts come from DailyBookingStats.
+    """
+    stat_date: date = Field(primary_key=True)
+    lane_id: int = Field(primary_key=True, foreign_key="lane.id")
+    schedule_id: int = Field(primary_key=True, foreign_key="schedule.id")
+    # Paid bookings only, split evenly across their items
+    revenue: float = Field(default=0)
+    paid_bookings: int = Field(default=0)
+    pending_bookings: int = Field(default=0)
+    cancelled_bookings: int = Field(default=0)
+    # Lane × slot cells sold (PAID)
+    occupied_slots: int = Field(default=0)
+
+
+class DailyBookingStats(SQLModel, table=True):
+    """Bookings per date and status, each counted once however many lanes it holds."""
+    stat_date: date = Field(primary_key=True)
+    paid_bookings: int = Field(default=0)
+    pending_bookings: int = Field(default=0)
+    cancelled_bookings: int = Field(default=0)
@@ -1,4 +1,5 @@
 from typing import List, Optional, TYPE_CHECKING
+from sqlalchemy import Index, func
 from sqlmodel import SQLModel, Field, Relationship
 from app.models.enums import UserRole
 
@@ -12,4 +13,17 @@ class User(SQLModel, table=True):
     full_name: str
     role: UserRole = Field(default=UserRole.USER)
     
-    bookings: List["Booking"] = Relationship(back_populates="user")
\ No newline at end of file
+    bookings: List["Booking"] = Relationship(back_populates="user")
+
+# Case-insensitive prefix search in the admin user listing (LIKE 'abc%').
+# text_pattern_ops lets PostgreSQL use the indexes for LIKE whatever the database collation.
+Index(
+    "ix_user_email_lower_pattern",
+    func.lower(User.email).label("email_lower"),
+    postgresql_ops={"email_lower": "text_pattern_ops"}
+)
+Index(
+    "ix_user_full_name_lower_pattern",
+    func.lower(User.full_name).label("full_name_lower"),
+    postgresql_ops={"full_name_lower": "text_pattern_ops"}
+)
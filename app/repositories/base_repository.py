@@ -1,6 +1,7 @@
-from typing import Generic, TypeVar, Type, Optional, List, Any
+import json
+from typing import Generic, TypeVar, Type, Optional, List, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, text
 from sqlmodel import SQLModel
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
@@ -34,6 +35,63 @@ class BaseRepository(Generic[ModelType]):
         )
         return result.scalars().all()
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        after: Optional[Any] = None,
+        limit: int = 100,
+        where: tuple = ()
+    ) -> Tuple[List[ModelType], Optional[Any]]:
+        """
+        Fetch records in ID order using keyset pagination: `after` is the last ID
+        of the previous page, so every page is an index range scan on the primary
+        key however deep it is. Returns the records and the cursor of the next page
+        (None on the last one).
+        """
+        stmt = select(self.model).where(*where)
+        if after is not None:
+            stmt = stmt.where(self.model.id > after)
+        # One extra row tells whether there is a next page
+        result = await db.execute(stmt.order_by(self.model.id).limit(limit + 1))
+        records = result.scalars().all()
+        if len(records) > limit:
+            return records[:limit], records[limit - 1].id
+        return records, None
+
+    async def estimate_count(self, db: AsyncSession, *, where: tuple = ()) -> int:
+        """
+        Approximate number of records matching `where`, without a full COUNT(*).
+        On PostgreSQL it is the planner's estimate: pg_class.reltuples for the whole
+        table, the row estimate of the filtered query otherwise. Other databases
+        (SQLite in tests) count exactly.
+        """
+        if db.bind.dialect.name == "postgresql":
+            if not where:
+                table = db.bind.dialect.identifier_preparer.format_table(self.model.__table__)
+                result = await db.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                    {"table": table}
+                )
+                estimate = result.scalar()
+                # -1 until the table is first vacuumed or analyzed
+                if estimate is not None and estimate >= 0:
+                    return estimate
+            else:
+                compiled = select(self.model.id).where(*where).compile(dialect=db.bind.dialect)
+                conn = await db.connection()
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}",
+                    tuple(compiled.params[name] for name in compiled.positiontup)
+                )
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]["Plan"]["Plan Rows"])
+
+        result = await db.execute(select(func.count()).select_from(self.model).where(*where))
+        return result.scalar_one()
+
     async def create(self, db: AsyncSession, *, obj_in: ModelType) -> ModelType:
         """Create a new record."""
         db.add(obj_in)
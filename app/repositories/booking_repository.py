@@ -1,11 +1,37 @@
 from datetime import date, datetime
+from typing import Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, insert, update, and_, or_, case, literal
 from app.models.booking import Booking, BookingItem
+from app.models.infrastructure import Lane, PriceSlot
+from app.models.user import User
 from app.models.enums import BookingStatus
+from app.core.occupancy import OccupancyMap
 from sqlalchemy.orm import selectinload
 from app.repositories.base_repository import BaseRepository
+from app.core.metrics import instrumented
 
+def is_holding_cell(now: datetime):
+    """
+    Filter for BookingItem rows that currently block their cell: active items
+    of PAID bookings, or of PENDING bookings whose hold has not expired yet.
+    Active items are served by the partial index on BookingItem, so the join
+    to Booking only touches live bookings; the background sweeper deactivates
+    expired holds.
+    """
+    return and_(
+        BookingItem.active,
+        or_(
+            Booking.status == BookingStatus.PAID,
+            Booking.expires_at > now
+        )
+    )
+
+def hold_expires_at():
+    """Expiry of the hold on a cell, or NULL when the cell is PAID."""
+    return case((Booking.status == BookingStatus.PENDING, Booking.expires_at))
+
+@instrumented
 class BookingRepository(BaseRepository[Booking]):
     async def get_with_details(self, db: AsyncSession, booking_id: int) -> Booking:
         """Fetches a booking with its user and items (including lane info) pre-loaded."""
@@ -19,34 +45,226 @@ class BookingRepository(BaseRepository[Booking]):
         )
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
-    async def get_occupied_slots(self, db: AsyncSession, booking_date: date):
+
+    async def get_occupied_slots(self, db: AsyncSession, booking_date: date, slot_ids: Sequence[int]) -> OccupancyMap:
         """
-        Returns a set of (lane_id, slot_id) that are NOT available.
+        Returns an OccupancyMap of the cells that are NOT available, restricted to `slot_ids`.
         Considers:
         1. PAID reservations.
         2. PENDING reservations that have not yet expired.
         """
-        now = datetime.utcnow()
-        
         stmt = (
             select(BookingItem.lane_id, BookingItem.price_slot_id)
             .join(Booking)
             .where(
-                and_(
-                    Booking.booking_date == booking_date,
-                    or_(
-                        Booking.status == BookingStatus.PAID,
-                        and_(
-                            Booking.status == BookingStatus.PENDING,
-                            Booking.expires_at > now
-                        )
-                    )
-                )
+                BookingItem.booking_date == booking_date,
+                BookingItem.price_slot_id.in_(slot_ids),
+                is_holding_cell(datetime.utcnow())
             )
         )
         
         result = await db.execute(stmt)
-        # Convert to a set of tuples for fast O(1) lookup in the Service
-        return {(row.lane_id, row.price_slot_id) for row in result.all()}
+        return OccupancyMap.from_cells(slot_ids, result.tuples())
+
+    async def get_occupied_cells_in_range(self, db: AsyncSession, start_date: date, end_date: date):
+        """
+        Returns the occupied (booking_date, lane_id, price_slot_id) cells for a whole
+        date range in one query, with the PENDING hold expiry of each cell
+        (None when the cell is PAID).
+        """
+        stmt = (
+            select(
+                BookingItem.booking_date,
+                BookingItem.lane_id,
+                BookingItem.price_slot_id,
+                hold_expires_at().label("hold_expires_at")
+            )
+            .join(Booking)
+            .where(
+                BookingItem.booking_date.between(start_date, end_date),
+                is_holding_cell(datetime.utcnow())
+            )
+        )
+        result = await db.execute(stmt)
+        return result.all()
+
+    async def stream_active_cells(self, db: AsyncSession, start_date: date, end_date: date, partition_size: int):
+        """
+        Streams the (booking_date, lane_id, price_slot_id, status) of every booking
+        item in [start_date, end_date] that holds its cell (PAID, or PENDING with a
+        live hold) through a server-side cursor, as plain tuples rather than ORM
+        objects. Iterate the result with `partitions()`.
+        """
+        stmt = (
+            select(BookingItem.booking_date, BookingItem.lane_id, BookingItem.price_slot_id, Booking.status)
+            .join(Booking)
+            .where(
+                BookingItem.booking_date.between(start_date, end_date),
+                # Expired holds the sweeper has not cancelled yet do not count
+                is_holding_cell(datetime.utcnow())
+            )
+            .execution_options(yield_per=partition_size)
+        )
+        return await db.stream(stmt)
+
+    async def stream_export_rows(
+        self,
+        db: AsyncSession,
+        start_date: date,
+        end_date: date,
+        statuses: Optional[Sequence[BookingStatus]],
+        partition_size: int
+    ):
+        """
+        Streams one flat row per booking item in [start_date, end_date] (optionally
+        only the given statuses) with the booking, user email and lane number,
+        ordered by date and booking. Iterate the result with `partitions()`.
+        """
+        stmt = (
+            select(
+                Booking.id.label("booking_id"),
+                Booking.booking_date,
+                Booking.status,
+                Booking.total_price,
+                Booking.created_at,
+                User.email.label("user_email"),
+                User.full_name.label("user_name"),
+                Lane.number.label("lane_number"),
+                PriceSlot.start_time,
+                PriceSlot.end_time
+            )
+            .join(User, User.id == Booking.user_id)
+            .join(BookingItem, BookingItem.booking_id == Booking.id)
+            .join(Lane, Lane.id == BookingItem.lane_id)
+            .join(PriceSlot, PriceSlot.id == BookingItem.price_slot_id)
+            .where(Booking.booking_date.between(start_date, end_date))
+            .order_by(Booking.booking_date, Booking.id, Lane.number, PriceSlot.start_time)
+            .execution_options(yield_per=partition_size)
+        )
+        if statuses:
+            stmt = stmt.where(Booking.status.in_(statuses))
+        return await db.stream(stmt)
+
+    async def expire_pending_holds(self, db: AsyncSession, batch_size: int) -> list[tuple[int, date]]:
+        """
+        Cancels up to `batch_size` PENDING bookings whose hold has expired and
+        releases their cells. Returns (booking_id, booking_date) pairs. Does not commit.
+        """
+        stmt = (
+            select(Booking.id)
+            .where(
+                # Rendered inline rather than as a bound parameter, so Postgres can match
+                # the partial index ix_booking_pending_expires_at even in cached generic plans
+                Booking.status == literal(BookingStatus.PENDING.value, literal_execute=True),
+                Booking.expires_at <= datetime.utcnow()
+            )
+            .order_by(Booking.expires_at)
+            .limit(batch_size)
+            # Lets several workers sweep at the same time without blocking each other.
+            # confirm_payment locks the same row with its conditional UPDATE: whichever
+            # comes second sees the other's status and leaves the booking alone.
+            .with_for_update(skip_locked=True)
+        )
+        booking_ids = (await db.execute(stmt)).scalars().all()
+        return await self.cancel_expired_holds(db, booking_ids)
+
+    async def mark_paid(self, db: AsyncSession, booking_id: int) -> bool:
+        """
+        Marks the booking PAID if it is still PENDING and its hold has not expired,
+        in a single conditional UPDATE. Returns False if no row was changed. Does not commit.
+        """
+        result = await db.execute(
+            update(Booking)
+            .where(
+                Booking.id == booking_id,
+                Booking.status == BookingStatus.PENDING,
+                Booking.expires_at > datetime.utcnow()
+            )
+            .values(status=BookingStatus.PAID)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    async def cancel_expired_holds_on_cells(
+        self,
+        db: AsyncSession,
+        booking_date: date,
+        lane_ids: Sequence[int],
+        slot_ids: Sequence[int]
+    ) -> list[int]:
+        """
+        Cancels the expired PENDING bookings that still hold any of the given cells
+        and releases all of their items. Returns the cancelled booking IDs.
+        """
+        stmt = (
+            select(BookingItem.booking_id)
+            .join(Booking)
+            .where(
+                BookingItem.active,
+                BookingItem.booking_date == booking_date,
+                BookingItem.lane_id.in_(lane_ids),
+                BookingItem.price_slot_id.in_(slot_ids),
+                Booking.status == BookingStatus.PENDING,
+                Booking.expires_at <= datetime.utcnow()
+            )
+            .distinct()
+        )
+        booking_ids = (await db.execute(stmt)).scalars().all()
+        return [booking_id for booking_id, _ in await self.cancel_expired_holds(db, booking_ids)]
+
+    async def insert_items(
+        self,
+        db: AsyncSession,
+        booking: Booking,
+        cells: Sequence[tuple[int, int]]
+    ) -> list[BookingItem]:
+        """
+        Inserts an item for each (lane_id, price_slot_id) cell of the booking in a
+        single INSERT ... RETURNING and returns them. Does not commit.
+        """
+        if not cells:
+            # An INSERT without rows would fail as a NOT NULL violation, read as a taken cell
+            raise ValueError("A booking needs at least one cell")
+        result = await db.scalars(
+            insert(BookingItem).returning(BookingItem),
+            [
+                {
+                    "booking_id": booking.id,
+                    "lane_id": lane_id,
+                    "price_slot_id": slot_id,
+                    "booking_date": booking.booking_date,
+                    "active": True
+                } for lane_id, slot_id in cells
+            ]
+        )
+        return result.all()
+
+    async def cancel_expired_holds(self, db: AsyncSession, booking_ids: Sequence[int]) -> list[tuple[int, date]]:
+        """
+        Marks the bookings CANCELLED and releases their cells, skipping any that
+        is no longer an expired PENDING hold (e.g. paid since it was selected).
+        Returns (booking_id, booking_date) of the cancelled ones. Does not commit.
+        """
+        if not booking_ids:
+            return []
+        result = await db.execute(
+            update(Booking)
+            .where(
+                Booking.id.in_(booking_ids),
+                Booking.status == BookingStatus.PENDING,
+                Booking.expires_at <= datetime.utcnow()
+            )
+            .values(status=BookingStatus.CANCELLED)
+            .returning(Booking.id, Booking.booking_date)
+            .execution_options(synchronize_session=False)
+        )
+        cancelled = result.tuples().all()
+        if cancelled:
+            await db.execute(
+                update(BookingItem)
+                .where(BookingItem.booking_id.in_([booking_id for booking_id, _ in cancelled]))
+                .values(active=False)
+            )
+        return cancelled
 
 booking_repo = BookingRepository(Booking)
\ No newline at end of file
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, literal
+from app.models.email import EmailOutbox
+from app.models.enums import EmailStatus
+from app.repositories.base_repository import BaseRepository
+from app.core.metrics import instrumented
+
+@instrumented
+class EmailOutboxRepository(BaseRepository[EmailOutbox]):
+    async def claim_due(self, db: AsyncSession, batch_size: int, lease_seconds: int) -> list[EmailOutbox]:
+        """
+        Reserves up to `batch_size` PENDING emails that are due: counts the attempt
+        and pushes `next_attempt_at` past the lease, so no other worker picks them up
+        while they are being sent, and a crashed worker's emails come back later.
+        Does not commit.
+        """
+        now = datetime.utcnow()
+        stmt = (
+            select(EmailOutbox)
+            .where(
+                # Inline literal so Postgres can use the partial index in generic plans
+                EmailOutbox.status == literal(EmailStatus.PENDING.value, literal_execute=True),
+                EmailOutbox.next_attempt_at <= now
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        emails = (await db.execute(stmt)).scalars().all()
+        for email in emails:
+            email.attempts += 1
+            email.next_attempt_at = now + timedelta(seconds=lease_seconds)
+        return emails
+
+email_outbox_repo = EmailOutboxRepository(EmailOutbox)
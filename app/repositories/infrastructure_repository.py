@@ -1,8 +1,14 @@
+from datetime import date, datetime, time
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from typing import Optional, Sequence
+from sqlalchemy import select, insert, update, delete, and_, true, cast, func, Numeric
 from app.models.infrastructure import Lane, Schedule, DayConfig, PriceSlot
+from app.models.booking import Booking, BookingItem
+from app.repositories.booking_repository import is_holding_cell, hold_expires_at
 from app.repositories.base_repository import BaseRepository
+from app.core.metrics import instrumented
 
+@instrumented
 class InfrastructureRepository:
     """
     Infrastructure repository manages multiple models (Lane, Schedule, etc.),
@@ -26,9 +32,24 @@ class InfrastructureRepository:
             select(PriceSlot)
             .where(PriceSlot.schedule_id == schedule_id)
             .order_by(PriceSlot.start_time)
+            # Reflect bulk updates made earlier in the same session
+            .execution_options(populate_existing=True)
         )
         return result.scalars().all()
 
+    async def get_all_slots(self, db: AsyncSession):
+        result = await db.execute(select(PriceSlot).order_by(PriceSlot.start_time))
+        return result.scalars().all()
+
+    async def get_slots_by_weekday(self, db: AsyncSession):
+        """Returns (day_of_week, PriceSlot) pairs for every configured day, ordered by day and start time"""
+        result = await db.execute(
+            select(DayConfig.day_of_week, PriceSlot)
+            .join(PriceSlot, PriceSlot.schedule_id == DayConfig.schedule_id)
+            .order_by(DayConfig.day_of_week, PriceSlot.start_time)
+        )
+        return result.tuples().all()
+
     async def calculate_total(self, db: AsyncSession, slot_ids: list[int]) -> float:
         """Sums the actual prices from the DB to prevent fraud from the frontend"""
         result = await db.execute(
@@ -45,4 +66,169 @@ class InfrastructureRepository:
         )
         return result.scalars().all()
 
+    async def get_lanes_by_ids(self, db: AsyncSession, lane_ids: list[int]):
+        """Returns Lane objects for the given IDs, ordered by lane number"""
+        result = await db.execute(
+            select(Lane)
+            .where(Lane.id.in_(lane_ids))
+            .order_by(Lane.number)
+        )
+        return result.scalars().all()
+
+    async def get_availability_rows(self, db: AsyncSession, booking_date: date):
+        """
+        Returns the whole lane × slot grid for a date in a single statement.
+
+        Lanes are cross joined with the slots of the schedule that applies to
+        the weekday, then left-joined to the occupied booking cells (at most
+        one per cell, enforced by the active-cell unique index). Each row has
+        an `occupied` flag and, for PENDING holds, `hold_expires_at`.
+        Rows are ordered lane by lane, then by slot start time.
+        """
+        active_cells = (
+            select(
+                BookingItem.lane_id,
+                BookingItem.price_slot_id,
+                hold_expires_at().label("hold_expires_at")
+            )
+            .join(Booking)
+            .where(
+                BookingItem.booking_date == booking_date,
+                is_holding_cell(datetime.utcnow())
+            )
+            .subquery()
+        )
+
+        stmt = (
+            select(
+                Lane.id.label("lane_id"),
+                Lane.number.label("lane_number"),
+                Lane.type.label("lane_type"),
+                PriceSlot.id.label("slot_id"),
+                PriceSlot.start_time,
+                PriceSlot.end_time,
+                PriceSlot.price,
+                active_cells.c.lane_id.is_not(None).label("occupied"),
+                active_cells.c.hold_expires_at
+            )
+            .select_from(Lane)
+            .join(PriceSlot, true())
+            .join(
+                DayConfig,
+                and_(
+                    DayConfig.schedule_id == PriceSlot.schedule_id,
+                    DayConfig.day_of_week == booking_date.weekday()
+                )
+            )
+            .outerjoin(
+                active_cells,
+                and_(
+                    active_cells.c.lane_id == Lane.id,
+                    active_cells.c.price_slot_id == PriceSlot.id
+                )
+            )
+            .order_by(Lane.number, Lane.id, PriceSlot.start_time)
+        )
+        result = await db.execute(stmt)
+        return result.all()
+
+    # --- Bulk schedule management. These methods do not commit and do not
+    # refresh PriceSlot/DayConfig objects already loaded in the session.
+
+    async def get_schedule(self, db: AsyncSession, schedule_id: int) -> Optional[Schedule]:
+        return await db.get(Schedule, schedule_id)
+
+    async def get_slot_times_by_schedule(self, db: AsyncSession, schedule_id: int) -> dict[int, tuple[time, time]]:
+        """Returns {slot_id: (start_time, end_time)} of the schedule's slots."""
+        result = await db.execute(
+            select(PriceSlot.id, PriceSlot.start_time, PriceSlot.end_time).where(PriceSlot.schedule_id == schedule_id)
+        )
+        return {slot_id: (start_time, end_time) for slot_id, start_time, end_time in result}
+
+    async def get_booked_slot_ids(self, db: AsyncSession, slot_ids: Sequence[int], active_only: bool = False) -> list[int]:
+        """
+        Returns which of the slots are referenced by any booking item (past or
+        present), or with `active_only` by an item that still holds its cell.
+        """
+        if not slot_ids:
+            return []
+        stmt = (
+            select(BookingItem.price_slot_id)
+            .where(BookingItem.price_slot_id.in_(slot_ids))
+            .distinct()
+        )
+        if active_only:
+            stmt = stmt.where(BookingItem.active)
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    async def update_slots(self, db: AsyncSession, rows: Sequence[dict]):
+        """Updates existing slots from dicts carrying their "id", as one executemany UPDATE."""
+        if rows:
+            await db.execute(update(PriceSlot), list(rows))
+
+    async def insert_slots(self, db: AsyncSession, schedule_id: int, rows: Sequence[dict]) -> list[int]:
+        """Inserts new slots for the schedule in one INSERT ... RETURNING and returns their IDs."""
+        if not rows:
+            return []
+        result = await db.execute(
+            insert(PriceSlot).returning(PriceSlot.id),
+            [{**row, "schedule_id": schedule_id} for row in rows]
+        )
+        return result.scalars().all()
+
+    async def delete_slots(self, db: AsyncSession, slot_ids: Sequence[int]):
+        if slot_ids:
+            await db.execute(
+                delete(PriceSlot)
+                .where(PriceSlot.id.in_(slot_ids))
+                .execution_options(synchronize_session=False)
+            )
+
+    async def assign_days(self, db: AsyncSession, schedule_id: int, days: Sequence[int]) -> list[int]:
+        """Points the given weekdays at the schedule (creating missing DayConfig rows). Returns all of its days."""
+        await db.execute(
+            update(DayConfig)
+            .where(DayConfig.day_of_week.in_(days))
+            .values(schedule_id=schedule_id)
+            .execution_options(synchronize_session=False)
+        )
+        configured = set((await db.execute(
+            select(DayConfig.day_of_week).where(DayConfig.day_of_week.in_(days))
+        )).scalars().all())
+        missing = [day for day in days if day not in configured]
+        if missing:
+            await db.execute(
+                insert(DayConfig),
+                [{"day_of_week": day, "schedule_id": schedule_id} for day in missing]
+            )
+        result = await db.execute(
+            select(DayConfig.day_of_week)
+            .where(DayConfig.schedule_id == schedule_id)
+            .order_by(DayConfig.day_of_week)
+        )
+        return result.scalars().all()
+
+    async def adjust_prices(self, db: AsyncSession, percent: float, schedule_id: Optional[int] = None) -> int:
+        """
+        Multiplies slot prices by (1 + percent / 100), rounded to cents, in a single
+        UPDATE. Limited to one schedule if given. Returns the number of slots changed.
+        """
+        # Postgres only rounds NUMERIC to a number of decimals
+        new_price = func.round(cast(PriceSlot.price * (1 + percent / 100), Numeric), 2)
+        stmt = update(PriceSlot).values(price=new_price).execution_options(synchronize_session=False)
+        if schedule_id is not None:
+            stmt = stmt.where(PriceSlot.schedule_id == schedule_id)
+        result = await db.execute(stmt)
+        return result.rowcount
+
+    async def update_slot_price(self, db: AsyncSession, slot_id: int, price: float) -> int:
+        result = await db.execute(
+            update(PriceSlot)
+            .where(PriceSlot.id == slot_id)
+            .values(price=price)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
 infrastructure_repo = InfrastructureRepository()
\ No newline at end of file
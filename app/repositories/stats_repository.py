@@ -0,0 +1,175 @@
+from datetime import date
+from typing import Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, case, distinct, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.booking import Booking, BookingItem
+from app.models.enums import BookingStatus
+from app.models.infrastructure import PriceSlot
+from app.models.stats import DailyBookingStats, DailyStats
+from app.core.metrics import instrumented
+
+KEY_COLUMNS = ["stat_date", "lane_id", "schedule_id"]
+MEASURE_COLUMNS = ["revenue", "paid_bookings", "pending_bookings", "cancelled_bookings", "occupied_slots"]
+# Also kept per date in DailyBookingStats, where a group booking counts once
+BOOKING_COLUMNS = ["paid_bookings", "pending_bookings", "cancelled_bookings"]
+
+# How each booking status change moves the rollup counters
+TRANSITIONS = {
+    "reserved": {"pending_bookings": 1},
+    "paid": {"pending_bookings": -1, "paid_bookings": 1, "revenue": 1, "occupied_slots": 1},
+    "expired": {"pending_bookings": -1, "cancelled_bookings": 1},
+}
+
+@instrumented
+class StatsRepository:
+    """
+    Maintains the DailyStats and DailyBookingStats rollups with set-based
+    INSERT ... SELECT ... ON CONFLICT statements, so updating them costs two
+    statements per booking status change and reading them never touches the
+    booking tables.
+    """
+
+    def _insert(self, db: AsyncSession, table=DailyStats):
+        return (postgresql if db.bind.dialect.name == "postgresql" else sqlite).insert(table)
+
+    def _item_counts(self, *where):
+        """Items per booking, used to split a booking's price across its cells."""
+        return (
+            select(BookingItem.booking_id, func.count().label("item_count"))
+            .where(*where)
+            .group_by(BookingItem.booking_id)
+            .subquery()
+        )
+
+    def _grouped(self, measures: list, item_counts, *where):
+        return (
+            select(BookingItem.booking_date, BookingItem.lane_id, PriceSlot.schedule_id, *measures)
+            .join(Booking, Booking.id == BookingItem.booking_id)
+            .join(PriceSlot, PriceSlot.id == BookingItem.price_slot_id)
+            .join(item_counts, item_counts.c.booking_id == BookingItem.booking_id)
+            .where(*where)
+            .group_by(BookingItem.booking_date, BookingItem.lane_id, PriceSlot.schedule_id)
+        )
+
+    async def apply_transition(self, db: AsyncSession, booking_ids: Sequence[int], transition: str):
+        """
+        Adds the effect of the bookings' status change ("reserved", "paid" or
+        "expired") to their (date, lane, schedule) and per-date rollup rows.
+        Does not commit; call it in the transaction that changes the status.
+        """
+        if not booking_ids:
+            return
+        deltas = TRANSITIONS[transition]
+        item_counts = self._item_counts(BookingItem.booking_id.in_(booking_ids))
+        measures = {
+            "revenue": func.sum(Booking.total_price / item_counts.c.item_count),
+            "bookings": func.count(distinct(Booking.id)),
+            "occupied_slots": func.count(),
+        }
+        columns = [
+            (measures.get(column, measures["bookings"]) * deltas[column] if column in deltas else literal_column("0")).label(column)
+            for column in MEASURE_COLUMNS
+        ]
+
+        insert = self._insert(db)
+        stmt = insert.from_select(
+            KEY_COLUMNS + MEASURE_COLUMNS,
+            self._grouped(columns, item_counts, BookingItem.booking_id.in_(booking_ids))
+        ).on_conflict_do_update(
+            index_elements=KEY_COLUMNS,
+            set_={column: getattr(DailyStats, column) + insert.excluded[column] for column in MEASURE_COLUMNS}
+        )
+        await db.execute(stmt)
+
+        insert = self._insert(db, DailyBookingStats)
+        per_date = (
+            select(
+                Booking.booking_date,
+                *((func.count() * deltas.get(column, 0)).label(column) for column in BOOKING_COLUMNS)
+            )
+            .where(Booking.id.in_(booking_ids))
+            .group_by(Booking.booking_date)
+        )
+        await db.execute(
+            insert.from_select(["stat_date", *BOOKING_COLUMNS], per_date).on_conflict_do_update(
+                index_elements=["stat_date"],
+                set_={column: getattr(DailyBookingStats, column) + insert.excluded[column] for column in BOOKING_COLUMNS}
+            )
+        )
+
+    async def rebuild(self, db: AsyncSession, start_date: date, end_date: date):
+        """Recomputes the rollup rows of [start_date, end_date] from the bookings. Does not commit."""
+        in_range = Booking.booking_date.between(start_date, end_date)
+        item_counts = self._item_counts(BookingItem.booking_date.between(start_date, end_date))
+
+        def bookings_with(status):
+            return func.count(distinct(case((Booking.status == status, Booking.id))))
+
+        paid = Booking.status == BookingStatus.PAID
+        columns = [
+            func.coalesce(func.sum(case((paid, Booking.total_price / item_counts.c.item_count))), 0).label("revenue"),
+            bookings_with(BookingStatus.PAID).label("paid_bookings"),
+            bookings_with(BookingStatus.PENDING).label("pending_bookings"),
+            bookings_with(BookingStatus.CANCELLED).label("cancelled_bookings"),
+            func.sum(case((paid, 1), else_=0)).label("occupied_slots"),
+        ]
+
+        await db.execute(delete(DailyStats).where(DailyStats.stat_date.between(start_date, end_date)))
+        await db.execute(
+            self._insert(db).from_select(KEY_COLUMNS + MEASURE_COLUMNS, self._grouped(columns, item_counts, in_range))
+        )
+
+        def count_with(status):
+            return func.sum(case((Booking.status == status, 1), else_=0))
+
+        await db.execute(delete(DailyBookingStats).where(DailyBookingStats.stat_date.between(start_date, end_date)))
+        await db.execute(
+            self._insert(db, DailyBookingStats).from_select(
+                ["stat_date", *BOOKING_COLUMNS],
+                select(
+                    Booking.booking_date,
+                    count_with(BookingStatus.PAID),
+                    count_with(BookingStatus.PENDING),
+                    count_with(BookingStatus.CANCELLED),
+                )
+                .where(in_range)
+                .group_by(Booking.booking_date)
+            )
+        )
+
+    async def get_daily_totals(self, db: AsyncSession, start_date: date, end_date: date):
+        """
+        Per-day sums over all lanes and schedules, ordered by date. Booking counts
+        come from DailyBookingStats, so a group booking counts once.
+        """
+        lane_sums = (
+            select(
+                DailyStats.stat_date,
+                *(func.sum(getattr(DailyStats, c)).label(c) for c in MEASURE_COLUMNS if c not in BOOKING_COLUMNS)
+            )
+            .where(DailyStats.stat_date.between(start_date, end_date))
+            .group_by(DailyStats.stat_date)
+            .subquery()
+        )
+        result = await db.execute(
+            select(
+                lane_sums,
+                *(func.coalesce(getattr(DailyBookingStats, c), 0).label(c) for c in BOOKING_COLUMNS)
+            )
+            .outerjoin(DailyBookingStats, DailyBookingStats.stat_date == lane_sums.c.stat_date)
+            .order_by(lane_sums.c.stat_date)
+        )
+        return result.all()
+
+    async def get_lane_totals(self, db: AsyncSession, start_date: date, end_date: date):
+        """Per-lane sums over the date range, ordered by lane. A group booking counts on each of its lanes."""
+        result = await db.execute(
+            select(DailyStats.lane_id, *(func.sum(getattr(DailyStats, c)).label(c) for c in MEASURE_COLUMNS))
+            .where(DailyStats.stat_date.between(start_date, end_date))
+            .group_by(DailyStats.lane_id)
+            .order_by(DailyStats.lane_id)
+        )
+        return result.all()
+
+stats_repo = StatsRepository()
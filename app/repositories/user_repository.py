@@ -1,13 +1,26 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, or_
 from app.models.user import User
 from app.repositories.base_repository import BaseRepository
+from app.core.metrics import instrumented
 from typing import Optional
 
+@instrumented
 class UserRepository(BaseRepository[User]):
     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
         """Fetch a user by email."""
         result = await db.execute(select(User).where(User.email == email))
         return result.scalar_one_or_none()
 
+    def prefix_filter(self, prefix: str) -> tuple:
+        """
+        `where` clauses matching users whose email or full name starts with `prefix`,
+        ignoring case. Backed by the lower(...) text_pattern_ops indexes.
+        """
+        prefix = prefix.lower()
+        return (or_(
+            func.lower(User.email).startswith(prefix, autoescape=True),
+            func.lower(User.full_name).startswith(prefix, autoescape=True),
+        ),)
+
 user_repository = UserRepository(User)
\ No newline at end of file
@@ -10,6 +10,12 @@ class BookingCreate(BaseModel):
     selected_slots: List[int] # Selected PriceSlot IDs
     lane_id: int
 
+# Events and parties: the same slots on several lanes, reserved all-or-nothing
+class GroupBookingCreate(BaseModel):
+    booking_date: date
+    selected_slots: List[int]
+    lane_ids: List[int]
+
 class BookingItemRead(BaseModel):
     lane_id: int
     price_slot_id: int
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import time
+from typing import Optional
 from app.models.enums import LaneType
 
 class PriceSlotRead(BaseModel):
@@ -18,4 +19,27 @@ class AvailabilityGrid(BaseModel):
     lane_id: int
     lane_number: str
     lane_type: LaneType
-    slots: list[dict] # {slot_id, time, price, available}
\ No newline at end of file
+    slots: list[dict] # {slot_id, time, price, available}
+# Bulk schedule management (owner only)
+class PriceSlotWrite(BaseModel):
+    # Existing slots keep their ID (and their bookings); slots without one are created
+    id: Optional[int] = None
+    start_time: time
+    end_time: time
+    price: float = Field(ge=0)
+
+class ScheduleDaysUpdate(BaseModel):
+    days: list[int] = Field(min_length=1) # 0=Monday ... 6=Sunday
+
+class ScheduleDaysRead(BaseModel):
+    schedule_id: int
+    days: list[int]
+
+class PriceAdjustment(BaseModel):
+    # +10 raises prices by 10%, -15 lowers them by 15%
+    percent: float = Field(gt=-100, le=1000)
+    # Limits the adjustment to one schedule; all slots otherwise
+    schedule_id: Optional[int] = None
+
+class PriceAdjustmentResult(BaseModel):
+    updated: int
@@ -1,25 +1,89 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.booking import Booking, BookingItem
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.config import get_settings
+from app.models.booking import Booking
+from app.models.infrastructure import PriceSlot
 from app.models.enums import BookingStatus
-from app.schemas.booking import BookingCreate
+from app.schemas.booking import BookingCreate, GroupBookingCreate
 from app.repositories.booking_repository import booking_repo
 from app.repositories.infrastructure_repository import infrastructure_repo
+from app.repositories.stats_repository import stats_repo
 from app.core.logging_config import get_logger
 from app.services.email_service import email_service
+from app.services.infrastructure_service import infrastructure_service
 
+settings = get_settings()
 logger = get_logger(__name__)
 
 class BookingService:
     async def create_reservation(self, db: AsyncSession, user_id: int, data: BookingCreate):
-        logger.info(f"User {user_id} attempting to create reservation for date {data.booking_date}, lane {data.lane_id}")
-        
-        # 1. Validate existence and contiguity of selected slots
-        slots = await infrastructure_repo.get_slots_by_ids(db, data.selected_slots)
+        logger.info("User %s attempting to create reservation for date %s, lane %s", user_id, data.booking_date, data.lane_id)
+        slots = await self._get_contiguous_slots(db, user_id, data.selected_slots)
+        # Checked up front: an insert failure is taken to mean the cells are taken
+        if not await infrastructure_repo.get_lanes_by_ids(db, [data.lane_id]):
+            logger.warning("Booking failed for user %s: Invalid lane ID provided %s", user_id, data.lane_id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The selected lane is invalid."
+            )
+        return await self._reserve(db, user_id, data.booking_date, [data.lane_id], slots)
+
+    async def create_group_reservation(self, db: AsyncSession, user_id: int, data: GroupBookingCreate):
+        """
+        Reserves the same slots on several lanes as one booking. Either every
+        lane × slot cell is held or none is.
+        """
+        logger.info("User %s attempting to create group reservation for date %s, lanes %s", user_id, data.booking_date, data.lane_ids)
+
+        if not data.lane_ids or len(set(data.lane_ids)) != len(data.lane_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Select one or more distinct lanes."
+            )
+        if len(data.lane_ids) > settings.GROUP_BOOKING_MAX_LANES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A group reservation can include at most {settings.GROUP_BOOKING_MAX_LANES} lanes."
+            )
+
+        slots = await self._get_contiguous_slots(db, user_id, data.selected_slots)
+        lanes = await infrastructure_repo.get_lanes_by_ids(db, data.lane_ids)
+        if len(lanes) != len(data.lane_ids):
+            logger.warning("Group booking failed for user %s: Invalid lane IDs provided %s", user_id, data.lane_ids)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="One or more selected lanes are invalid."
+            )
+
+        # One occupancy lookup for every cell, to report all conflicting lanes at once.
+        # The unique index still guards the insert against concurrent reservations.
+        occupancy = await booking_repo.get_occupied_slots(db, data.booking_date, data.selected_slots)
+        mask = occupancy.mask(data.selected_slots)
+        taken = [lane.number for lane in lanes if not occupancy.is_free(lane.id, mask)]
+        if taken:
+            logger.warning("Group booking failed for user %s: Lanes %s are occupied on %s", user_id, taken, data.booking_date)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The selected time slot is no longer available on lanes: {', '.join(taken)}."
+            )
+
+        return await self._reserve(db, user_id, data.booking_date, data.lane_ids, slots)
+
+    async def _get_contiguous_slots(self, db: AsyncSession, user_id: int, slot_ids: List[int]) -> List[PriceSlot]:
+        """Validates existence and contiguity of the selected slots and returns them ordered by start time."""
+        if not slot_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Select at least one slot."
+            )
+        slots = await infrastructure_repo.get_slots_by_ids(db, slot_ids)
         
-        if len(slots) != len(data.selected_slots):
-            logger.warning(f"Booking failed for user {user_id}: Invalid slot IDs provided {data.selected_slots}")
+        if len(slots) != len(slot_ids):
+            logger.warning("Booking failed for user %s: Invalid slot IDs provided %s", user_id, slot_ids)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="One or more selected slots are invalid."
@@ -28,85 +92,160 @@ class BookingService:
         # Check contiguity (slots are ordered by start_time by the repository)
         for i in range(len(slots) - 1):
             if slots[i].end_time != slots[i+1].start_time:
-                logger.warning(f"Booking failed for user {user_id}: Slots are not contiguous {data.selected_slots}")
+                logger.warning("Booking failed for user %s: Slots are not contiguous %s", user_id, slot_ids)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Selected slots must be contiguous."
                 )
+        return slots
 
-        # 2. Validate availability again (to avoid race conditions)
-        occupied = await booking_repo.get_occupied_slots(db, data.booking_date)
-        
-        for slot_id in data.selected_slots:
-            if (data.lane_id, slot_id) in occupied:
-                logger.warning(f"Booking failed for user {user_id}: Slot {slot_id} on lane {data.lane_id} is already occupied.")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="The selected time slot is no longer available."
-                )
+    async def _reserve(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        booking_date: date,
+        lane_ids: List[int],
+        slots: List[PriceSlot]
+    ) -> Booking:
+        """Holds every lane × slot cell under one PENDING booking and commits, or raises 400."""
+        # Calculate total price (using the objects we already fetched)
+        total_price = sum(slot.price for slot in slots) * len(lane_ids)
+        slot_ids = [slot.id for slot in slots]
+        cells = [(lane_id, slot_id) for lane_id in lane_ids for slot_id in slot_ids]
 
-        # 3. Calculate total price (using the objects we already fetched)
-        total_price = sum(slot.price for slot in slots)
+        # Insert optimistically. The partial unique index on active booking items
+        # rejects cells that are already taken, so there is no read-then-write race.
+        # Holds that expired but still occupy a cell are released and the insert retried once.
+        new_booking = await self._insert_booking(db, user_id, booking_date, cells, total_price)
+        if new_booking is None:
+            released = await booking_repo.cancel_expired_holds_on_cells(db, booking_date, lane_ids, slot_ids)
+            if released:
+                await stats_repo.apply_transition(db, released, "expired")
+                logger.info("Released expired holds %s on lanes %s for %s", released, lane_ids, booking_date)
+                new_booking = await self._insert_booking(db, user_id, booking_date, cells, total_price)
 
-        # 4. Create booking header with expiration
-        new_booking = Booking(
-            user_id=user_id,
-            booking_date=data.booking_date,
-            total_price=total_price,
-            status=BookingStatus.PENDING,
-            expires_at=datetime.utcnow() + timedelta(minutes=10)
-        )
-        db.add(new_booking)
-        await db.flush() # To obtain the booking ID
-
-        # 5. Create items (each hour block)
-        for slot_id in data.selected_slots:
-            item = BookingItem(
-                booking_id=new_booking.id,
-                lane_id=data.lane_id,
-                price_slot_id=slot_id
+        if new_booking is None:
+            logger.warning("Booking failed for user %s: Slots %s on lanes %s are already occupied.", user_id, slot_ids, lane_ids)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The selected time slot is no longer available."
             )
-            db.add(item)
 
+        await stats_repo.apply_transition(db, [new_booking.id], "reserved")
         await db.commit()
-        await db.refresh(new_booking)
-        logger.info(f"Reservation created successfully for user {user_id}: Booking ID {new_booking.id}")
+        infrastructure_service.invalidate_availability(booking_date)
+        logger.info("Reservation created successfully for user %s: Booking ID %s", user_id, new_booking.id)
+        return new_booking
+
+    async def _insert_booking(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        booking_date: date,
+        cells: List[tuple[int, int]],
+        total_price: float
+    ) -> Optional[Booking]:
+        """
+        Inserts the booking header (with its 10-minute expiration) and all of its
+        (lane_id, slot_id) items inside a savepoint, the items in one bulk INSERT.
+        Returns None if one of the cells is already held by an active booking;
+        callers validate lanes and slots first, so that is the only integrity error expected.
+        """
+        try:
+            async with db.begin_nested():
+                new_booking = Booking(
+                    user_id=user_id,
+                    booking_date=booking_date,
+                    total_price=total_price,
+                    status=BookingStatus.PENDING,
+                    expires_at=datetime.utcnow() + timedelta(minutes=10)
+                )
+                db.add(new_booking)
+                await db.flush() # To obtain the booking ID
+
+                items = await booking_repo.insert_items(db, new_booking, cells)
+        except IntegrityError:
+            return None
+        # The RETURNING rows are the items; attach them so the response needs no reload
+        set_committed_value(new_booking, "items", items)
         return new_booking
 
     async def confirm_payment(self, db: AsyncSession, booking_id: int):
         """This method is called when the payment gateway gives the OK"""
-        logger.info(f"Attempting to confirm payment for Booking ID: {booking_id}")
+        logger.info("Attempting to confirm payment for Booking ID: %s", booking_id)
         
         # Use get_with_details to have everything ready for the email
         booking = await booking_repo.get_with_details(db, booking_id)
         
         if not booking:
-            logger.error(f"Payment confirmation failed: Booking ID {booking_id} not found.")
+            logger.error("Payment confirmation failed: Booking ID %s not found.", booking_id)
             raise HTTPException(status_code=404, detail="Booking not found")
         
         if booking.status == BookingStatus.PAID:
-            logger.info(f"Payment already confirmed for Booking ID: {booking_id}")
+            logger.info("Payment already confirmed for Booking ID: %s", booking_id)
             return booking
 
-        booking.status = BookingStatus.PAID
-        await db.commit()
-        logger.info(f"Payment confirmed successfully for Booking ID: {booking_id}")
-        
-        # 6. Send Confirmation Email
-        try:
-            email_data = {
+        # Only a live hold can be paid. The status is flipped by a conditional UPDATE, so a
+        # hold cancelled or expired after it was read above (its cells possibly taken by
+        # another booking since) is never turned into a PAID booking.
+        if not await booking_repo.mark_paid(db, booking_id):
+            await db.refresh(booking, ["status"])
+            if booking.status == BookingStatus.PAID:
+                # Confirmed by a concurrent request
+                logger.info("Payment already confirmed for Booking ID: %s", booking_id)
+                return booking
+            logger.warning("Payment confirmation failed: Booking ID %s is cancelled or its hold expired.", booking_id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The booking was cancelled or its hold expired."
+            )
+
+        set_committed_value(booking, "status", BookingStatus.PAID)
+        # Only reached when this request moved the booking out of PENDING, so the rollup
+        # never counts a booking as both paid and expired
+        await stats_repo.apply_transition(db, [booking.id], "paid")
+        # Queued in the same transaction, so the email goes out if and only if the payment is recorded
+        email_service.queue_booking_confirmation(
+            db,
+            booking.user.email,
+            {
                 "full_name": booking.user.full_name,
                 "booking_date": booking.booking_date.strftime("%Y-%m-%d"),
-                "lane_number": booking.items[0].lane.number,
+                # Every lane of a group booking, numerically where lane numbers are numbers
+                "lane_numbers": sorted(
+                    {item.lane.number for item in booking.items},
+                    key=lambda number: (len(number), number)
+                ),
                 "booking_id": booking.id,
                 "total_price": booking.total_price
             }
-            # Run email sending in the background (fastapi-mail is async)
-            await email_service.send_booking_confirmation(booking.user.email, email_data)
-        except Exception as e:
-            logger.error(f"Error sending confirmation email for booking {booking_id}: {str(e)}")
-            # We don't rollback payment confirmation if email fails
+        )
+        await db.commit()
+        # The hold no longer expires, so the cached grid's expiry is outdated
+        infrastructure_service.invalidate_availability(booking.booking_date)
+        logger.info("Payment confirmed successfully for Booking ID: %s", booking_id)
 
         return booking
 
+    async def expire_stale_holds(self, db: AsyncSession, batch_size: int) -> int:
+        """
+        Cancels PENDING bookings whose 10-minute hold has expired, in batches
+        of `batch_size` with one commit per batch. Returns how many were cancelled.
+        """
+        total = 0
+        while True:
+            expired = await booking_repo.expire_pending_holds(db, batch_size)
+            await stats_repo.apply_transition(db, [booking_id for booking_id, _ in expired], "expired")
+            await db.commit()
+            for booking_date in {booking_date for _, booking_date in expired}:
+                infrastructure_service.invalidate_availability(booking_date)
+
+            total += len(expired)
+            if len(expired) < batch_size:
+                break
+
+        if total:
+            logger.info("Expired %s stale pending bookings", total)
+        return total
+
 booking_service = BookingService()
\ No newline at end of file
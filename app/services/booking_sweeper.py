@@ -0,0 +1,17 @@
+from app.core.background import PeriodicTask
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.services.booking_service import booking_service
+
+settings = get_settings()
+
+async def sweep_expired_bookings() -> int:
+    """Cancels every expired PENDING hold, using its own database session."""
+    async with AsyncSessionLocal() as db:
+        return await booking_service.expire_stale_holds(db, settings.BOOKING_SWEEP_BATCH_SIZE)
+
+booking_sweeper = PeriodicTask(
+    "booking-sweeper",
+    interval=settings.BOOKING_SWEEP_INTERVAL_SECONDS,
+    job=sweep_expired_bookings
+)
@@ -1,9 +1,18 @@
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+import asyncio
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from fastapi_mail import ConnectionConfig
 from pydantic import EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import get_settings
 from app.core.logging_config import get_logger
+from app.core.smtp import SMTPPool
+from app.core.templates import TemplateRenderer
+from app.models.email import EmailOutbox
+from app.models.enums import EmailStatus
+from app.repositories.email_outbox_repository import email_outbox_repo
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -20,43 +29,129 @@ conf = ConnectionConfig(
     TEMPLATE_FOLDER=Path(__file__).parent.parent / 'templates' / 'email',
 )
 
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the given number of failed attempts, capped at one day."""
+    return timedelta(seconds=min(settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), 86400))
+
 class EmailService:
-    def __init__(self):
-        self.fastmail = FastMail(conf)
-
-    async def send_email(
-        self, 
-        email_to: EmailStr, 
-        subject: str, 
-        template_name: str, 
+    """
+    Emails are never sent on the request path: `queue_*` methods add them to the
+    outbox in the caller's transaction, and `deliver_pending` (run by the outbox
+    worker) sends them over pooled SMTP connections.
+    """
+
+    def __init__(self, smtp_pool: Optional[SMTPPool] = None):
+        self.smtp_pool = smtp_pool or SMTPPool(
+            hostname=conf.MAIL_SERVER,
+            port=conf.MAIL_PORT,
+            size=settings.MAIL_POOL_SIZE,
+            username=conf.MAIL_USERNAME if conf.USE_CREDENTIALS else None,
+            password=conf.MAIL_PASSWORD.get_secret_value() if conf.USE_CREDENTIALS else None,
+            start_tls=conf.MAIL_STARTTLS,
+            use_tls=conf.MAIL_SSL_TLS,
+            timeout=settings.MAIL_TIMEOUT_SECONDS
+        )
+        self.templates = TemplateRenderer(conf.TEMPLATE_FOLDER)
+
+    def queue_email(
+        self,
+        db: AsyncSession,
+        email_to: EmailStr,
+        subject: str,
+        template_name: str,
         template_body: Dict[str, Any]
-    ):
-        message = MessageSchema(
+    ) -> EmailOutbox:
+        """Adds the email to the outbox. It is sent only if the caller's transaction commits."""
+        email = EmailOutbox(
+            recipient=email_to,
             subject=subject,
-            recipients=[email_to],
-            template_body=template_body,
-            subtype=MessageType.html
+            template_name=template_name,
+            template_body=template_body
         )
-        try:
-            await self.fastmail.send_message(message, template_name=template_name)
-            logger.info(f"Email sent to {email_to} with subject: {subject}")
-        except Exception as e:
-            logger.error(f"Failed to send email to {email_to}: {str(e)}")
-
-    async def send_booking_confirmation(self, email_to: EmailStr, booking_data: Dict[str, Any]):
-        await self.send_email(
+        db.add(email)
+        return email
+
+    def queue_booking_confirmation(self, db: AsyncSession, email_to: EmailStr, booking_data: Dict[str, Any]):
+        return self.queue_email(
+            db,
             email_to=email_to,
             subject="Booking Confirmation - Bowling SaaS",
             template_name="booking_confirmation.html",
             template_body=booking_data
         )
 
-    async def send_password_reset(self, email_to: EmailStr, reset_data: Dict[str, Any]):
-        await self.send_email(
+    def queue_password_reset(self, db: AsyncSession, email_to: EmailStr, reset_data: Dict[str, Any]):
+        return self.queue_email(
+            db,
             email_to=email_to,
             subject="Password Reset Request - Bowling SaaS",
             template_name="password_reset.html",
             template_body=reset_data
         )
 
+    def build_message(self, email: EmailOutbox, html: str) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = conf.MAIL_FROM
+        message["To"] = email.recipient
+        message["Subject"] = email.subject
+        message.set_content(html, subtype="html")
+        return message
+
+    async def send_many(self, emails: Sequence[EmailOutbox]) -> list[Optional[BaseException]]:
+        """
+        Renders the whole batch in one worker thread, then sends it over the SMTP
+        pool. Returns None for each email that was sent, or the error.
+        """
+        bodies = await self.templates.render_many(
+            [(email.template_name, email.template_body) for email in emails],
+            return_exceptions=True
+        )
+
+        async def send(email: EmailOutbox, html):
+            if isinstance(html, Exception):
+                raise html
+            await self.smtp_pool.send(self.build_message(email, html))
+
+        return await asyncio.gather(*(send(email, html) for email, html in zip(emails, bodies)), return_exceptions=True)
+
+    async def deliver_pending(self, db: AsyncSession, batch_size: int) -> int:
+        """
+        Sends the due outbox emails in batches of `batch_size` until none are left.
+        Failed emails are retried with exponential backoff and marked FAILED after
+        EMAIL_OUTBOX_MAX_ATTEMPTS. Returns how many were sent.
+        """
+        sent = 0
+        while True:
+            emails = await email_outbox_repo.claim_due(db, batch_size, settings.EMAIL_OUTBOX_LEASE_SECONDS)
+            # Release the row locks before talking to SMTP
+            await db.commit()
+            if not emails:
+                break
+
+            results = await self.send_many(emails)
+            now = datetime.utcnow()
+            for email, error in zip(emails, results):
+                if error is None:
+                    email.status = EmailStatus.SENT
+                    email.sent_at = now
+                    email.last_error = None
+                    sent += 1
+                    continue
+
+                email.last_error = str(error)[:500]
+                if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                    email.status = EmailStatus.FAILED
+                    logger.error("Giving up on email %s to %s after %s attempts: %s", email.id, email.recipient, email.attempts, error)
+                else:
+                    email.next_attempt_at = now + retry_delay(email.attempts)
+                    logger.warning("Failed to send email %s to %s (attempt %s): %s", email.id, email.recipient, email.attempts, error)
+            await db.commit()
+
+            if len(emails) < batch_size:
+                break
+
+        if sent:
+            logger.info("Sent %s outbox emails", sent)
+        return sent
+
 email_service = EmailService()
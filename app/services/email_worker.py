@@ -0,0 +1,17 @@
+from app.core.background import PeriodicTask
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.services.email_service import email_service
+
+settings = get_settings()
+
+async def deliver_outbox_emails() -> int:
+    """Sends the due outbox emails, using its own database session."""
+    async with AsyncSessionLocal() as db:
+        return await email_service.deliver_pending(db, settings.EMAIL_OUTBOX_BATCH_SIZE)
+
+email_worker = PeriodicTask(
+    "email-outbox",
+    interval=settings.EMAIL_OUTBOX_INTERVAL_SECONDS,
+    job=deliver_outbox_emails
+)
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from typing import AsyncIterator, Literal, Optional, Sequence
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.models.enums import BookingStatus
+from app.repositories.booking_repository import booking_repo
+
+settings = get_settings()
+
+EXPORT_COLUMNS = [
+    "booking_id", "booking_date", "status", "total_price", "created_at",
+    "user_email", "user_name", "lane_number", "start_time", "end_time",
+]
+
+ExportFormat = Literal["csv", "ndjson"]
+
+def _values(row) -> list:
+    return [
+        value.value if isinstance(value, BookingStatus) else value.isoformat() if hasattr(value, "isoformat") else value
+        for value in row
+    ]
+
+def _csv_chunk(rows, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(_values(row) for row in rows)
+    return buffer.getvalue()
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(json.dumps(dict(zip(EXPORT_COLUMNS, _values(row)))) + "\n" for row in rows)
+
+class ExportService:
+    def check_range(self, start_date: date, end_date: date):
+        days_count = (end_date - start_date).days + 1
+        if days_count < 1 or days_count > settings.STATS_MAX_RANGE_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The date range must span between 1 and {settings.STATS_MAX_RANGE_DAYS} days."
+            )
+
+    async def stream_bookings(
+        self,
+        db: AsyncSession,
+        start_date: date,
+        end_date: date,
+        statuses: Optional[Sequence[BookingStatus]] = None,
+        fmt: ExportFormat = "csv",
+        compress: bool = False
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields the export one cursor partition at a time (one row per booking item),
+        optionally gzip-compressed on the fly, so memory use does not depend on
+        the number of rows. Call `check_range` before starting the response.
+        """
+        gzip = zlib.compressobj(wbits=31) if compress else None
+        result = await booking_repo.stream_export_rows(
+            db, start_date, end_date, statuses, settings.REPORT_STREAM_PARTITION_SIZE
+        )
+
+        def encode(text: str) -> bytes:
+            # zlib may buffer small inputs and return nothing yet
+            return gzip.compress(text.encode()) if gzip else text.encode()
+
+        if fmt == "csv":
+            # The header is written even when there are no rows
+            yield encode(_csv_chunk([], header=True))
+
+        async for partition in result.partitions():
+            chunk = encode(_csv_chunk(partition) if fmt == "csv" else _ndjson_chunk(partition))
+            if chunk:
+                yield chunk
+
+        if gzip:
+            yield gzip.flush()
+
+export_service = ExportService()
@@ -1,42 +1,296 @@
-from datetime import date
+import gzip
+import hashlib
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterator, Literal, NamedTuple
+import orjson
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.events import AVAILABILITY_CHANGED, SCHEDULE_CHANGED, event_bus
+from app.core.occupancy import OccupancyMap
 from app.repositories.infrastructure_repository import infrastructure_repo
 from app.repositories.booking_repository import booking_repo
 
+settings = get_settings()
+
+AvailabilityFormat = Literal["full", "compact"]
+
+def compact_grid(grid: list) -> dict:
+    """
+    Columnar form of a grid: the day's slots once, then one string per lane with
+    a character per slot, in slot order ("1" available, "0" taken). Every lane
+    of a grid has the same slots.
+    """
+    slots = grid[0]["slots"] if grid else []
+    return {
+        "slots": [{"slot_id": s["slot_id"], "time": s["time"], "price": s["price"]} for s in slots],
+        "lanes": [
+            {
+                "lane_id": lane["lane_id"],
+                "lane_number": lane["lane_number"],
+                "type": lane["type"],
+                "available": "".join("1" if s["available"] else "0" for s in lane["slots"]),
+            } for lane in grid
+        ],
+    }
+
+
+class EncodedGrid(NamedTuple):
+    body: bytes
+    # Strong validator of this exact representation
+    etag: str
+    gzipped: bool
+
+
+class CachedGrid:
+    """A date's grid plus its encoded JSON bodies, each built once on first use."""
+
+    def __init__(self, grid: list):
+        self.grid = grid
+        self._encoded: dict[tuple[str, bool], EncodedGrid] = {}
+
+    def encode(self, fmt: AvailabilityFormat = "full", accept_gzip: bool = False) -> EncodedGrid:
+        """
+        The grid as JSON in the given format, gzip-compressed when the client
+        accepts it and the body is at least AVAILABILITY_GZIP_MIN_BYTES long.
+        """
+        encoded = self._encoded.get((fmt, accept_gzip))
+        if encoded is None:
+            body = orjson.dumps(self.grid if fmt == "full" else compact_grid(self.grid))
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+            if fmt != "full":
+                digest += f"-{fmt}"
+            gzipped = accept_gzip and len(body) >= settings.AVAILABILITY_GZIP_MIN_BYTES
+            if gzipped:
+                # mtime=0 keeps the bytes, and so the ETag, stable across rebuilds
+                body = gzip.compress(body, compresslevel=6, mtime=0)
+                digest += "-gzip"
+            encoded = EncodedGrid(body, f'"{digest}"', gzipped)
+            self._encoded[(fmt, accept_gzip)] = encoded
+        return encoded
+
+    @property
+    def etag(self) -> str:
+        return self.encode().etag
+
+
+class AvailabilityCache:
+    """
+    Per-date cache of availability grids and their encoded responses.
+
+    Every date carries a generation number that is bumped on invalidation, so a
+    grid built from data read before a concurrent write is never stored.
+    Entries also expire when the earliest PENDING hold of that date runs out.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.grids: TTLCache[CachedGrid] = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Invalidations per date since the epoch last moved; at most `maxsize` dates
+        self._generations: dict[date, int] = {}
+        # Base of every date's generation
+        self._epoch = 0
+
+    def generation(self, booking_date: date) -> int:
+        return self._epoch + self._generations.get(booking_date, 0)
+
+    def get(self, booking_date: date):
+        entry = self.grids.get(booking_date)
+        return entry.grid if entry else None
+
+    def get_entry(self, booking_date: date) -> CachedGrid | None:
+        return self.grids.get(booking_date)
+
+    def store(self, booking_date: date, grid: list, generation: int, expires_at: datetime | None = None) -> CachedGrid:
+        """Caches the grid unless the date was invalidated meanwhile. Returns its entry either way."""
+        entry = CachedGrid(grid)
+        if generation != self.generation(booking_date):
+            # The date was invalidated while the grid was being built
+            return entry
+        ttl = None
+        if expires_at is not None:
+            ttl = max((expires_at - datetime.utcnow()).total_seconds(), 0)
+        self.grids.set(booking_date, entry, ttl=ttl)
+        return entry
+
+    def invalidate(self, booking_date: date):
+        self._generations[booking_date] = self._generations.get(booking_date, 0) + 1
+        self.grids.pop(booking_date)
+        if len(self._generations) > self.grids.maxsize:
+            self._fold_generations()
+
+    def invalidate_all(self):
+        """Drops every grid, e.g. after a schedule or price change that affects all dates."""
+        self._fold_generations()
+        self.grids.clear()
+
+    def _fold_generations(self):
+        """
+        Moves the epoch past every date's generation and forgets the per-date
+        counters, so they do not pile up for every date ever invalidated.
+        Generations only grow: builds in flight are discarded, cached grids kept.
+        """
+        self._epoch += max(self._generations.values(), default=0) + 1
+        self._generations.clear()
+
+    def clear(self):
+        self._epoch = 0
+        self._generations.clear()
+        self.grids.clear()
+
+
 class InfrastructureService:
+    def __init__(self):
+        self.availability_cache = AvailabilityCache(
+            maxsize=settings.AVAILABILITY_CACHE_MAX_DATES,
+            ttl=settings.AVAILABILITY_CACHE_TTL_SECONDS
+        )
+        # Prices and slot layouts appear in every cached grid
+        event_bus.subscribe(SCHEDULE_CHANGED, self.on_schedule_changed)
+
+    def on_schedule_changed(self, **_):
+        self.availability_cache.invalidate_all()
+
+    def invalidate_availability(self, booking_date: date):
+        """Drops the cached grid for a date. Called after every committed booking write."""
+        self.availability_cache.invalidate(booking_date)
+        event_bus.publish(AVAILABILITY_CHANGED, booking_date=booking_date)
+
     async def get_grid_availability(self, db: AsyncSession, booking_date: date):
-        # 1. Get the price schedule for the day of the week
-        weekday = booking_date.weekday()
-        schedule = await infrastructure_repo.get_schedule_by_day(db, weekday)
-        
-        if not schedule:
-            return []
-
-        # 2. Get lanes and slots for that schedule
+        return (await self.get_tagged_grid_availability(db, booking_date)).grid
+
+    async def get_tagged_grid_availability(self, db: AsyncSession, booking_date: date) -> CachedGrid:
+        """
+        The date's grid with its encodings and ETags. A cached grid is returned
+        as is, without touching the database; ETags change whenever the grid does.
+        """
+        cached = self.availability_cache.get_entry(booking_date)
+        if cached is not None:
+            return cached
+
+        generation = self.availability_cache.generation(booking_date)
+
+        # Lanes × slots of the day's schedule with occupancy flags, in one round trip.
+        # No rows means there is no schedule for the weekday (or no lanes).
+        rows = await infrastructure_repo.get_availability_rows(db, booking_date)
+
+        # Format for the frontend. Rows arrive lane by lane; slot times are
+        # formatted once and shared across lanes.
+        grid = []
+        slot_times = {}
+        next_expiry = None
+        lane_data = None
+        for row in rows:
+            if lane_data is None or lane_data["lane_id"] != row.lane_id:
+                lane_data = {
+                    "lane_id": row.lane_id,
+                    "lane_number": row.lane_number,
+                    "type": row.lane_type,
+                    "slots": []
+                }
+                grid.append(lane_data)
+
+            slot_time = slot_times.get(row.slot_id)
+            if slot_time is None:
+                slot_time = f"{row.start_time.strftime('%H:%M')}-{row.end_time.strftime('%H:%M')}"
+                slot_times[row.slot_id] = slot_time
+
+            lane_data["slots"].append({
+                "slot_id": row.slot_id,
+                "time": slot_time,
+                "price": row.price,
+                "available": not row.occupied
+            })
+            if row.hold_expires_at and (next_expiry is None or row.hold_expires_at < next_expiry):
+                next_expiry = row.hold_expires_at
+
+        return self.availability_cache.store(booking_date, grid, generation, expires_at=next_expiry)
+
+    async def get_grid_availability_range(
+        self,
+        db: AsyncSession,
+        start_date: date,
+        end_date: date
+    ) -> Iterator[tuple[date, list]]:
+        """
+        Resolves the availability grids of every date in [start_date, end_date].
+
+        Cached dates are reused. The rest share three queries for the whole
+        range: lanes, slots per weekday (through DayConfig) and one grouped
+        occupancy lookup. The returned iterator assembles each grid lazily so
+        the endpoint can stream them as they are built.
+        """
+        days_count = (end_date - start_date).days + 1
+        if days_count < 1 or days_count > settings.AVAILABILITY_RANGE_MAX_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The date range must span between 1 and {settings.AVAILABILITY_RANGE_MAX_DAYS} days."
+            )
+
+        days = [start_date + timedelta(days=i) for i in range(days_count)]
+        cached = {day: self.availability_cache.get(day) for day in days}
+        missing = [day for day in days if cached[day] is None]
+        if not missing:
+            return ((day, cached[day]) for day in days)
+
+        generations = {day: self.availability_cache.generation(day) for day in missing}
+
         lanes = await infrastructure_repo.get_all_lanes(db)
-        slots = await infrastructure_repo.get_slots_by_schedule(db, schedule.id)
-        
-        # 3. Get already occupied cells (Paid or non-expired Pending)
-        occupied = await booking_repo.get_occupied_slots(db, booking_date)
-        # 'occupied' will be a set of tuples {(lane_id, slot_id), ...}
+        slots_by_weekday = defaultdict(list)
+        for day_of_week, slot in await infrastructure_repo.get_slots_by_weekday(db):
+            slots_by_weekday[day_of_week].append(slot)
+        cells_by_date = defaultdict(list)
+        for cell in await booking_repo.get_occupied_cells_in_range(db, missing[0], missing[-1]):
+            cells_by_date[cell.booking_date].append(cell)
+
+        return self._iter_range_grids(days, cached, generations, lanes, slots_by_weekday, cells_by_date)
+
+    def _iter_range_grids(self, days, cached, generations, lanes, slots_by_weekday, cells_by_date):
+        slot_times = {}
+        for day in days:
+            grid = cached[day]
+            if grid is None:
+                grid, next_expiry = self._build_grid(
+                    lanes, slots_by_weekday[day.weekday()], cells_by_date[day], slot_times
+                )
+                self.availability_cache.store(day, grid, generations[day], expires_at=next_expiry)
+            yield day, grid
+
+    def _build_grid(self, lanes, slots, cells, slot_times: dict):
+        """Formats one date's grid from its lanes, schedule slots and active cells."""
+        if not slots:
+            return [], None
+
+        occupancy = OccupancyMap.from_cells(
+            [s.id for s in slots], ((cell.lane_id, cell.price_slot_id) for cell in cells)
+        )
+        next_expiry = min((cell.hold_expires_at for cell in cells if cell.hold_expires_at), default=None)
+
+        slot_meta = []
+        for s in slots:
+            slot_time = slot_times.get(s.id)
+            if slot_time is None:
+                slot_time = f"{s.start_time.strftime('%H:%M')}-{s.end_time.strftime('%H:%M')}"
+                slot_times[s.id] = slot_time
+            slot_meta.append((s.id, slot_time, s.price))
 
-        # 4. Format for the frontend
         grid = []
         for lane in lanes:
-            lane_data = {
+            row = occupancy.row(lane.id)
+            grid.append({
                 "lane_id": lane.id,
                 "lane_number": lane.number,
                 "type": lane.type,
                 "slots": [
                     {
-                        "slot_id": s.id,
-                        "time": f"{s.start_time.strftime('%H:%M')}-{s.end_time.strftime('%H:%M')}",
-                        "price": s.price,
-                        "available": (lane.id, s.id) not in occupied
-                    } for s in slots
+                        "slot_id": slot_id,
+                        "time": slot_time,
+                        "price": price,
+                        "available": not (row >> i) & 1
+                    } for i, (slot_id, slot_time, price) in enumerate(slot_meta)
                 ]
-            }
-            grid.append(lane_data)
-        return grid
+            })
+        return grid, next_expiry
 
-infrastructure_service = InfrastructureService()
\ No newline at end of file
+infrastructure_service = InfrastructureService()
@@ -0,0 +1,125 @@
+import asyncio
+from datetime import date
+from typing import AsyncIterator, Optional
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.core.events import AVAILABILITY_CHANGED, SCHEDULE_CHANGED, event_bus
+from app.core.hub import RESYNC, Hub
+from app.core.logging_config import get_logger
+from app.services.infrastructure_service import infrastructure_service
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+def _layout(grid: list) -> list:
+    """Everything in a grid except availability."""
+    return [
+        (lane["lane_id"], lane["lane_number"], lane["type"], [(s["slot_id"], s["time"], s["price"]) for s in lane["slots"]])
+        for lane in grid
+    ]
+
+def grid_diff(old: Optional[list], new: list) -> Optional[dict]:
+    """
+    The message that turns grid `old` into `new`: a "diff" listing the cells
+    whose availability changed, a full "grid" if lanes, slots or prices changed
+    too, or None if nothing did.
+    """
+    if old is None or _layout(old) != _layout(new):
+        return {"type": "grid", "grid": new}
+    cells = [
+        {"lane_id": new_lane["lane_id"], "slot_id": new_slot["slot_id"], "available": new_slot["available"]}
+        for old_lane, new_lane in zip(old, new)
+        for old_slot, new_slot in zip(old_lane["slots"], new_lane["slots"])
+        if old_slot["available"] != new_slot["available"]
+    ]
+    return {"type": "diff", "cells": cells} if cells else None
+
+
+class LiveAvailabilityService:
+    """
+    Pushes availability changes to clients subscribed to a date.
+
+    Committed reservations, payments, cancellations and expired holds invalidate
+    the date's grid (AVAILABILITY_CHANGED). If the date has subscribers, the grid
+    is rebuilt once per burst of changes, compared with the last one pushed, and
+    only the difference is fanned out through the hub. Rebuilt grids also refill
+    the availability cache used by polling clients.
+
+    The hub lives in the process: clients see the changes made by the worker
+    they are connected to.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.hub = Hub(queue_size=settings.LIVE_AVAILABILITY_QUEUE_SIZE)
+        # Last grid pushed per subscribed date; diffs are computed against it
+        self.snapshots: dict[date, list] = {}
+        self._dirty: set[date] = set()
+        self._refreshes: dict[date, asyncio.Task] = {}
+        event_bus.subscribe(AVAILABILITY_CHANGED, self.on_availability_changed)
+        event_bus.subscribe(SCHEDULE_CHANGED, self.on_schedule_changed)
+
+    def on_availability_changed(self, booking_date: date, **_):
+        if self.hub.has_subscribers(booking_date):
+            self._schedule_refresh(booking_date)
+
+    def on_schedule_changed(self, **_):
+        for booking_date in self.hub.topics():
+            self._schedule_refresh(booking_date)
+
+    def _schedule_refresh(self, booking_date: date):
+        self._dirty.add(booking_date)
+        if booking_date not in self._refreshes:
+            self._refreshes[booking_date] = asyncio.create_task(self._refresh(booking_date))
+
+    async def _refresh(self, booking_date: date):
+        """Rebuilds and pushes the date's grid until no change is left; one task per date keeps pushes in order."""
+        try:
+            while booking_date in self._dirty:
+                await asyncio.sleep(settings.LIVE_AVAILABILITY_DEBOUNCE_SECONDS)
+                # Changes committed while the grid is rebuilt start another round
+                self._dirty.discard(booking_date)
+                grid = await self._load(booking_date)
+                if not self.hub.has_subscribers(booking_date):
+                    break
+                message = grid_diff(self.snapshots.get(booking_date), grid)
+                self.snapshots[booking_date] = grid
+                if message:
+                    self.hub.publish(booking_date, message)
+        except Exception:
+            logger.exception("Failed to push availability changes for %s", booking_date)
+        finally:
+            self._dirty.discard(booking_date)
+            del self._refreshes[booking_date]
+
+    async def _load(self, booking_date: date) -> list:
+        async with self.session_factory() as db:
+            return await infrastructure_service.get_grid_availability(db, booking_date)
+
+    async def _snapshot(self, booking_date: date) -> list:
+        grid = self.snapshots.get(booking_date)
+        if grid is None:
+            grid = self.snapshots.setdefault(booking_date, await self._load(booking_date))
+        return grid
+
+    async def stream(self, booking_date: date) -> AsyncIterator[Optional[dict]]:
+        """
+        Messages for one client of `booking_date`: the full grid first, then diffs
+        as changes are committed. A client that falls behind gets the full grid
+        again instead of its backlog. None is yielded after
+        LIVE_AVAILABILITY_HEARTBEAT_SECONDS without news, for keep-alives.
+        """
+        subscription = self.hub.subscribe(booking_date)
+        try:
+            yield {"type": "grid", "grid": await self._snapshot(booking_date)}
+            while True:
+                message = await subscription.get(timeout=settings.LIVE_AVAILABILITY_HEARTBEAT_SECONDS)
+                if message is RESYNC:
+                    message = {"type": "grid", "grid": await self._snapshot(booking_date)}
+                yield message
+        finally:
+            subscription.close()
+            if not self.hub.has_subscribers(booking_date):
+                self.snapshots.pop(booking_date, None)
+
+live_service = LiveAvailabilityService()
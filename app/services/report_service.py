@@ -0,0 +1,113 @@
+from datetime import date
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.events import SCHEDULE_CHANGED, event_bus
+from app.models.enums import BookingStatus
+from app.repositories.booking_repository import booking_repo
+from app.repositories.infrastructure_repository import infrastructure_repo
+
+settings = get_settings()
+
+def _lookup(ids: list[int]) -> np.ndarray:
+    """Array mapping an ID to its position in `ids`, -1 for unknown IDs."""
+    lookup = np.full(max(ids, default=0) + 1, -1, dtype=np.int64)
+    lookup[ids] = np.arange(len(ids))
+    return lookup
+
+def _index(lookup: np.ndarray, ids) -> np.ndarray:
+    ids = np.fromiter(ids, dtype=np.int64)
+    known = ids < len(lookup)
+    return np.where(known, lookup[np.where(known, ids, 0)], -1)
+
+class ReportService:
+    def __init__(self):
+        self.heatmap_cache: TTLCache[dict] = TTLCache(
+            maxsize=settings.REPORT_CACHE_MAX_ENTRIES,
+            ttl=settings.REPORT_CACHE_TTL_SECONDS
+        )
+        # Capacity depends on which slots each weekday has
+        event_bus.subscribe(SCHEDULE_CHANGED, self.on_schedule_changed)
+
+    def on_schedule_changed(self, **_):
+        self.heatmap_cache.clear()
+
+    async def get_occupancy_heatmap(self, db: AsyncSession, start_date: date, end_date: date) -> dict:
+        """
+        Lane × time-of-day × weekday occupancy over [start_date, end_date].
+
+        Booked cells are streamed as plain columns and counted with a single
+        np.bincount per partition into dense (weekday, lane, time) matrices:
+        `paid` and `pending` (live holds). `capacity[weekday][time]` is how many
+        dates of the range offer that slot, according to the current DayConfig,
+        and `utilization` is paid / capacity. Results are cached per range.
+        """
+        days_count = (end_date - start_date).days + 1
+        if days_count < 1 or days_count > settings.STATS_MAX_RANGE_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The date range must span between 1 and {settings.STATS_MAX_RANGE_DAYS} days."
+            )
+
+        cached = self.heatmap_cache.get((start_date, end_date))
+        if cached is not None:
+            return cached
+
+        lanes = await infrastructure_repo.get_all_lanes(db)
+        slots = await infrastructure_repo.get_all_slots(db)
+        slots_by_weekday = await infrastructure_repo.get_slots_by_weekday(db)
+
+        times = sorted({slot.start_time for slot in slots})
+        time_positions = {start_time: i for i, start_time in enumerate(times)}
+        lane_lookup = _lookup([lane.id for lane in lanes])
+        # Slot ID -> time-of-day column; slots of different schedules share columns
+        time_lookup = np.full(max((slot.id for slot in slots), default=0) + 1, -1, dtype=np.int64)
+        for slot in slots:
+            time_lookup[slot.id] = time_positions[slot.start_time]
+
+        shape = (2, 7, len(lanes), len(times)) # (paid/pending, weekday, lane, time)
+        counts = np.zeros(int(np.prod(shape)), dtype=np.int64)
+
+        result = await booking_repo.stream_active_cells(
+            db, start_date, end_date, settings.REPORT_STREAM_PARTITION_SIZE
+        )
+        async for partition in result.partitions():
+            booking_dates, lane_ids, slot_ids, statuses = zip(*partition)
+            # date.toordinal() is 1 for Monday 0001-01-01, so this is date.weekday()
+            weekday = (np.fromiter((d.toordinal() for d in booking_dates), dtype=np.int64) - 1) % 7
+            lane = _index(lane_lookup, lane_ids)
+            time_of_day = _index(time_lookup, slot_ids)
+            pending = np.fromiter((s != BookingStatus.PAID for s in statuses), dtype=np.int64)
+
+            known = (lane >= 0) & (time_of_day >= 0)
+            flat = np.ravel_multi_index((pending[known], weekday[known], lane[known], time_of_day[known]), shape)
+            counts += np.bincount(flat, minlength=counts.size)
+
+        paid, held = counts.reshape(shape)
+
+        offered = np.zeros((7, len(times)), dtype=bool)
+        for day_of_week, slot in slots_by_weekday:
+            offered[day_of_week, time_positions[slot.start_time]] = True
+        range_weekdays = (np.arange(start_date.toordinal(), end_date.toordinal() + 1) - 1) % 7
+        capacity = np.bincount(range_weekdays, minlength=7)[:, None] * offered
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            utilization = np.where(capacity[:, None, :] > 0, paid / capacity[:, None, :], 0.0)
+
+        heatmap = {
+            "start": start_date,
+            "end": end_date,
+            "weekdays": list(range(7)),
+            "lanes": [{"lane_id": lane.id, "lane_number": lane.number} for lane in lanes],
+            "times": [start_time.strftime("%H:%M") for start_time in times],
+            "capacity": capacity.tolist(),
+            "paid": paid.tolist(),
+            "pending": held.tolist(),
+            "utilization": np.round(utilization, 4).tolist(),
+        }
+        self.heatmap_cache.set((start_date, end_date), heatmap)
+        return heatmap
+
+report_service = ReportService()
@@ -0,0 +1,123 @@
+from typing import List
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.events import SCHEDULE_CHANGED, event_bus
+from app.core.logging_config import get_logger
+from app.repositories.infrastructure_repository import infrastructure_repo
+from app.schemas.infrastructure import PriceAdjustment, PriceSlotWrite
+
+logger = get_logger(__name__)
+
+class ScheduleService:
+    """
+    Owner-facing bulk changes to schedules and prices. Each operation is a few
+    set-based statements in one transaction, followed by a SCHEDULE_CHANGED event
+    so in-process caches built from slots and prices are dropped.
+    """
+
+    async def _get_schedule_or_404(self, db: AsyncSession, schedule_id: int):
+        schedule = await infrastructure_repo.get_schedule(db, schedule_id)
+        if not schedule:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        return schedule
+
+    async def _commit_and_publish(self, db: AsyncSession, schedule_id: int | None):
+        await db.commit()
+        event_bus.publish(SCHEDULE_CHANGED, schedule_id=schedule_id)
+
+    async def replace_slots(self, db: AsyncSession, schedule_id: int, slots: List[PriceSlotWrite]):
+        """
+        Makes `slots` the schedule's complete set of price slots: listed slots with
+        an ID are updated, those without are created and unlisted ones deleted.
+        Slots that bookings refer to cannot be deleted. Slots held by active
+        booking items can be re-priced but not re-timed, since that would change
+        what those bookings hold.
+        """
+        await self._get_schedule_or_404(db, schedule_id)
+
+        listed_ids = [slot.id for slot in slots if slot.id is not None]
+        if len(set(listed_ids)) != len(listed_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Each slot ID can be listed only once."
+            )
+
+        ordered = sorted(slots, key=lambda slot: slot.start_time)
+        for i, slot in enumerate(ordered):
+            if slot.start_time >= slot.end_time or (i and ordered[i - 1].end_time > slot.start_time):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Slots must have a positive duration and must not overlap."
+                )
+
+        existing = await infrastructure_repo.get_slot_times_by_schedule(db, schedule_id)
+        existing_ids = set(existing)
+        kept_ids = set(listed_ids)
+        if not kept_ids <= existing_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Slots {sorted(kept_ids - existing_ids)} do not belong to this schedule."
+            )
+
+        retimed_ids = [
+            slot.id for slot in slots
+            if slot.id is not None and existing[slot.id] != (slot.start_time, slot.end_time)
+        ]
+        held = await infrastructure_repo.get_booked_slot_ids(db, retimed_ids, active_only=True)
+        if held:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Slots {sorted(held)} have active bookings and cannot be re-timed."
+            )
+
+        removed_ids = list(existing_ids - kept_ids)
+        booked = await infrastructure_repo.get_booked_slot_ids(db, removed_ids)
+        if booked:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Slots {sorted(booked)} have bookings and cannot be removed."
+            )
+
+        await infrastructure_repo.update_slots(
+            db, [slot.model_dump() for slot in slots if slot.id is not None]
+        )
+        await infrastructure_repo.delete_slots(db, removed_ids)
+        await infrastructure_repo.insert_slots(
+            db, schedule_id, [slot.model_dump(exclude={"id"}) for slot in slots if slot.id is None]
+        )
+        await self._commit_and_publish(db, schedule_id)
+        logger.info("Replaced the slots of schedule %s (%s slots, %s removed)", schedule_id, len(slots), len(removed_ids))
+        return await infrastructure_repo.get_slots_by_schedule(db, schedule_id)
+
+    async def assign_days(self, db: AsyncSession, schedule_id: int, days: List[int]):
+        """Makes the schedule apply on the given weekdays (0=Monday). Other days are unchanged."""
+        await self._get_schedule_or_404(db, schedule_id)
+        if len(set(days)) != len(days) or not all(0 <= day <= 6 for day in days):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Days must be distinct values between 0 (Monday) and 6 (Sunday)."
+            )
+
+        assigned = await infrastructure_repo.assign_days(db, schedule_id, days)
+        await self._commit_and_publish(db, schedule_id)
+        logger.info("Schedule %s now applies on days %s", schedule_id, assigned)
+        return {"schedule_id": schedule_id, "days": assigned}
+
+    async def adjust_prices(self, db: AsyncSession, adjustment: PriceAdjustment):
+        if adjustment.schedule_id is not None:
+            await self._get_schedule_or_404(db, adjustment.schedule_id)
+
+        updated = await infrastructure_repo.adjust_prices(db, adjustment.percent, adjustment.schedule_id)
+        await self._commit_and_publish(db, adjustment.schedule_id)
+        logger.info("Adjusted %s slot prices by %s%%", updated, adjustment.percent)
+        return {"updated": updated}
+
+    async def update_slot_price(self, db: AsyncSession, slot_id: int, new_price: float):
+        if new_price < 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Price cannot be negative.")
+        if not await infrastructure_repo.update_slot_price(db, slot_id, new_price):
+            raise HTTPException(status_code=404, detail="Price slot not found")
+        await self._commit_and_publish(db, None)
+        return {"slot_id": slot_id, "price": new_price}
+
+schedule_service = ScheduleService()
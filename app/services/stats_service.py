@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.core.logging_config import get_logger
+from app.repositories.stats_repository import MEASURE_COLUMNS, stats_repo
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+def _measures(row) -> dict:
+    values = {column: getattr(row, column) or 0 for column in MEASURE_COLUMNS}
+    values["revenue"] = round(values["revenue"], 2)
+    return values
+
+class StatsService:
+    async def get_stats(self, db: AsyncSession, start_date: Optional[date], end_date: Optional[date]):
+        """Sales and occupancy over [start_date, end_date] (default: the last 30 days), from the daily rollup."""
+        end_date = end_date or date.today()
+        start_date = start_date or end_date - timedelta(days=29)
+        days_count = (end_date - start_date).days + 1
+        if days_count < 1 or days_count > settings.STATS_MAX_RANGE_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The date range must span between 1 and {settings.STATS_MAX_RANGE_DAYS} days."
+            )
+
+        days = [
+            {"date": row.stat_date, **_measures(row)}
+            for row in await stats_repo.get_daily_totals(db, start_date, end_date)
+        ]
+        lanes = [
+            {"lane_id": row.lane_id, **_measures(row)}
+            for row in await stats_repo.get_lane_totals(db, start_date, end_date)
+        ]
+        totals = {column: sum(day[column] for day in days) for column in MEASURE_COLUMNS}
+        totals["revenue"] = round(totals["revenue"], 2)
+        return {"start": start_date, "end": end_date, "totals": totals, "days": days, "lanes": lanes}
+
+    async def rebuild(self, db: AsyncSession, start_date: date, end_date: date, batch_days: int = 31) -> int:
+        """
+        Recomputes the rollup from the booking history, `batch_days` at a time with
+        one commit per batch, so it can run against a live database. Returns the
+        number of batches.
+        """
+        batches = 0
+        batch_start = start_date
+        while batch_start <= end_date:
+            batch_end = min(batch_start + timedelta(days=batch_days - 1), end_date)
+            await stats_repo.rebuild(db, batch_start, batch_end)
+            await db.commit()
+            logger.info("Rebuilt daily stats for %s to %s", batch_start, batch_end)
+            batch_start = batch_end + timedelta(days=1)
+            batches += 1
+        return batches
+
+stats_service = StatsService()
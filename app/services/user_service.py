@@ -1,8 +1,15 @@
 from datetime import timedelta
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.user_repository import user_repository
-from app.core.security import get_password_hash, verify_password, create_access_token, decode_token
+from app.core.security import (
+    get_password_hash_async,
+    verify_password_async,
+    create_access_token,
+    decode_token,
+    invalidate_user_tokens
+)
 from app.schemas.user import UserCreate, Token
 from app.models.enums import UserRole
 from app.models.user import User
@@ -14,17 +21,17 @@ logger = get_logger(__name__)
 class UserService:
     async def register_user(self, db: AsyncSession, user_in: UserCreate) -> User:
         """Registers a new user in the system after verifying for duplicates."""
-        logger.info(f"Attempting to register new user with email: {user_in.email}")
+        logger.info("Attempting to register new user with email: %s", user_in.email)
         
         user_exists = await user_repository.get_by_email(db, email=user_in.email)
         if user_exists:
-            logger.warning(f"Registration failed: User with email {user_in.email} already exists.")
+            logger.warning("Registration failed: User with email %s already exists.", user_in.email)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="The email address is already registered."
             )
         
-        hashed_pw = get_password_hash(user_in.password)
+        hashed_pw = await get_password_hash_async(user_in.password)
         db_user = User(
             email=user_in.email,
             hashed_password=hashed_pw,
@@ -33,16 +40,16 @@ class UserService:
         )
         
         user = await user_repository.create(db, obj_in=db_user)
-        logger.info(f"User registered successfully: {user.email} (ID: {user.id})")
+        logger.info("User registered successfully: %s (ID: %s)", user.email, user.id)
         return user
 
     async def authenticate(self, db: AsyncSession, email: str, password: str) -> Token:
         """Validates credentials and generates the JWT token."""
-        logger.info(f"Authentication attempt for email: {email}")
+        logger.info("Authentication attempt for email: %s", email)
         user = await user_repository.get_by_email(db, email=email)
         
-        if not user or not verify_password(password, user.hashed_password):
-            logger.warning(f"Failed login attempt for email: {email}")
+        if not user or not await verify_password_async(password, user.hashed_password):
+            logger.warning("Failed login attempt for email: %s", email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -50,7 +57,7 @@ class UserService:
             )
         
         access_token = create_access_token(data={"sub": str(user.id)})
-        logger.info(f"User authenticated successfully: {email} (ID: {user.id})")
+        logger.info("User authenticated successfully: %s (ID: %s)", email, user.id)
         return Token(
             access_token=access_token,
             token_type="bearer"
@@ -60,18 +67,36 @@ class UserService:
         """Retrieves the profile information of the logged-in user."""
         user = await user_repository.get(db, user_id)
         if not user:
-            logger.error(f"User profile not found for ID: {user_id}")
+            logger.error("User profile not found for ID: %s", user_id)
             raise HTTPException(status_code=404, detail="User not found")
         return user
 
+    async def list_users(
+        self,
+        db: AsyncSession,
+        after: Optional[int] = None,
+        limit: int = 100,
+        search: Optional[str] = None,
+        with_total: bool = False
+    ) -> Tuple[List[User], Optional[int], Optional[int]]:
+        """
+        One keyset page of users in ID order, optionally restricted to an email or
+        name prefix. Returns the users, the cursor of the next page and, if asked
+        for, an estimate of how many users match.
+        """
+        where = user_repository.prefix_filter(search) if search else ()
+        users, next_after = await user_repository.get_page(db, after=after, limit=limit, where=where)
+        total = await user_repository.estimate_count(db, where=where) if with_total else None
+        return users, next_after, total
+
     async def request_password_reset(self, db: AsyncSession, email: str):
         """Generates a reset token and sends an email."""
-        logger.info(f"Password reset requested for: {email}")
+        logger.info("Password reset requested for: %s", email)
         user = await user_repository.get_by_email(db, email=email)
         
         if not user:
             # We return OK even if user doesn't exist for security (avoid email harvesting)
-            logger.info(f"Password reset request ignored: {email} not found.")
+            logger.info("Password reset request ignored: %s not found.", email)
             return
 
         # Create a token valid for 15 minutes
@@ -83,11 +108,13 @@ class UserService:
         # In a real app, this link would point to your frontend
         reset_link = f"http://localhost:3000/reset-password?token={reset_token}"
         
-        await email_service.send_password_reset(
-            user.email, 
+        email_service.queue_password_reset(
+            db,
+            user.email,
             {"full_name": user.full_name, "reset_link": reset_link}
         )
-        logger.info(f"Password reset email sent to: {email}")
+        await db.commit()
+        logger.info("Password reset email queued for: %s", email)
 
     async def reset_password(self, db: AsyncSession, token: str, new_password: str):
         """Validates the token and updates the password."""
@@ -101,8 +128,9 @@ class UserService:
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await get_password_hash_async(new_password)
         await db.commit()
-        logger.info(f"Password reset successful for user ID: {user_id}")
+        invalidate_user_tokens(user.id)
+        logger.info("Password reset successful for user ID: %s", user_id)
 
 user_service = UserService()
\ No newline at end of file
@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+from datetime import date
+from sqlalchemy import func, select
+from app.core.database import AsyncSessionLocal
+from app.models.booking import Booking
+from app.services.stats_service import stats_service
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+async def backfill_stats(start: date | None, end: date | None, batch_days: int):
+    async with AsyncSessionLocal() as session:
+        if start is None or end is None:
+            first, last = (await session.execute(
+                select(func.min(Booking.booking_date), func.max(Booking.booking_date))
+            )).one()
+            if first is None:
+                logger.info("No bookings found, nothing to backfill.")
+                return
+            start = start or first
+            end = end or last
+
+        logger.info("Backfilling daily stats from %s to %s...", start, end)
+        batches = await stats_service.rebuild(session, start, end, batch_days=batch_days)
+
+    logger.info("Backfill completed in %s batches.", batches)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the daily stats rollup from the booking history.")
+    parser.add_argument("--start", type=date.fromisoformat, help="First date (default: earliest booking)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last date (default: latest booking)")
+    parser.add_argument("--batch-days", type=int, default=31, help="Dates recomputed per transaction")
+    args = parser.parse_args()
+    asyncio.run(backfill_stats(args.start, args.end, args.batch_days))
@@ -0,0 +1,371 @@
+"""
+Booking hot path benchmark.
+
+Seeds a realistic dataset (lanes, weekday and weekend schedules, thousands of
+users and hundreds of thousands of bookings) into a temporary SQLite database,
+or into the database given with --database-url, then drives the ASGI app
+in-process at the given concurrency:
+
+    availability     GET  /bookings/availability for random upcoming dates
+    reserve          POST /bookings/reserve of random upcoming cells
+    confirm_payment  POST /admin/confirm-payment of seeded PENDING bookings
+    login            POST /auth/login (bcrypt)
+
+Prints throughput and p50/p95/p99 latencies per scenario as JSON. With
+--baseline, the results are compared with an earlier run and the exit code is
+1 if any scenario got slower than --tolerance percent.
+
+    uv run python benchmarks/hot_paths.py --bookings 200000 --concurrency 32 --output run.json
+    uv run python benchmarks/hot_paths.py --baseline run.json
+
+--database-url (e.g. postgresql+asyncpg://...) drops and recreates every
+table of that database: only point it at a scratch database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+# Background workers and logging would add noise to the measurements. Reservation
+# conflicts are expected and log warnings to stdout, where the report goes.
+os.environ.setdefault("BOOKING_SWEEPER_ENABLED", "false")
+os.environ.setdefault("EMAIL_OUTBOX_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+# The login scenario measures bcrypt, not the rate limiter
+os.environ.setdefault("AUTH_RATE_LIMIT_IP_BURST", "1000000000")
+os.environ.setdefault("AUTH_RATE_LIMIT_EMAIL_BURST", "1000000000")
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.core.database import get_db
+from app.core.security import create_access_token, get_password_hash
+from app.main import app
+from app.models import Booking, BookingItem, BookingStatus, DayConfig, Lane, PriceSlot, Schedule, User, UserRole
+
+PASSWORD = "benchmarkpassword"
+SCENARIOS = ["availability", "reserve", "confirm_payment", "login"]
+# Latencies regress when they grow, throughput when it shrinks
+COMPARED_METRICS = {"p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "throughput_per_s": -1}
+INSERT_CHUNK = 5000
+
+
+def summarize(latencies: list[float], elapsed: float, statuses: dict[int, int]) -> dict:
+    summary = {
+        "requests": len(latencies),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        summary.update(
+            mean_ms=round(statistics.fmean(latencies) * 1000, 2),
+            p50_ms=round(cuts[49] * 1000, 2),
+            p95_ms=round(cuts[94] * 1000, 2),
+            p99_ms=round(cuts[98] * 1000, 2),
+            max_ms=round(max(latencies) * 1000, 2),
+        )
+    return summary
+
+
+async def _insert(session: AsyncSession, model, rows: list[dict]):
+    for start in range(0, len(rows), INSERT_CHUNK):
+        await session.execute(insert(model), rows[start:start + INSERT_CHUNK])
+
+
+async def seed(session_factory, args, rng: random.Random) -> dict:
+    """
+    Creates the dataset with bulk inserts and explicit IDs. Past bookings are
+    mostly PAID, upcoming ones a mix of PAID, PENDING (with a live hold) and
+    CANCELLED; a booking whose cells are already taken is stored as CANCELLED.
+    """
+    today = date.today()
+    async with session_factory() as session:
+        weekday, weekend = Schedule(name="Weekday"), Schedule(name="Weekend")
+        session.add_all([weekday, weekend])
+        session.add_all([Lane(number=str(n)) for n in range(1, args.lanes + 1)])
+        await session.flush()
+        hours = range(10, 23)
+        session.add_all([
+            PriceSlot(start_time=dt_time(h), end_time=dt_time(h + 1), price=price, schedule_id=schedule.id)
+            for schedule, price in ((weekday, 22.0), (weekend, 30.0))
+            for h in hours
+        ])
+        session.add_all([DayConfig(day_of_week=d, schedule_id=(weekday if d < 5 else weekend).id) for d in range(7)])
+        await session.flush()
+
+        lane_ids = list((await session.execute(text("SELECT id FROM lane ORDER BY id"))).scalars())
+        slot_rows = (await session.execute(text("SELECT id, schedule_id, price FROM priceslot ORDER BY schedule_id, start_time"))).all()
+        slots_by_schedule = {weekday.id: [], weekend.id: []}
+        for slot_id, schedule_id, price in slot_rows:
+            slots_by_schedule[schedule_id].append((slot_id, price))
+
+        hashed = get_password_hash(PASSWORD)
+        users = [
+            {"id": n, "email": f"bench{n}@example.com", "hashed_password": hashed, "full_name": f"Bench User {n}", "role": UserRole.USER}
+            for n in range(1, args.users + 1)
+        ]
+        users.append({"id": args.users + 1, "email": "cashier@example.com", "hashed_password": hashed, "full_name": "Bench Cashier", "role": UserRole.CASHIER})
+        await _insert(session, User, users)
+
+        bookings, items, taken, pending_ids = [], [], set(), []
+        now = datetime.utcnow()
+        for booking_id in range(1, args.bookings + 1):
+            booking_date = today + timedelta(days=rng.randint(-args.history_days, args.future_days))
+            slots = slots_by_schedule[(weekday if booking_date.weekday() < 5 else weekend).id]
+            length = rng.choice((1, 1, 2, 2, 3))
+            start = rng.randrange(len(slots) - length + 1)
+            chosen = slots[start:start + length]
+            lane_id = rng.choice(lane_ids)
+
+            if booking_date < today:
+                status = BookingStatus.PAID if rng.random() < 0.8 else BookingStatus.CANCELLED
+            else:
+                status = rng.choices(
+                    (BookingStatus.PAID, BookingStatus.PENDING, BookingStatus.CANCELLED), weights=(6, 2, 2)
+                )[0]
+            cells = [(booking_date, lane_id, slot_id) for slot_id, _ in chosen]
+            if status != BookingStatus.CANCELLED and taken.intersection(cells):
+                status = BookingStatus.CANCELLED
+            active = status != BookingStatus.CANCELLED
+            if active:
+                taken.update(cells)
+            if status == BookingStatus.PENDING:
+                pending_ids.append(booking_id)
+
+            bookings.append({
+                "id": booking_id,
+                "user_id": rng.randint(1, args.users),
+                "booking_date": booking_date,
+                "total_price": sum(price for _, price in chosen),
+                "status": status,
+                "created_at": now,
+                # Holds stay valid for the whole run
+                "expires_at": now + timedelta(days=1) if status == BookingStatus.PENDING else now,
+            })
+            items.extend(
+                {"booking_id": booking_id, "lane_id": lane_id, "price_slot_id": slot_id, "booking_date": booking_date, "active": active}
+                for slot_id, _ in chosen
+            )
+
+        await _insert(session, Booking, bookings)
+        await _insert(session, BookingItem, items)
+        if session.bind.dialect.name == "postgresql":
+            # Explicit IDs do not advance the sequences used by later inserts
+            for table in ("user", "booking"):
+                await session.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), (SELECT max(id) FROM \"{table}\"))"
+                ))
+        await session.commit()
+
+    return {
+        "lane_ids": lane_ids,
+        "slots_by_weekday": {d: [s for s, _ in slots_by_schedule[(weekday if d < 5 else weekend).id]] for d in range(7)},
+        "user_ids": list(range(1, args.users + 1)),
+        "cashier_id": args.users + 1,
+        "pending_ids": pending_ids,
+        "sizes": {"lanes": args.lanes, "users": args.users, "bookings": len(bookings), "booking_items": len(items)},
+    }
+
+
+def build_requests(scenario: str, data: dict, args, rng: random.Random):
+    """Returns a function that sends the next request of the scenario, or None once there is nothing left to send."""
+    today = date.today()
+    tokens = {}
+
+    def auth(user_id: int) -> dict:
+        if user_id not in tokens:
+            tokens[user_id] = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)}, timedelta(hours=2))}"}
+        return tokens[user_id]
+
+    def upcoming_date() -> date:
+        return today + timedelta(days=rng.randint(1, args.future_days))
+
+    if scenario == "availability":
+        return lambda client: client.get("/api/v1/bookings/availability", params={"booking_date": str(upcoming_date())})
+
+    if scenario == "reserve":
+        def reserve(client):
+            booking_date = upcoming_date()
+            slot_ids = data["slots_by_weekday"][booking_date.weekday()]
+            start = rng.randrange(len(slot_ids) - 1)
+            return client.post(
+                "/api/v1/bookings/reserve",
+                json={
+                    "booking_date": str(booking_date),
+                    "selected_slots": slot_ids[start:start + rng.choice((1, 2))],
+                    "lane_id": rng.choice(data["lane_ids"]),
+                },
+                headers=auth(rng.choice(data["user_ids"]))
+            )
+        return reserve
+
+    if scenario == "confirm_payment":
+        pending = list(data["pending_ids"])
+        rng.shuffle(pending)
+        def confirm(client):
+            if not pending:
+                return None
+            return client.post(f"/api/v1/admin/confirm-payment/{pending.pop()}", headers=auth(data["cashier_id"]))
+        return confirm
+
+    if scenario == "login":
+        return lambda client: client.post(
+            "/api/v1/auth/login",
+            data={"username": f"bench{rng.choice(data['user_ids'])}@example.com", "password": PASSWORD}
+        )
+
+    raise ValueError(f"Unknown scenario {scenario}")
+
+
+async def run_scenario(client: AsyncClient, send, total: int, concurrency: int) -> dict:
+    latencies, statuses = [], {}
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            request = send(client)
+            if request is None:
+                return
+            started = time.perf_counter()
+            response = await request
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, statuses)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> tuple[dict, list[str]]:
+    """Relative change of each compared metric against the baseline, and the metrics that got worse than `tolerance` percent."""
+    comparison, regressions = {}, []
+    for scenario, current in results.items():
+        previous = baseline.get("results", {}).get(scenario)
+        if not previous:
+            continue
+        comparison[scenario] = {}
+        for metric, direction in COMPARED_METRICS.items():
+            if not previous.get(metric) or metric not in current:
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric] * 100
+            comparison[scenario][metric] = {
+                "baseline": previous[metric], "current": current[metric], "change_pct": round(change, 1)
+            }
+            if change * direction > tolerance:
+                regressions.append(f"{scenario}.{metric}")
+    return comparison, regressions
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(args.database_url or f"sqlite+aiosqlite:///{tmp}/bench.db")
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+        started = time.perf_counter()
+        data = await seed(session_factory, args, rng)
+        seed_seconds = time.perf_counter() - started
+
+        async def override_get_db():
+            async with session_factory() as session:
+                yield session
+                await session.commit()
+
+        app.dependency_overrides[get_db] = override_get_db
+        results = {}
+        try:
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://bench") as client:
+                for scenario in args.scenarios:
+                    total = args.login_requests if scenario == "login" else args.requests
+                    send = build_requests(scenario, data, args, rng)
+                    await run_scenario(client, send, min(args.warmup, total), args.concurrency)
+                    results[scenario] = await run_scenario(client, send, total, args.concurrency)
+        finally:
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "dataset": data["sizes"],
+            "seed_seconds": round(seed_seconds, 2),
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="async SQLAlchemy URL of a scratch database (default: temporary SQLite)")
+    parser.add_argument("--lanes", type=int, default=32)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--bookings", type=int, default=200000)
+    parser.add_argument("--history-days", type=int, default=365, help="days of past bookings")
+    parser.add_argument("--future-days", type=int, default=60, help="days of upcoming bookings and requests")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=200, help="measured requests of the login scenario")
+    parser.add_argument("--warmup", type=int, default=100, help="unmeasured requests before each scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight at once")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the dataset and requests")
+    parser.add_argument("--output", type=Path, help="also write the JSON report to this file")
+    parser.add_argument("--baseline", type=Path, help="JSON report of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        for key in ("database", "concurrency", "dataset"):
+            if baseline.get("meta", {}).get(key) != report["meta"][key]:
+                print(f"warning: {key} differs from the baseline run", file=sys.stderr)
+        report["comparison"], regressions = compare(report["results"], baseline, args.tolerance)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Login burst benchmark.
+
+Measures /bookings/availability latency on its own and while a burst of
+concurrent /auth/login requests is running, with the ASGI app driven
+in-process over a temporary SQLite database. Prints the result as JSON.
+
+    uv run python benchmarks/login_burst.py --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, time as dt_time, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+# App and httpx logs go to stdout, where the report is printed
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+# The burst repeats one account, which the auth rate limiter would reject
+os.environ.setdefault("AUTH_RATE_LIMIT_IP_BURST", "1000000000")
+os.environ.setdefault("AUTH_RATE_LIMIT_EMAIL_BURST", "1000000000")
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.core.database import get_db
+from app.core.security import get_password_hash
+from app.main import app
+from app.models import DayConfig, Lane, PriceSlot, Schedule, User
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchmarkpassword"
+
+
+def summarize(latencies: list[float]) -> dict:
+    if len(latencies) < 2:
+        return {"count": len(latencies)}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "count": len(latencies),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p95_ms": round(cuts[94] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+    }
+
+
+async def seed(session_factory):
+    async with session_factory() as session:
+        schedule = Schedule(name="Benchmark")
+        session.add(schedule)
+        session.add_all([Lane(number=str(n)) for n in range(1, 41)])
+        await session.flush()
+        session.add_all([
+            PriceSlot(start_time=dt_time(h), end_time=dt_time(h + 1), price=25.0, schedule_id=schedule.id)
+            for h in range(10, 23)
+        ])
+        session.add_all([DayConfig(day_of_week=d, schedule_id=schedule.id) for d in range(7)])
+        session.add(User(email=EMAIL, hashed_password=get_password_hash(PASSWORD), full_name="Bench"))
+        await session.commit()
+
+
+async def availability_loop(client: AsyncClient, stop: asyncio.Event, latencies: list[float]):
+    booking_date = str(date.today() + timedelta(days=1))
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/v1/bookings/availability", params={"booking_date": booking_date})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def login_burst(client: AsyncClient, total: int, concurrency: int, latencies: list[float]) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def login():
+        nonlocal rejected
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/api/v1/auth/login", data={"username": EMAIL, "password": PASSWORD})
+            if response.status_code == 503:
+                rejected += 1
+            else:
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(login() for _ in range(total)))
+    return rejected
+
+
+async def run(args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        await seed(session_factory)
+
+        async def override_get_db():
+            async with session_factory() as session:
+                yield session
+                await session.commit()
+
+        app.dependency_overrides[get_db] = override_get_db
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Phase 1: availability alone
+            baseline, stop = [], asyncio.Event()
+            readers = [asyncio.create_task(availability_loop(client, stop, baseline)) for _ in range(args.readers)]
+            await asyncio.sleep(args.baseline_seconds)
+            stop.set()
+            await asyncio.gather(*readers)
+
+            # Phase 2: availability while a login burst is running
+            during, logins, stop = [], [], asyncio.Event()
+            readers = [asyncio.create_task(availability_loop(client, stop, during)) for _ in range(args.readers)]
+            started = time.perf_counter()
+            rejected = await login_burst(client, args.logins, args.concurrency, logins)
+            elapsed = time.perf_counter() - started
+            stop.set()
+            await asyncio.gather(*readers)
+
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+    return {
+        "availability_baseline": summarize(baseline),
+        "availability_during_login_burst": summarize(during),
+        "login": {
+            **summarize(logins),
+            "rejected_503": rejected,
+            "throughput_per_s": round(len(logins) / elapsed, 2),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100, help="total login requests in the burst")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent login requests")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent availability clients")
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -52,7 +52,7 @@ async def seed_users():
             existing_user = results.scalar_one_or_none()
 
             if not existing_user:
-                logger.info(f"Creating user: {user_data['full_name']} ({user_data['role']})")
+                logger.info("Creating user: %s (%s)", user_data['full_name'], user_data['role'])
                 new_user = User(
                     full_name=user_data["full_name"],
                     email=user_data["email"],
@@ -61,7 +61,7 @@ async def seed_users():
                 )
                 session.add(new_user)
             else:
-                logger.info(f"User {user_data['email']} already exists, skipping.")
+                logger.info("User %s already exists, skipping.", user_data['email'])
         
         await session.commit()
     
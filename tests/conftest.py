@@ -5,8 +5,15 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
+from datetime import time
+
 from app.main import app
 from app.core.database import get_db
+from app.core.rate_limit import auth_rate_limiter
+from app.core.security import create_access_token, token_cache
+from app.models import User, UserRole, Lane, Schedule, DayConfig, PriceSlot
+from app.services.infrastructure_service import infrastructure_service
+from app.services.report_service import report_service
 
 # Use an in-memory SQLite database for testing
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -20,6 +27,10 @@ TestingSessionLocal = sessionmaker(
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+    infrastructure_service.availability_cache.clear()
+    report_service.heatmap_cache.clear()
+    token_cache.clear()
+    auth_rate_limiter.backend.clear()
     yield
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.drop_all)
@@ -40,3 +51,36 @@ async def client(db_session):
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
+
+@pytest.fixture
+async def infrastructure(db_session):
+    """Two lanes and a three-slot schedule that applies to every day of the week."""
+    lanes = [Lane(number="1"), Lane(number="2")]
+    schedule = Schedule(name="All Week")
+    db_session.add_all(lanes + [schedule])
+    await db_session.flush()
+
+    slots = [
+        PriceSlot(start_time=time(hour), end_time=time(hour + 1), price=20.0, schedule_id=schedule.id)
+        for hour in (18, 19, 20)
+    ]
+    db_session.add_all(slots)
+    db_session.add_all([DayConfig(day_of_week=day, schedule_id=schedule.id) for day in range(7)])
+    await db_session.commit()
+    return {"lanes": lanes, "schedule": schedule, "slots": slots}
+
+@pytest.fixture
+def auth_headers(db_session):
+    """Factory that creates a user with the given role and returns its Authorization header."""
+    async def _auth_headers(role: UserRole = UserRole.USER, email: str | None = None):
+        user = User(
+            email=email or f"{role.value.lower()}@example.com",
+            hashed_password="pw",
+            full_name=f"{role.value.title()} User",
+            role=role
+        )
+        db_session.add(user)
+        await db_session.commit()
+        token = create_access_token(data={"sub": str(user.id)})
+        return {"Authorization": f"Bearer {token}"}
+    return _auth_headers
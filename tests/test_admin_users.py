@@ -0,0 +1,45 @@
+import pytest
+from app.models import User, UserRole
+
+@pytest.fixture
+async def customers(db_session):
+    db_session.add_all([
+        User(email="ada@example.com", hashed_password="pw", full_name="Ada Lovelace"),
+        User(email="alan@example.com", hashed_password="pw", full_name="Alan Turing"),
+        User(email="grace@example.com", hashed_password="pw", full_name="Grace Hopper"),
+        User(email="a_b@example.com", hashed_password="pw", full_name="Underscore"),
+    ])
+    await db_session.commit()
+
+@pytest.mark.asyncio
+async def test_list_users_pages_with_cursor(client, customers, auth_headers):
+    headers = await auth_headers(UserRole.OWNER)
+
+    emails, params = [], {"limit": 2, "with_total": "true"}
+    while True:
+        response = await client.get("/api/v1/admin/users", params=params, headers=headers)
+        assert response.status_code == 200
+        assert response.headers["x-total-count-estimate"] == "5"
+        emails += [u["email"] for u in response.json()]
+        if "x-next-cursor" not in response.headers:
+            break
+        params["after"] = response.headers["x-next-cursor"]
+
+    assert emails == [
+        "ada@example.com", "alan@example.com", "grace@example.com", "a_b@example.com", "owner@example.com"
+    ]
+
+@pytest.mark.asyncio
+async def test_list_users_prefix_search(client, customers, auth_headers):
+    headers = await auth_headers(UserRole.OWNER)
+
+    async def search(q):
+        response = await client.get("/api/v1/admin/users", params={"q": q, "with_total": "true"}, headers=headers)
+        return [u["email"] for u in response.json()], response.headers["x-total-count-estimate"]
+
+    assert await search("AL") == (["alan@example.com"], "1")
+    # Matches the start of the name as well as the email
+    assert await search("grace h") == (["grace@example.com"], "1")
+    # LIKE wildcards are matched literally
+    assert await search("a_") == (["a_b@example.com"], "1")
+    assert await search("lovelace") == ([], "0")
@@ -1,4 +1,8 @@
 import pytest
+from app.core import security
+from app.core.rate_limit import settings
+from app.core.security import token_cache, password_executor
+from app.models.enums import UserRole
 
 @pytest.mark.asyncio
 async def test_register_user(client):
@@ -40,3 +44,75 @@ async def test_login_user(client):
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
+
+@pytest.mark.asyncio
+async def test_authenticated_user_is_cached_until_updated(client, auth_headers):
+    headers = await auth_headers(UserRole.OWNER)
+
+    response = await client.get("/api/v1/admin/users", headers=headers)
+    assert response.status_code == 200
+    owner_id = response.json()[0]["id"]
+    hits = token_cache.hits
+
+    response = await client.get("/api/v1/admin/users", headers=headers)
+    assert response.status_code == 200
+    assert token_cache.hits == hits + 1
+
+    # Demoting the owner must take effect on the very next request
+    response = await client.patch(f"/api/v1/admin/users/{owner_id}", json={"role": "USER"}, headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get("/api/v1/admin/users", headers=headers)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_login_returns_503_when_hashing_pool_is_saturated(client, monkeypatch):
+    await client.post(
+        "/api/v1/auth/register",
+        json={"email": "busy@example.com", "password": "securepassword", "full_name": "Busy User"}
+    )
+    monkeypatch.setattr(password_executor, "max_pending", 0)
+
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "busy@example.com", "password": "securepassword"}
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+@pytest.mark.asyncio
+async def test_login_is_rate_limited_before_hashing(client, monkeypatch):
+    await client.post(
+        "/api/v1/auth/register",
+        json={"email": "victim@example.com", "password": "securepassword", "full_name": "Victim"}
+    )
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_EMAIL_BURST", 2)
+    verified = []
+    monkeypatch.setattr(security, "verify_password", lambda *args: verified.append(args) and False)
+
+    statuses = []
+    for _ in range(3):
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": "victim@example.com", "password": "guess"}
+        )
+        statuses.append(response.status_code)
+
+    assert statuses == [401, 401, 429]
+    assert int(response.headers["retry-after"]) >= 1
+    # The limited attempt never reached bcrypt
+    assert len(verified) == 2
+
+    # Other accounts from the same IP are still allowed
+    response = await client.post("/api/v1/auth/login", data={"username": "other@example.com", "password": "x"})
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_forgot_password_is_rate_limited_per_ip(client, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_RATE_LIMIT_IP_BURST", 3)
+
+    statuses = [
+        (await client.post("/api/v1/auth/forgot-password", json={"email": f"user{n}@example.com"})).status_code
+        for n in range(4)
+    ]
+    assert statuses == [200, 200, 200, 429]
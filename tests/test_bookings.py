@@ -0,0 +1,318 @@
+import json
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import event, func, select
+
+from app.models import Booking, BookingItem, BookingStatus
+from app.services.booking_service import booking_service
+from app.services.infrastructure_service import AvailabilityCache, infrastructure_service, settings
+from tests.conftest import engine
+
+BOOKING_DATE = date.today() + timedelta(days=7)
+
+def _cell(grid, lane_id, slot_id):
+    lane = next(l for l in grid if l["lane_id"] == lane_id)
+    return next(s for s in lane["slots"] if s["slot_id"] == slot_id)
+
+@pytest.mark.asyncio
+async def test_availability_is_served_from_cache(client, infrastructure):
+    cache = infrastructure_service.availability_cache.grids
+
+    first = await client.get("/api/v1/bookings/availability", params={"booking_date": str(BOOKING_DATE)})
+    second = await client.get("/api/v1/bookings/availability", params={"booking_date": str(BOOKING_DATE)})
+
+    assert first.status_code == 200
+    assert first.json() == second.json()
+    assert len(first.json()) == 2
+    assert cache.hits == 1
+
+@pytest.mark.asyncio
+async def test_reservation_invalidates_cached_grid(client, infrastructure, auth_headers):
+    lane = infrastructure["lanes"][0]
+    slot = infrastructure["slots"][0]
+    headers = await auth_headers()
+
+    response = await client.get("/api/v1/bookings/availability", params={"booking_date": str(BOOKING_DATE)})
+    assert _cell(response.json(), lane.id, slot.id)["available"] is True
+
+    response = await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slot.id], "lane_id": lane.id},
+        headers=headers
+    )
+    assert response.status_code == 201
+
+    response = await client.get("/api/v1/bookings/availability", params={"booking_date": str(BOOKING_DATE)})
+    assert _cell(response.json(), lane.id, slot.id)["available"] is False
+
+@pytest.mark.asyncio
+async def test_availability_grid_uses_a_single_query(client, infrastructure):
+    statements = []
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await client.get("/api/v1/bookings/availability", params={"booking_date": str(BOOKING_DATE)})
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+def test_stale_build_is_not_cached():
+    cache = infrastructure_service.availability_cache
+    generation = cache.generation(BOOKING_DATE)
+
+    cache.invalidate(BOOKING_DATE)
+    cache.store(BOOKING_DATE, [{"lane_id": 1}], generation)
+    assert cache.get(BOOKING_DATE) is None
+
+    cache.store(BOOKING_DATE, [{"lane_id": 1}], cache.generation(BOOKING_DATE))
+    assert cache.get(BOOKING_DATE) == [{"lane_id": 1}]
+
+def test_generation_counters_stay_bounded():
+    cache = AvailabilityCache(maxsize=2, ttl=30)
+    in_flight = cache.generation(BOOKING_DATE)
+    for offset in range(10):
+        cache.invalidate(BOOKING_DATE + timedelta(days=offset))
+
+    assert len(cache._generations) <= 2
+    # Folding the counters must not let a build started before them be stored
+    cache.store(BOOKING_DATE, [{"lane_id": 1}], in_flight)
+    assert cache.get(BOOKING_DATE) is None
+
+def test_cached_grid_expires_with_earliest_hold():
+    cache = infrastructure_service.availability_cache
+    expired_hold = datetime.utcnow() - timedelta(seconds=1)
+
+    cache.store(BOOKING_DATE, [{"lane_id": 1}], cache.generation(BOOKING_DATE), expires_at=expired_hold)
+    assert cache.get(BOOKING_DATE) is None
+
+@pytest.mark.asyncio
+async def test_availability_range_streams_one_grid_per_date(client, infrastructure, auth_headers):
+    lane = infrastructure["lanes"][1]
+    slot = infrastructure["slots"][1]
+    headers = await auth_headers()
+    next_day = BOOKING_DATE + timedelta(days=1)
+
+    response = await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(next_day), "selected_slots": [slot.id], "lane_id": lane.id},
+        headers=headers
+    )
+    assert response.status_code == 201
+
+    response = await client.get(
+        "/api/v1/bookings/availability/range",
+        params={"start": str(BOOKING_DATE), "end": str(BOOKING_DATE + timedelta(days=2))}
+    )
+    assert response.status_code == 200
+    days = [json.loads(line) for line in response.text.splitlines()]
+    assert [d["date"] for d in days] == [str(BOOKING_DATE + timedelta(days=i)) for i in range(3)]
+    assert _cell(days[0]["grid"], lane.id, slot.id)["available"] is True
+    assert _cell(days[1]["grid"], lane.id, slot.id)["available"] is False
+
+    single = await client.get("/api/v1/bookings/availability", params={"booking_date": str(next_day)})
+    assert single.json() == days[1]["grid"]
+
+@pytest.mark.asyncio
+async def test_availability_range_caches_dates_without_schedule(client):
+    end = BOOKING_DATE + timedelta(days=2)
+    response = await client.get(
+        "/api/v1/bookings/availability/range", params={"start": str(BOOKING_DATE), "end": str(end)}
+    )
+    assert response.status_code == 200
+
+    cache = infrastructure_service.availability_cache
+    assert [cache.get(BOOKING_DATE + timedelta(days=i)) for i in range(3)] == [[], [], []]
+
+@pytest.mark.asyncio
+async def test_availability_range_rejects_inverted_range(client, infrastructure):
+    response = await client.get(
+        "/api/v1/bookings/availability/range",
+        params={"start": str(BOOKING_DATE), "end": str(BOOKING_DATE - timedelta(days=1))}
+    )
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_expired_holds_are_swept_in_batches(db_session, infrastructure, auth_headers):
+    await auth_headers()
+    lane = infrastructure["lanes"][0]
+    bookings = []
+    for slot in infrastructure["slots"][:2]:
+        booking = Booking(
+            user_id=1,
+            booking_date=BOOKING_DATE,
+            total_price=slot.price,
+            status=BookingStatus.PENDING,
+            expires_at=datetime.utcnow() - timedelta(minutes=1)
+        )
+        db_session.add(booking)
+        await db_session.flush()
+        db_session.add(BookingItem(booking_id=booking.id, lane_id=lane.id, price_slot_id=slot.id, booking_date=BOOKING_DATE))
+        bookings.append(booking)
+    await db_session.commit()
+
+    assert await booking_service.expire_stale_holds(db_session, batch_size=1) == 2
+
+    for booking in bookings:
+        await db_session.refresh(booking)
+        assert booking.status == BookingStatus.CANCELLED
+    active = await db_session.scalar(select(func.count()).where(BookingItem.active))
+    assert active == 0
+
+@pytest.mark.asyncio
+async def test_reservation_rejects_unknown_lane(client, infrastructure, auth_headers):
+    response = await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [infrastructure["slots"][0].id], "lane_id": 9999},
+        headers=await auth_headers()
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "The selected lane is invalid."
+
+@pytest.mark.asyncio
+async def test_reservation_requires_a_slot(client, infrastructure, auth_headers):
+    headers = await auth_headers()
+    lane_ids = [lane.id for lane in infrastructure["lanes"]]
+    for url, payload in [
+        ("/api/v1/bookings/reserve", {"lane_id": lane_ids[0]}),
+        ("/api/v1/bookings/reserve/group", {"lane_ids": lane_ids}),
+    ]:
+        response = await client.post(
+            url, json={"booking_date": str(BOOKING_DATE), "selected_slots": [], **payload}, headers=headers
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Select at least one slot."
+
+@pytest.mark.asyncio
+async def test_group_reservation_inserts_all_cells_in_one_statement(client, infrastructure, auth_headers):
+    lanes = infrastructure["lanes"]
+    slots = infrastructure["slots"][:2]
+    headers = await auth_headers()
+    statements = []
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        response = await client.post(
+            "/api/v1/bookings/reserve/group",
+            json={
+                "booking_date": str(BOOKING_DATE),
+                "selected_slots": [s.id for s in slots],
+                "lane_ids": [l.id for l in lanes]
+            },
+            headers=headers
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["total_price"] == 80.0
+    assert {(i["lane_id"], i["price_slot_id"]) for i in data["items"]} == {
+        (l.id, s.id) for l in lanes for s in slots
+    }
+    assert len([s for s in statements if s.startswith("INSERT INTO bookingitem")]) == 1
+
+@pytest.mark.asyncio
+async def test_group_reservation_is_all_or_nothing(client, db_session, infrastructure, auth_headers):
+    lanes = infrastructure["lanes"]
+    slot = infrastructure["slots"][0]
+    headers = await auth_headers()
+
+    response = await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slot.id], "lane_id": lanes[1].id},
+        headers=headers
+    )
+    assert response.status_code == 201
+
+    response = await client.post(
+        "/api/v1/bookings/reserve/group",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slot.id], "lane_ids": [l.id for l in lanes]},
+        headers=headers
+    )
+    assert response.status_code == 400
+    assert lanes[1].number in response.json()["detail"]
+    assert await db_session.scalar(select(func.count()).select_from(BookingItem)) == 1
+
+    response = await client.post(
+        "/api/v1/bookings/reserve/group",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slot.id], "lane_ids": [lanes[0].id, lanes[0].id]},
+        headers=headers
+    )
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_availability_conditional_get(client, infrastructure, auth_headers):
+    lane = infrastructure["lanes"][0]
+    slot = infrastructure["slots"][0]
+    params = {"booking_date": str(BOOKING_DATE)}
+
+    response = await client.get("/api/v1/bookings/availability", params=params)
+    etag = response.headers["etag"]
+    assert etag.startswith('"')
+    assert "stale-while-revalidate=" in response.headers["cache-control"]
+
+    # Unchanged grid: 304 straight from the cache, no SQL at all
+    statements = []
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await client.get("/api/v1/bookings/availability", params=params, headers={"If-None-Match": etag})
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    assert statements == []
+
+    response = await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slot.id], "lane_id": lane.id},
+        headers=await auth_headers()
+    )
+    assert response.status_code == 201
+
+    response = await client.get("/api/v1/bookings/availability", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert _cell(response.json(), lane.id, slot.id)["available"] is False
+
+@pytest.mark.asyncio
+async def test_compact_availability_format(client, infrastructure, auth_headers, monkeypatch):
+    lane = infrastructure["lanes"][1]
+    slots = infrastructure["slots"]
+    params = {"booking_date": str(BOOKING_DATE)}
+    await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slots[1].id], "lane_id": lane.id},
+        headers=await auth_headers()
+    )
+
+    full = await client.get("/api/v1/bookings/availability", params=params)
+    compact = await client.get("/api/v1/bookings/availability", params={**params, "format": "compact"})
+
+    assert compact.status_code == 200
+    assert compact.headers["etag"] != full.headers["etag"]
+    data = compact.json()
+    assert [s["slot_id"] for s in data["slots"]] == [s["slot_id"] for s in full.json()[0]["slots"]]
+    assert data["slots"][0]["time"] == full.json()[0]["slots"][0]["time"]
+    assert {l["lane_id"]: l["available"] for l in data["lanes"]} == {
+        infrastructure["lanes"][0].id: "1" * len(slots),
+        lane.id: "".join("0" if s.id == slots[1].id else "1" for s in slots),
+    }
+
+    # Large enough bodies are sent gzipped, to clients that accept it
+    monkeypatch.setattr(settings, "AVAILABILITY_GZIP_MIN_BYTES", 10)
+    infrastructure_service.availability_cache.clear()
+    response = await client.get("/api/v1/bookings/availability", params=params, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == full.json()
+    response = await client.get("/api/v1/bookings/availability", params=params, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == full.json()
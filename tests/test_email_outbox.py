@@ -0,0 +1,168 @@
+import asyncio
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import select
+
+from app.core.smtp import SMTPPool
+from app.models import EmailOutbox, EmailStatus, UserRole
+from app.services.email_service import EmailService, settings
+
+BOOKING_DATE = date.today() + timedelta(days=3)
+
+
+class SMTPStub:
+    """Just enough of an SMTP server to accept messages, or refuse the next few with a 451."""
+
+    def __init__(self):
+        self.messages: list[bytes] = []
+        self.connections = 0
+        self.refuse = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        writer.write(b"220 stub ESMTP\r\n")
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                writer.write(b"250 stub\r\n")
+            elif command.startswith("MAIL") and self.refuse:
+                self.refuse -= 1
+                writer.write(b"451 try again later\r\n")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                writer.write(b"250 OK\r\n")
+            elif command == "DATA":
+                writer.write(b"354 go ahead\r\n")
+                await writer.drain()
+                data = b""
+                while (chunk := await reader.readline()) != b".\r\n":
+                    data += chunk
+                self.messages.append(data)
+                writer.write(b"250 queued\r\n")
+            elif command == "QUIT":
+                writer.write(b"221 bye\r\n")
+                break
+            else:
+                writer.write(b"502 not implemented\r\n")
+            await writer.drain()
+        writer.close()
+
+
+@pytest.fixture
+async def smtp_stub():
+    stub = SMTPStub()
+    server = await asyncio.start_server(stub.handle, "127.0.0.1", 0)
+    stub.port = server.sockets[0].getsockname()[1]
+    yield stub
+    server.close()
+
+@pytest.fixture
+async def mailer(smtp_stub):
+    service = EmailService(SMTPPool("127.0.0.1", smtp_stub.port, size=2))
+    yield service
+    await service.smtp_pool.close()
+
+async def _outbox(db_session):
+    return (await db_session.execute(select(EmailOutbox).order_by(EmailOutbox.id))).scalars().all()
+
+@pytest.mark.asyncio
+async def test_confirm_payment_queues_email_in_same_transaction(client, db_session, infrastructure, auth_headers):
+    lane = infrastructure["lanes"][0]
+    slot = infrastructure["slots"][0]
+    response = await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slot.id], "lane_id": lane.id},
+        headers=await auth_headers()
+    )
+    booking_id = response.json()["id"]
+
+    response = await client.post(
+        f"/api/v1/admin/confirm-payment/{booking_id}",
+        headers=await auth_headers(UserRole.CASHIER)
+    )
+    assert response.status_code == 200
+
+    [email] = await _outbox(db_session)
+    assert email.recipient == "user@example.com"
+    assert email.template_name == "booking_confirmation.html"
+    assert email.template_body["booking_id"] == booking_id
+    assert email.status == EmailStatus.PENDING
+
+@pytest.mark.asyncio
+async def test_group_booking_confirmation_lists_every_lane(client, db_session, infrastructure, auth_headers, mailer):
+    lanes = infrastructure["lanes"]
+    response = await client.post(
+        "/api/v1/bookings/reserve/group",
+        json={
+            "booking_date": str(BOOKING_DATE),
+            "selected_slots": [infrastructure["slots"][0].id],
+            "lane_ids": [lane.id for lane in reversed(lanes)]
+        },
+        headers=await auth_headers()
+    )
+    response = await client.post(
+        f"/api/v1/admin/confirm-payment/{response.json()['id']}",
+        headers=await auth_headers(UserRole.CASHIER)
+    )
+    assert response.status_code == 200
+
+    [email] = await _outbox(db_session)
+    assert email.template_body["lane_numbers"] == ["1", "2"]
+    # Emails queued before group bookings carry a single lane_number
+    legacy_body = {key: value for key, value in email.template_body.items() if key != "lane_numbers"}
+    html, legacy = await mailer.templates.render_many([
+        ("booking_confirmation.html", email.template_body),
+        ("booking_confirmation.html", {**legacy_body, "lane_number": "3"}),
+    ])
+    assert "<strong>Lanes:</strong> #1, #2" in html
+    assert "<strong>Lane:</strong> #3" in legacy
+
+@pytest.mark.asyncio
+async def test_outbox_is_delivered_over_a_reused_connection(db_session, mailer, smtp_stub):
+    for n in range(3):
+        mailer.queue_password_reset(db_session, f"user{n}@example.com", {"full_name": f"User {n}", "reset_link": "x"})
+    await db_session.commit()
+
+    assert await mailer.deliver_pending(db_session, batch_size=2) == 3
+
+    assert len(smtp_stub.messages) == 3
+    assert b"Password Reset Request" in smtp_stub.messages[0]
+    # Two concurrent sends at most (the pool size), then reuse
+    assert smtp_stub.connections == mailer.smtp_pool.connects <= 2
+    assert all(e.status == EmailStatus.SENT and e.sent_at for e in await _outbox(db_session))
+
+@pytest.mark.asyncio
+async def test_failed_delivery_backs_off_then_gives_up(db_session, mailer, smtp_stub, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    smtp_stub.refuse = 2
+    mailer.queue_password_reset(db_session, "user@example.com", {"full_name": "User", "reset_link": "x"})
+    await db_session.commit()
+
+    assert await mailer.deliver_pending(db_session, batch_size=10) == 0
+    [email] = await _outbox(db_session)
+    assert email.status == EmailStatus.PENDING
+    assert email.attempts == 1
+    assert email.next_attempt_at > datetime.utcnow()
+    assert "451" in email.last_error
+
+    # Not due yet: nothing is attempted
+    assert await mailer.deliver_pending(db_session, batch_size=10) == 0
+    assert email.attempts == 1
+
+    email.next_attempt_at = datetime.utcnow()
+    await db_session.commit()
+    assert await mailer.deliver_pending(db_session, batch_size=10) == 0
+    assert email.status == EmailStatus.FAILED
+    assert email.attempts == 2
+    assert smtp_stub.messages == []
+
+@pytest.mark.asyncio
+async def test_render_many_uses_precompiled_templates(mailer):
+    renderer = mailer.templates
+    assert {"booking_confirmation.html", "password_reset.html"} <= renderer.templates.keys()
+
+    html, missing = await renderer.render_many(
+        [("password_reset.html", {"full_name": "Ada", "reset_link": "http://reset"}), ("nope.html", {})],
+        return_exceptions=True
+    )
+    assert "Ada" in html and "http://reset" in html
+    assert isinstance(missing, KeyError)
@@ -0,0 +1,70 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import date, timedelta
+
+from app.models import UserRole
+
+BOOKING_DATE = date.today() + timedelta(days=6)
+
+@pytest.fixture
+async def bookings(client, infrastructure, auth_headers):
+    lanes = infrastructure["lanes"]
+    slots = infrastructure["slots"]
+    user = await auth_headers()
+    response = await client.post(
+        "/api/v1/bookings/reserve/group",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slots[0].id], "lane_ids": [l.id for l in lanes]},
+        headers=user
+    )
+    paid_id = response.json()["id"]
+    await client.post(f"/api/v1/admin/confirm-payment/{paid_id}", headers=await auth_headers(UserRole.CASHIER))
+    await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slots[1].id], "lane_id": lanes[0].id},
+        headers=user
+    )
+    return paid_id
+
+def _params(**extra):
+    return {"start": str(BOOKING_DATE), "end": str(BOOKING_DATE + timedelta(days=30)), **extra}
+
+@pytest.mark.asyncio
+async def test_export_bookings_as_csv(client, bookings, auth_headers):
+    response = await client.get("/api/v1/admin/exports/bookings", params=_params(), headers=await auth_headers(UserRole.OWNER))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(r["booking_id"], r["lane_number"], r["status"]) for r in rows] == [
+        (str(bookings), "1", "PAID"), (str(bookings), "2", "PAID"), (str(bookings + 1), "1", "PENDING")
+    ]
+    assert rows[0]["user_email"] == "user@example.com"
+    assert rows[0]["start_time"] == "18:00:00"
+
+@pytest.mark.asyncio
+async def test_export_filters_by_status_and_gzips_ndjson(client, bookings, auth_headers):
+    response = await client.get(
+        "/api/v1/admin/exports/bookings",
+        params=_params(status="PENDING", format="ndjson", gzip="true"),
+        headers=await auth_headers(UserRole.OWNER)
+    )
+
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"].endswith('.ndjson.gz"')
+    lines = gzip.decompress(response.content).decode().splitlines()
+    assert [json.loads(line)["status"] for line in lines] == ["PENDING"]
+
+@pytest.mark.asyncio
+async def test_export_requires_owner_and_valid_range(client, auth_headers):
+    response = await client.get("/api/v1/admin/exports/bookings", params=_params(), headers=await auth_headers(UserRole.MANAGER))
+    assert response.status_code == 403
+
+    response = await client.get(
+        "/api/v1/admin/exports/bookings",
+        params={"start": str(BOOKING_DATE), "end": str(BOOKING_DATE - timedelta(days=1))},
+        headers=await auth_headers(UserRole.OWNER)
+    )
+    assert response.status_code == 400
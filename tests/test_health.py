@@ -0,0 +1,10 @@
+import pytest
+
+@pytest.mark.asyncio
+async def test_health_reports_database_and_pool(client):
+    response = await client.get("/api/v1/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["database"]["ping_ms"] >= 0
+    assert "class" in data["pool"]
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from datetime import date, timedelta
+
+from app.core.hub import RESYNC, Hub
+from app.models import UserRole
+from app.services.live_service import grid_diff, live_service, settings
+from tests.conftest import TestingSessionLocal
+
+BOOKING_DATE = date.today() + timedelta(days=8)
+
+def _grid(*available, price=20.0):
+    return [{
+        "lane_id": 1, "lane_number": "1", "type": "NORMAL",
+        "slots": [
+            {"slot_id": i + 1, "time": f"{18 + i}:00-{19 + i}:00", "price": price, "available": a}
+            for i, a in enumerate(available)
+        ]
+    }]
+
+@pytest.mark.asyncio
+async def test_hub_resyncs_a_slow_subscriber_without_blocking_others():
+    hub = Hub(queue_size=2)
+    fast, slow = hub.subscribe("day"), hub.subscribe("day")
+
+    for n in range(3):
+        assert hub.publish("day", n) == 2
+        assert await fast.get() == n
+
+    # The slow subscriber's backlog was replaced by a single resync marker
+    assert await slow.get() is RESYNC
+    assert slow.dropped == 2
+    assert await slow.get(timeout=0.01) is None
+
+    fast.close()
+    slow.close()
+    assert not hub.has_subscribers("day")
+    assert hub.publish("day", 4) == 0
+
+def test_grid_diff():
+    assert grid_diff(_grid(True, True), _grid(True, True)) is None
+    assert grid_diff(_grid(True, True), _grid(True, False)) == {
+        "type": "diff", "cells": [{"lane_id": 1, "slot_id": 2, "available": False}]
+    }
+    # A layout or price change sends the whole grid
+    assert grid_diff(_grid(True), _grid(True, True))["type"] == "grid"
+    assert grid_diff(_grid(True), _grid(True, price=25.0)) == {"type": "grid", "grid": _grid(True, price=25.0)}
+
+@pytest.mark.asyncio
+async def test_stream_pushes_cell_diffs_after_commits(client, infrastructure, auth_headers, monkeypatch):
+    monkeypatch.setattr(live_service, "session_factory", TestingSessionLocal)
+    monkeypatch.setattr(settings, "LIVE_AVAILABILITY_DEBOUNCE_SECONDS", 0)
+    lane = infrastructure["lanes"][0]
+    slot = infrastructure["slots"][2]
+
+    stream = live_service.stream(BOOKING_DATE)
+    first = await anext(stream)
+    assert first["type"] == "grid"
+    assert all(s["available"] for l in first["grid"] for s in l["slots"])
+
+    response = await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slot.id], "lane_id": lane.id},
+        headers=await auth_headers()
+    )
+    assert response.status_code == 201
+
+    message = await asyncio.wait_for(anext(stream), timeout=2)
+    assert message == {"type": "diff", "cells": [{"lane_id": lane.id, "slot_id": slot.id, "available": False}]}
+
+    # Payment leaves availability unchanged: nothing is pushed, only keep-alives
+    monkeypatch.setattr(settings, "LIVE_AVAILABILITY_HEARTBEAT_SECONDS", 0.1)
+    await client.post(f"/api/v1/admin/confirm-payment/{response.json()['id']}", headers=await auth_headers(UserRole.CASHIER))
+    assert await asyncio.wait_for(anext(stream), timeout=2) is None
+
+    await stream.aclose()
+    assert not live_service.hub.has_subscribers(BOOKING_DATE)
+    assert BOOKING_DATE not in live_service.snapshots
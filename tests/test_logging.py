@@ -0,0 +1,45 @@
+import logging
+import queue
+import pytest
+from app.core.logging_config import DeferredQueueHandler, SamplingFilter
+
+
+def _record(level=logging.INFO):
+    return logging.LogRecord("app.services.booking_service", level, __file__, 1, "msg %s", ("x",), None)
+
+def test_sampling_filter_drops_beyond_burst_and_reports_count():
+    sampler = SamplingFilter(rate=0, burst=2)
+
+    passed = [sampler.filter(_record()) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+
+    # Warnings and errors are never sampled out
+    assert sampler.filter(_record(logging.WARNING))
+    assert sampler.filter(_record(logging.ERROR))
+
+    sampler.tokens = 1
+    record = _record()
+    assert sampler.filter(record)
+    assert record.sampled_out == 3
+
+def test_queue_handler_renders_arguments_at_call_time_and_drops_overflow():
+    handler = DeferredQueueHandler(queue.Queue(1))
+    slots = [1]
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "slots %s", (slots,), None)
+    handler.emit(record)
+    slots.append(2)
+
+    queued = handler.queue.get_nowait()
+    assert (queued.msg, queued.args) == ("slots [1]", None)
+
+    handler.emit(record)
+    handler.emit(record)
+    assert handler.dropped == 1
+
+@pytest.mark.asyncio
+async def test_request_id_is_echoed_or_generated(client):
+    response = await client.get("/api/v1/health", headers={"X-Request-ID": "abc123"})
+    assert response.headers["x-request-id"] == "abc123"
+
+    response = await client.get("/api/v1/health")
+    assert len(response.headers["x-request-id"]) == 32
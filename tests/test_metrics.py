@@ -0,0 +1,47 @@
+import pytest
+from datetime import date, timedelta
+
+BOOKING_DATE = date.today() + timedelta(days=9)
+
+async def _scrape(client) -> dict[str, float]:
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+@pytest.mark.asyncio
+async def test_metrics_attribute_latency_and_queries_to_routes(client, infrastructure):
+    before = await _scrape(client)
+    for _ in range(2):
+        response = await client.get("/api/v1/bookings/availability", params={"booking_date": str(BOOKING_DATE)})
+        assert response.status_code == 200
+    after = await _scrape(client)
+
+    def delta(sample):
+        return after.get(sample, 0) - before.get(sample, 0)
+
+    route = 'method="GET",route="/api/v1/bookings/availability"'
+    assert delta(f'http_request_duration_seconds_count{{{route},status="200"}}') == 2
+    assert delta(f'http_request_duration_seconds_bucket{{{route},status="200",le="+Inf"}}') == 2
+    # One query to build the grid, none for the cached second request
+    assert delta(f"http_request_db_queries_sum{{{route}}}") == 1
+    assert delta(f"http_request_db_duration_seconds_sum{{{route}}}") > 0
+    assert delta('repository_call_duration_seconds_count{repository="InfrastructureRepository",method="get_availability_rows"}') == 1
+    assert delta('db_query_duration_seconds_count{statement="SELECT"}') >= 1
+    assert delta('cache_hits_total{cache="availability"}') == 1
+    assert "live_availability_subscribers" in after
+
+@pytest.mark.asyncio
+async def test_metrics_label_unmatched_paths_together(client):
+    before = await _scrape(client)
+    await client.get("/no/such/path/1")
+    await client.get("/no/such/path/2")
+    after = await _scrape(client)
+
+    sample = 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"}'
+    assert after[sample] - before.get(sample, 0) == 2
@@ -0,0 +1,24 @@
+from app.core.occupancy import OccupancyMap
+
+SLOT_IDS = [10, 11, 12, 13]
+
+def test_row_mask_checks():
+    occupancy = OccupancyMap.from_cells(SLOT_IDS, [(1, 11), (1, 13), (2, 10), (3, 99)])
+
+    assert occupancy.is_free(1, occupancy.mask([10, 12]))
+    assert not occupancy.is_free(1, occupancy.mask([12, 13]))
+    assert occupancy.occupied_slot_ids(1) == [11, 13]
+    assert not occupancy.is_available(2, 10)
+    # Cells outside the slot layout are ignored
+    assert occupancy.is_free(3)
+
+def test_free_count_and_blocked_masks():
+    occupancy = OccupancyMap.from_cells(SLOT_IDS, [(1, 11), (2, 10)])
+    assert occupancy.free_count([1, 2, 3]) == 10
+
+    occupancy.block(occupancy.mask([13]), lane_ids=[1, 2, 3])
+    assert occupancy.free_count([1, 2, 3]) == 7
+
+    other = OccupancyMap.from_cells(SLOT_IDS, [(1, 11), (1, 12)])
+    assert (occupancy & other).occupied_slot_ids(1) == [11]
+    assert (occupancy | other).occupied_slot_ids(1) == [11, 12, 13]
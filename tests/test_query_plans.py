@@ -0,0 +1,110 @@
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import event
+
+from app.models import Booking, BookingItem, BookingStatus, User
+from app.repositories.booking_repository import booking_repo
+from app.repositories.email_outbox_repository import email_outbox_repo
+from app.repositories.infrastructure_repository import infrastructure_repo
+from app.repositories.user_repository import user_repository
+from tests.conftest import engine
+
+# Tables that grow with traffic and must never be read with a full scan.
+# Lanes, schedules and slots are small and are listed in full by design.
+LARGE_TABLES = {"booking", "bookingitem", "user", "emailoutbox"}
+
+BOOKING_DATE = date.today() + timedelta(days=2)
+
+@pytest.fixture
+async def seeded(db_session, infrastructure):
+    user = User(email="planner@example.com", hashed_password="pw", full_name="Planner")
+    db_session.add(user)
+    await db_session.flush()
+    for offset in range(5):
+        for slot in infrastructure["slots"]:
+            booking = Booking(
+                user_id=user.id,
+                booking_date=BOOKING_DATE + timedelta(days=offset),
+                total_price=slot.price,
+                status=BookingStatus.PAID if offset % 2 else BookingStatus.PENDING,
+                expires_at=datetime.utcnow() + timedelta(minutes=10)
+            )
+            db_session.add(booking)
+            await db_session.flush()
+            db_session.add(BookingItem(
+                booking_id=booking.id,
+                lane_id=infrastructure["lanes"][0].id,
+                price_slot_id=slot.id,
+                booking_date=booking.booking_date
+            ))
+    await db_session.commit()
+    return infrastructure
+
+async def _plans(db_session, call):
+    """Runs a repository call and returns the EXPLAIN QUERY PLAN of every statement it issued."""
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await call()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    conn = await db_session.connection()
+    plans = []
+    for statement, parameters in statements:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        plans.append((statement, [row[-1] for row in result.all()]))
+    return plans
+
+def _full_scans(plans):
+    return [
+        (statement, detail)
+        for statement, details in plans
+        for detail in details
+        if detail.startswith("SCAN ") and detail.split()[1] in LARGE_TABLES
+    ]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", [
+    "get_occupied_slots",
+    "get_occupied_cells_in_range",
+    "get_availability_rows",
+    "get_slots_by_schedule",
+    "get_slots_by_weekday",
+    "get_with_details",
+    "expire_pending_holds",
+    "cancel_expired_holds_on_cells",
+    "mark_paid",
+    "get_by_email",
+    "get_page",
+    "claim_due",
+])
+async def test_repository_queries_do_not_scan_large_tables(db_session, seeded, query):
+    lane = seeded["lanes"][0]
+    slot_ids = [s.id for s in seeded["slots"]]
+    calls = {
+        "get_occupied_slots": lambda: booking_repo.get_occupied_slots(db_session, BOOKING_DATE, slot_ids),
+        "get_occupied_cells_in_range": lambda: booking_repo.get_occupied_cells_in_range(
+            db_session, BOOKING_DATE, BOOKING_DATE + timedelta(days=6)
+        ),
+        "get_availability_rows": lambda: infrastructure_repo.get_availability_rows(db_session, BOOKING_DATE),
+        "get_slots_by_schedule": lambda: infrastructure_repo.get_slots_by_schedule(db_session, seeded["schedule"].id),
+        "get_slots_by_weekday": lambda: infrastructure_repo.get_slots_by_weekday(db_session),
+        "get_with_details": lambda: booking_repo.get_with_details(db_session, 1),
+        "expire_pending_holds": lambda: booking_repo.expire_pending_holds(db_session, batch_size=100),
+        "cancel_expired_holds_on_cells": lambda: booking_repo.cancel_expired_holds_on_cells(
+            db_session, BOOKING_DATE, [lane.id], slot_ids
+        ),
+        "mark_paid": lambda: booking_repo.mark_paid(db_session, 1),
+        "get_by_email": lambda: user_repository.get_by_email(db_session, "planner@example.com"),
+        "get_page": lambda: user_repository.get_page(db_session, after=1, limit=50),
+        "claim_due": lambda: email_outbox_repo.claim_due(db_session, batch_size=50, lease_seconds=300),
+    }
+
+    plans = await _plans(db_session, calls[query])
+
+    assert plans, f"{query} issued no statements"
+    assert _full_scans(plans) == []
@@ -0,0 +1,81 @@
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import update
+
+from app.models import Booking, UserRole
+from app.services.report_service import report_service
+
+# A Monday, so the two-week range holds exactly two of each weekday
+START = date.today() + timedelta(days=7 - date.today().weekday())
+END = START + timedelta(days=13)
+
+@pytest.mark.asyncio
+async def test_occupancy_heatmap(client, infrastructure, auth_headers):
+    lane_a, lane_b = infrastructure["lanes"]
+    slots = infrastructure["slots"]
+    user = await auth_headers()
+    manager = await auth_headers(UserRole.MANAGER)
+
+    for booking_date, lane, slot_ids in [
+        (START, lane_a, [slots[0].id, slots[1].id]),      # Monday
+        (START + timedelta(days=7), lane_a, [slots[0].id]), # Monday
+        (START + timedelta(days=2), lane_b, [slots[2].id]), # Wednesday
+    ]:
+        response = await client.post(
+            "/api/v1/bookings/reserve",
+            json={"booking_date": str(booking_date), "selected_slots": slot_ids, "lane_id": lane.id},
+            headers=user
+        )
+        booking_id = response.json()["id"]
+        if booking_date != START + timedelta(days=2):
+            await client.post(f"/api/v1/admin/confirm-payment/{booking_id}", headers=manager)
+
+    response = await client.get(
+        "/api/v1/admin/reports/heatmap", params={"start": str(START), "end": str(END)}, headers=manager
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["times"] == ["18:00", "19:00", "20:00"]
+    assert [l["lane_id"] for l in data["lanes"]] == [lane_a.id, lane_b.id]
+    assert data["capacity"] == [[2, 2, 2]] * 7
+    assert data["paid"][0] == [[2, 1, 0], [0, 0, 0]]
+    assert data["utilization"][0] == [[1.0, 0.5, 0.0], [0.0, 0.0, 0.0]]
+    assert data["pending"][2] == [[0, 0, 0], [0, 0, 1]]
+    assert sum(map(sum, data["paid"][2])) == 0
+
+    # Served from the per-range cache
+    cache = report_service.heatmap_cache
+    await client.get("/api/v1/admin/reports/heatmap", params={"start": str(START), "end": str(END)}, headers=manager)
+    assert cache.hits == 1
+
+@pytest.mark.asyncio
+async def test_heatmap_ignores_expired_holds(client, db_session, infrastructure, auth_headers):
+    lane = infrastructure["lanes"][0]
+    slot = infrastructure["slots"][0]
+    manager = await auth_headers(UserRole.MANAGER)
+    response = await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(START), "selected_slots": [slot.id], "lane_id": lane.id},
+        headers=await auth_headers()
+    )
+    # Expired but not swept yet: its item is still active
+    await db_session.execute(
+        update(Booking).where(Booking.id == response.json()["id"]).values(expires_at=datetime.utcnow() - timedelta(minutes=1))
+    )
+    await db_session.commit()
+
+    response = await client.get(
+        "/api/v1/admin/reports/heatmap", params={"start": str(START), "end": str(END)}, headers=manager
+    )
+    assert response.status_code == 200
+    assert sum(sum(map(sum, day)) for day in response.json()["pending"]) == 0
+
+@pytest.mark.asyncio
+async def test_heatmap_requires_manager(client, auth_headers):
+    response = await client.get(
+        "/api/v1/admin/reports/heatmap",
+        params={"start": str(START), "end": str(END)},
+        headers=await auth_headers(UserRole.CASHIER)
+    )
+    assert response.status_code == 403
@@ -16,3 +16,18 @@ async def test_base_repository_get_multi(db_session):
     assert len(users) >= 2
     assert any(u.email == "user1@example.com" for u in users)
     assert any(u.email == "user2@example.com" for u in users)
+
+@pytest.mark.asyncio
+async def test_base_repository_get_page(db_session):
+    db_session.add_all([
+        User(email=f"page{n}@example.com", hashed_password="pw", full_name=f"Page {n}") for n in range(5)
+    ])
+    await db_session.commit()
+
+    first, after = await user_repository.get_page(db_session, limit=2)
+    second, after = await user_repository.get_page(db_session, after=after, limit=2)
+    last, after = await user_repository.get_page(db_session, after=after, limit=2)
+
+    assert [u.email for u in first + second + last] == [f"page{n}@example.com" for n in range(5)]
+    assert after is None
+    assert await user_repository.estimate_count(db_session) == 5
@@ -0,0 +1,161 @@
+import asyncio
+import pytest
+from datetime import date, datetime, time, timedelta
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.models import User, Lane, Schedule, DayConfig, PriceSlot, Booking, BookingItem, BookingStatus
+from app.schemas.booking import BookingCreate
+from app.repositories.booking_repository import booking_repo
+from app.services.booking_service import booking_service
+
+BOOKING_DATE = date.today() + timedelta(days=3)
+CONCURRENT_REQUESTS = 20
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    # A file database gives every session its own connection, like a real pool
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stress.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+@pytest.fixture
+async def seeded(session_factory):
+    async with session_factory() as session:
+        lane = Lane(number="1")
+        schedule = Schedule(name="All Week")
+        users = [
+            User(email=f"racer{i}@example.com", hashed_password="pw", full_name=f"Racer {i}")
+            for i in range(CONCURRENT_REQUESTS)
+        ]
+        session.add_all([lane, schedule, *users])
+        await session.flush()
+        slots = [
+            PriceSlot(start_time=time(h), end_time=time(h + 1), price=20.0, schedule_id=schedule.id)
+            for h in (18, 19)
+        ]
+        session.add_all(slots)
+        session.add_all([DayConfig(day_of_week=d, schedule_id=schedule.id) for d in range(7)])
+        await session.commit()
+        return {"lane": lane, "slots": slots, "users": users}
+
+async def _reserve(session_factory, user_id, payload):
+    async with session_factory() as session:
+        try:
+            return await booking_service.create_reservation(session, user_id, payload)
+        except HTTPException as e:
+            await session.rollback()
+            return e
+
+async def _expired_hold(session_factory, user, lane, slot) -> Booking:
+    async with session_factory() as session:
+        expired = Booking(
+            user_id=user.id,
+            booking_date=BOOKING_DATE,
+            total_price=slot.price,
+            status=BookingStatus.PENDING,
+            expires_at=datetime.utcnow() - timedelta(minutes=1)
+        )
+        session.add(expired)
+        await session.flush()
+        session.add(BookingItem(booking_id=expired.id, lane_id=lane.id, price_slot_id=slot.id, booking_date=BOOKING_DATE))
+        await session.commit()
+        return expired
+
+@pytest.mark.asyncio
+async def test_concurrent_reservations_for_the_same_cell(session_factory, seeded):
+    payload = BookingCreate(
+        booking_date=BOOKING_DATE,
+        selected_slots=[s.id for s in seeded["slots"]],
+        lane_id=seeded["lane"].id
+    )
+
+    results = await asyncio.gather(*(
+        _reserve(session_factory, user.id, payload) for user in seeded["users"]
+    ))
+
+    created = [r for r in results if isinstance(r, Booking)]
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(created) == 1
+    assert len(rejected) == CONCURRENT_REQUESTS - 1
+    assert all(e.status_code == 400 for e in rejected)
+
+    async with session_factory() as session:
+        active_items = await session.scalar(select(func.count()).where(BookingItem.active))
+        assert active_items == len(seeded["slots"])
+
+@pytest.mark.asyncio
+async def test_expired_hold_is_released_on_conflict(session_factory, seeded):
+    lane, slot = seeded["lane"], seeded["slots"][0]
+    expired = await _expired_hold(session_factory, seeded["users"][0], lane, slot)
+
+    payload = BookingCreate(booking_date=BOOKING_DATE, selected_slots=[slot.id], lane_id=lane.id)
+    result = await _reserve(session_factory, seeded["users"][1].id, payload)
+    assert isinstance(result, Booking)
+
+    async with session_factory() as session:
+        assert (await session.get(Booking, expired.id)).status == BookingStatus.CANCELLED
+
+@pytest.mark.asyncio
+async def test_expired_hold_is_not_paid_after_its_cell_is_taken(session_factory, seeded, monkeypatch):
+    lane, slot = seeded["lane"], seeded["slots"][0]
+    expired = await _expired_hold(session_factory, seeded["users"][0], lane, slot)
+
+    # Another user takes the cell between the payment reading the booking and writing it
+    payload = BookingCreate(booking_date=BOOKING_DATE, selected_slots=[slot.id], lane_id=lane.id)
+    get_with_details = booking_repo.get_with_details
+    taken = []
+    async def read_then_lose_the_cell(db, booking_id):
+        booking = await get_with_details(db, booking_id)
+        taken.append(await _reserve(session_factory, seeded["users"][1].id, payload))
+        return booking
+    monkeypatch.setattr(booking_repo, "get_with_details", read_then_lose_the_cell)
+
+    async with session_factory() as session:
+        with pytest.raises(HTTPException) as exc_info:
+            await booking_service.confirm_payment(session, expired.id)
+    assert exc_info.value.status_code == 400
+    assert isinstance(taken[0], Booking)
+
+    async with session_factory() as session:
+        assert (await session.get(Booking, expired.id)).status == BookingStatus.CANCELLED
+        active = (await session.scalars(select(BookingItem.booking_id).where(BookingItem.active))).all()
+        assert active == [taken[0].id]
+
+@pytest.mark.asyncio
+async def test_expired_hold_is_not_paid_before_it_is_swept(session_factory, seeded):
+    lane, slot = seeded["lane"], seeded["slots"][0]
+    expired = await _expired_hold(session_factory, seeded["users"][0], lane, slot)
+
+    async with session_factory() as session:
+        with pytest.raises(HTTPException) as exc_info:
+            await booking_service.confirm_payment(session, expired.id)
+    assert exc_info.value.status_code == 400
+
+    async with session_factory() as session:
+        assert (await session.get(Booking, expired.id)).status == BookingStatus.PENDING
+
+@pytest.mark.asyncio
+async def test_paid_booking_is_not_cancelled_by_a_stale_sweep(session_factory, seeded):
+    lane, slot = seeded["lane"], seeded["slots"][0]
+    payload = BookingCreate(booking_date=BOOKING_DATE, selected_slots=[slot.id], lane_id=lane.id)
+    booking = await _reserve(session_factory, seeded["users"][0].id, payload)
+    async with session_factory() as session:
+        await booking_service.confirm_payment(session, booking.id)
+
+    async with session_factory() as session:
+        # The hold expiry has passed by the time a sweeper that selected the booking earlier writes
+        paid = await session.get(Booking, booking.id)
+        paid.expires_at = datetime.utcnow() - timedelta(minutes=1)
+        await session.commit()
+        assert await booking_repo.cancel_expired_holds(session, [booking.id]) == []
+        assert await booking_service.expire_stale_holds(session, batch_size=10) == 0
+
+    async with session_factory() as session:
+        assert (await session.get(Booking, booking.id)).status == BookingStatus.PAID
+        assert await session.scalar(select(func.count()).where(BookingItem.active)) == 1
@@ -0,0 +1,126 @@
+import pytest
+from datetime import date, timedelta
+
+from app.core.events import SCHEDULE_CHANGED, event_bus
+from app.models import UserRole
+
+BOOKING_DATE = date.today() + timedelta(days=5)
+
+def _prices(grid):
+    return {s["slot_id"]: s["price"] for s in grid[0]["slots"]}
+
+@pytest.mark.asyncio
+async def test_adjust_prices_invalidates_cached_grids(client, infrastructure, auth_headers):
+    headers = await auth_headers(UserRole.OWNER)
+    events = []
+    record = lambda **payload: events.append(payload)
+    event_bus.subscribe(SCHEDULE_CHANGED, record)
+
+    try:
+        response = await client.get("/api/v1/bookings/availability", params={"booking_date": str(BOOKING_DATE)})
+        assert set(_prices(response.json()).values()) == {20.0}
+
+        response = await client.post(
+            "/api/v1/infrastructure/slots/adjust-prices",
+            json={"percent": 12.5, "schedule_id": infrastructure["schedule"].id},
+            headers=headers
+        )
+        assert response.json() == {"updated": 3}
+    finally:
+        event_bus.unsubscribe(SCHEDULE_CHANGED, record)
+
+    assert events == [{"schedule_id": infrastructure["schedule"].id}]
+    response = await client.get("/api/v1/bookings/availability", params={"booking_date": str(BOOKING_DATE)})
+    assert set(_prices(response.json()).values()) == {22.5}
+
+@pytest.mark.asyncio
+async def test_replace_schedule_slots(client, infrastructure, auth_headers):
+    headers = await auth_headers(UserRole.OWNER)
+    schedule_id = infrastructure["schedule"].id
+    kept, _, removed = infrastructure["slots"]
+
+    response = await client.put(
+        f"/api/v1/infrastructure/schedules/{schedule_id}/slots",
+        json=[
+            {"id": kept.id, "start_time": "18:00:00", "end_time": "19:00:00", "price": 25.0},
+            {"start_time": "19:00:00", "end_time": "20:30:00", "price": 30.0},
+        ],
+        headers=headers
+    )
+    assert response.status_code == 200
+    slots = response.json()
+    assert [(s["start_time"], s["price"]) for s in slots] == [("18:00:00", 25.0), ("19:00:00", 30.0)]
+    assert slots[0]["id"] == kept.id
+    assert removed.id not in {s["id"] for s in slots}
+
+    response = await client.put(
+        f"/api/v1/infrastructure/schedules/{schedule_id}/slots",
+        json=[
+            {"start_time": "18:00:00", "end_time": "19:30:00", "price": 25.0},
+            {"start_time": "19:00:00", "end_time": "20:00:00", "price": 25.0},
+        ],
+        headers=headers
+    )
+    assert response.status_code == 400
+
+    response = await client.put(
+        f"/api/v1/infrastructure/schedules/{schedule_id}/slots",
+        json=[
+            {"id": kept.id, "start_time": "18:00:00", "end_time": "19:00:00", "price": 25.0},
+            {"id": kept.id, "start_time": "19:00:00", "end_time": "20:00:00", "price": 25.0},
+        ],
+        headers=headers
+    )
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_booked_slots_cannot_be_removed(client, infrastructure, auth_headers):
+    lane = infrastructure["lanes"][0]
+    slot = infrastructure["slots"][0]
+    response = await client.post(
+        "/api/v1/bookings/reserve",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": [slot.id], "lane_id": lane.id},
+        headers=await auth_headers()
+    )
+    assert response.status_code == 201
+
+    owner = await auth_headers(UserRole.OWNER)
+    response = await client.put(
+        f"/api/v1/infrastructure/schedules/{infrastructure['schedule'].id}/slots",
+        json=[],
+        headers=owner
+    )
+    assert response.status_code == 409
+
+    # The booked slot can be re-priced but not re-timed
+    url = f"/api/v1/infrastructure/schedules/{infrastructure['schedule'].id}/slots"
+    others = [
+        {"id": s.id, "start_time": str(s.start_time), "end_time": str(s.end_time), "price": s.price}
+        for s in infrastructure["slots"][1:]
+    ]
+    response = await client.put(
+        url,
+        json=[{"id": slot.id, "start_time": str(slot.start_time), "end_time": str(slot.end_time), "price": 99.0}, *others],
+        headers=owner
+    )
+    assert response.status_code == 200
+    response = await client.put(
+        url,
+        json=[{"id": slot.id, "start_time": "09:00:00", "end_time": "10:00:00", "price": 99.0}, *others],
+        headers=owner
+    )
+    assert response.status_code == 409
+
+@pytest.mark.asyncio
+async def test_assign_days_requires_owner(client, infrastructure, auth_headers):
+    url = f"/api/v1/infrastructure/schedules/{infrastructure['schedule'].id}/days"
+    owner = await auth_headers(UserRole.OWNER)
+
+    response = await client.put(url, json={"days": [5, 6]}, headers=await auth_headers(UserRole.MANAGER))
+    assert response.status_code == 403
+
+    response = await client.put(url, json={"days": [5, 6]}, headers=owner)
+    assert response.json() == {"schedule_id": infrastructure["schedule"].id, "days": list(range(7))}
+
+    response = await client.put(url, json={"days": [7]}, headers=owner)
+    assert response.status_code == 400
@@ -0,0 +1,106 @@
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, update
+
+from app.models import Booking, DailyBookingStats, DailyStats, UserRole
+from app.services.booking_service import booking_service
+from app.services.stats_service import stats_service
+
+BOOKING_DATE = date.today() + timedelta(days=4)
+
+async def _reserve(client, headers, lane_ids, slot_ids):
+    response = await client.post(
+        "/api/v1/bookings/reserve/group",
+        json={"booking_date": str(BOOKING_DATE), "selected_slots": slot_ids, "lane_ids": lane_ids},
+        headers=headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+async def _rollup(db_session):
+    rows = (await db_session.execute(
+        select(DailyStats).order_by(DailyStats.lane_id).execution_options(populate_existing=True)
+    )).scalars().all()
+    return [
+        (r.lane_id, round(r.revenue, 2), r.paid_bookings, r.pending_bookings, r.cancelled_bookings, r.occupied_slots)
+        for r in rows
+    ]
+
+async def _booking_rollup(db_session):
+    rows = (await db_session.execute(
+        select(DailyBookingStats).order_by(DailyBookingStats.stat_date).execution_options(populate_existing=True)
+    )).scalars().all()
+    return [(r.stat_date, r.paid_bookings, r.pending_bookings, r.cancelled_bookings) for r in rows]
+
+@pytest.mark.asyncio
+async def test_rollup_follows_booking_lifecycle_and_matches_rebuild(client, db_session, infrastructure, auth_headers):
+    lane_a, lane_b = (l.id for l in infrastructure["lanes"])
+    slot_ids = [s.id for s in infrastructure["slots"]]
+    user = await auth_headers()
+    owner = await auth_headers(UserRole.OWNER)
+
+    paid_id = await _reserve(client, user, [lane_a, lane_b], slot_ids[:2])
+    expired_id = await _reserve(client, user, [lane_a], slot_ids[2:])
+    assert await _rollup(db_session) == [(lane_a, 0, 0, 2, 0, 0), (lane_b, 0, 0, 1, 0, 0)]
+    # The two-lane booking counts once per date
+    assert await _booking_rollup(db_session) == [(BOOKING_DATE, 0, 2, 0)]
+
+    response = await client.post(f"/api/v1/admin/confirm-payment/{paid_id}", headers=await auth_headers(UserRole.CASHIER))
+    assert response.status_code == 200
+
+    await db_session.execute(
+        update(Booking).where(Booking.id == expired_id).values(expires_at=datetime.utcnow() - timedelta(minutes=1))
+    )
+    await db_session.commit()
+    assert await booking_service.expire_stale_holds(db_session, batch_size=10) == 1
+
+    incremental = await _rollup(db_session)
+    assert incremental == [(lane_a, 40.0, 1, 0, 1, 2), (lane_b, 40.0, 1, 0, 0, 2)]
+    incremental_bookings = await _booking_rollup(db_session)
+    assert incremental_bookings == [(BOOKING_DATE, 1, 0, 1)]
+
+    await stats_service.rebuild(db_session, BOOKING_DATE - timedelta(days=3), BOOKING_DATE + timedelta(days=3), batch_days=2)
+    assert await _rollup(db_session) == incremental
+    assert await _booking_rollup(db_session) == incremental_bookings
+
+    response = await client.get(
+        "/api/v1/admin/stats",
+        params={"start": str(BOOKING_DATE), "end": str(BOOKING_DATE + timedelta(days=6))},
+        headers=owner
+    )
+    data = response.json()
+    assert data["totals"] == {
+        "revenue": 80.0, "paid_bookings": 1, "pending_bookings": 0, "cancelled_bookings": 1, "occupied_slots": 4
+    }
+    assert [(day["date"], day["paid_bookings"]) for day in data["days"]] == [(str(BOOKING_DATE), 1)]
+    assert [lane["lane_id"] for lane in data["lanes"]] == [lane_a, lane_b]
+
+@pytest.mark.asyncio
+async def test_expired_hold_is_counted_once(client, db_session, infrastructure, auth_headers):
+    lane = infrastructure["lanes"][0].id
+    slot_ids = [s.id for s in infrastructure["slots"]]
+    booking_id = await _reserve(client, await auth_headers(), [lane], slot_ids[:1])
+    await db_session.execute(
+        update(Booking).where(Booking.id == booking_id).values(expires_at=datetime.utcnow() - timedelta(minutes=1))
+    )
+    await db_session.commit()
+
+    # A late payment of the expired hold must not add it to the paid counts as well
+    response = await client.post(f"/api/v1/admin/confirm-payment/{booking_id}", headers=await auth_headers(UserRole.CASHIER))
+    assert response.status_code == 400
+    assert await booking_service.expire_stale_holds(db_session, batch_size=10) == 1
+    assert await booking_service.expire_stale_holds(db_session, batch_size=10) == 0
+
+    incremental = await _rollup(db_session)
+    assert incremental == [(lane, 0, 0, 0, 1, 0)]
+    await stats_service.rebuild(db_session, BOOKING_DATE, BOOKING_DATE, batch_days=1)
+    assert await _rollup(db_session) == incremental
+
+@pytest.mark.asyncio
+async def test_stats_rejects_inverted_range(client, auth_headers):
+    response = await client.get(
+        "/api/v1/admin/stats",
+        params={"start": "2026-02-01", "end": "2026-01-01"},
+        headers=await auth_headers(UserRole.OWNER)
+    )
+    assert response.status_code == 400